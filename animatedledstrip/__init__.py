@@ -1,11 +1,22 @@
+from .als_async_http_client import AsyncALSHttpClient
+from .als_fleet_client import ALSFleetClient
 from .als_http_client import ALSHttpClient
 from .animation_info import AnimationInfo
 from .animation_to_run_params import AnimationToRunParams
+from .animation_validator import AnimationValidationError, AnimationValidator
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .client_metrics import ClientMetrics
 from .color_container import ColorContainer, PreparedColorContainer
 from .distance import AbsoluteDistance, PercentDistance
 from .equation import Equation
 from .location import Location
+from .location_buffer import LocationBuffer
+from .partial_result import PartialResult
+from .pixel_ranges import PixelRanges
 from .rotation import DegreesRotation, RadiansRotation
+from .rotation_matrix import RotationMatrix
 from .running_animation_params import RunningAnimationParams
 from .section import Section
+from .section_tree import SectionTree
+from .spatial_index import SpatialIndex
 from .strip_info import StripInfo
@@ -0,0 +1,152 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import json
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from animatedledstrip.async_connection_pool import AsyncHTTPConnectionPool
+from animatedledstrip.fast_json_encoder import ALSFastJsonEncoder
+from animatedledstrip.json_decoder import ALSJsonDecoder
+from animatedledstrip.json_encoder import ALSJsonEncoder
+from animatedledstrip.packed_colors import parse_packed_colors
+
+if TYPE_CHECKING:
+    from animatedledstrip.animation_info import AnimationInfo
+    from animatedledstrip.animation_to_run_params import AnimationToRunParams
+    from animatedledstrip.new_animation_group_info import NewAnimationGroupInfo
+    from animatedledstrip.running_animation_params import RunningAnimationParams
+    from animatedledstrip.section import Section
+    from animatedledstrip.strip_info import StripInfo
+
+
+class AsyncALSHttpClient:
+    """asyncio counterpart of ALSHttpClient; every request method is a coroutine"""
+
+    def __init__(self,
+                 ip_address: str,
+                 port: int = 8080,
+                 pool_size: int = 16,
+                 idle_timeout: float = 30.0,
+                 max_connections: Optional[int] = None):
+        self.ip_address = ip_address
+        self.port = port
+        self.encoder = ALSJsonEncoder()
+        self.fast_encoder = ALSFastJsonEncoder()
+        self.decoder = ALSJsonDecoder()
+        self.pool = AsyncHTTPConnectionPool(ip_address, port, max_size=pool_size, idle_timeout=idle_timeout,
+                                            max_connections=max_connections)
+
+    async def __aenter__(self) -> 'AsyncALSHttpClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Close any keep-alive connections held by the client"""
+        await self.pool.clear()
+
+    async def _get_data(self, url: str) -> Any:
+        return await self.pool.request('GET', url)
+
+    async def _post_data(self, url: str, data: Any) -> Any:
+        return await self.pool.request('POST', url,
+                                       body=self.fast_encoder.encode(data),
+                                       headers={'Content-Type': 'application/json'})
+
+    async def _delete_data(self, url: str) -> Any:
+        return await self.pool.request('DELETE', url)
+
+    async def get_animation_info(self, anim_name: str) -> 'AnimationInfo':
+        return self.decoder.decode_object_with_type(await self._get_data('/animation/' + anim_name), 'AnimationInfo')
+
+    async def get_supported_animations(self) -> List['AnimationInfo']:
+        return self.decoder.decode_list_with_type(await self._get_data('/animations'), 'AnimationInfo')
+
+    async def get_supported_animations_map(self) -> Dict[str, 'AnimationInfo']:
+        return self.decoder.decode_map_with_type(await self._get_data('/animations/map'), 'AnimationInfo')
+
+    async def get_supported_animations_dict(self) -> Dict[str, 'AnimationInfo']:
+        return await self.get_supported_animations_map()
+
+    async def get_supported_animations_names(self) -> List[str]:
+        return json.loads(await self._get_data('/animations/names'))
+
+    async def create_new_group(self, new_group: 'NewAnimationGroupInfo'):
+        return self.decoder.decode_object_with_type(await self._post_data('/animations/newGroup', new_group),
+                                                    'AnimationInfo')
+
+    async def get_running_animations(self) -> Dict[str, 'RunningAnimationParams']:
+        return self.decoder.decode_map_with_type(await self._get_data('/running'), 'RunningAnimationParams')
+
+    async def get_running_animations_ids(self) -> List[str]:
+        return json.loads(await self._get_data('/running/ids'))
+
+    async def get_running_animation_params(self, anim_id: str) -> 'RunningAnimationParams':
+        return self.decoder.decode_object_with_type(await self._get_data('/running/' + anim_id),
+                                                    'RunningAnimationParams')
+
+    async def end_animation(self, anim_id: str) -> 'RunningAnimationParams':
+        return self.decoder.decode_object_with_type(await self._delete_data('/running/' + anim_id),
+                                                    'RunningAnimationParams')
+
+    async def get_section(self, section_name: str) -> 'Section':
+        return self.decoder.decode_object_with_type(await self._get_data('/sections/' + section_name), 'Section')
+
+    async def get_sections(self) -> List['Section']:
+        return self.decoder.decode_list_with_type(await self._get_data('/sections'), 'Section')
+
+    async def create_new_section(self, new_section: 'Section') -> 'Section':
+        return self.decoder.decode_object_with_type(await self._post_data('/sections', new_section), 'Section')
+
+    async def get_sections_map(self) -> Dict[str, 'Section']:
+        return self.decoder.decode_map_with_type(await self._get_data('/sections/map'), 'Section')
+
+    async def get_sections_dict(self) -> Dict[str, 'Section']:
+        return await self.get_sections_map()
+
+    async def start_animation(self, anim_params: 'AnimationToRunParams') -> 'RunningAnimationParams':
+        return self.decoder.decode_object_with_type(await self._post_data('/start', anim_params),
+                                                    'RunningAnimationParams')
+
+    async def save_animation(self, anim_params: 'AnimationToRunParams') -> str:
+        return await self._post_data('/save', anim_params)
+
+    async def get_saved_animations(self) -> List['AnimationToRunParams']:
+        return self.decoder.decode_list_with_type(await self._get_data('/saved'), 'AnimationToRunParams')
+
+    async def clear_strip(self):
+        await self._post_data('/strip/clear', None)
+
+    async def get_current_strip_color(self) -> List[int]:
+        return json.loads(await self._get_data('/strip/color'))
+
+    async def get_current_strip_color_array(self) -> Any:
+        """Like get_current_strip_color, but returns a packed uint32 buffer (a NumPy array if available)"""
+        return parse_packed_colors(await self._get_data('/strip/color'))
+
+    async def get_strip_info(self) -> 'StripInfo':
+        return self.decoder.decode_object_with_type(await self._get_data('/strip/info'), 'StripInfo')
+
+    async def end_animation_from_params(self, anim_params: 'RunningAnimationParams') -> 'RunningAnimationParams':
+        return await self.end_animation(anim_params.anim_id)
+
+    async def get_full_strip_section(self) -> 'Section':
+        return await self.get_section('fullStrip')
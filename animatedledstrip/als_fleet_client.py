@@ -0,0 +1,123 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, Mapping, Optional, TypeVar, Union
+
+from animatedledstrip.als_http_client import ALSHttpClient
+from animatedledstrip.partial_result import PartialResult
+
+T = TypeVar('T')
+
+
+class ALSFleetClient:
+    """Runs ALSHttpClient calls against many servers concurrently"""
+
+    def __init__(self,
+                 clients: Union[Iterable[Union[str, ALSHttpClient]], Mapping[Hashable, ALSHttpClient]],
+                 max_workers: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """Create a fleet from server addresses, ALSHttpClients, or a mapping of names to ALSHttpClients
+
+        Clients given as addresses or ALSHttpClients are keyed by their
+        `(ip_address, port)`, so several servers on one host can be used.
+        Clients created from addresses use `timeout` as their socket timeout so
+        a hung server doesn't keep a worker busy forever. By default there is
+        one worker thread per client, so every server is contacted at once."""
+        self.clients: Dict[Hashable, ALSHttpClient] = {}
+        if isinstance(clients, Mapping):
+            self.clients.update(clients)
+        else:
+            for client in clients:
+                if isinstance(client, str):
+                    client = ALSHttpClient(client, timeout=timeout)
+                self.clients[(client.ip_address, client.port)] = client
+
+        self.timeout: Optional[float] = timeout
+        if max_workers is None:
+            max_workers = max(1, len(self.clients))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='als-fleet')
+
+    def __enter__(self) -> 'ALSFleetClient':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Stop the worker threads and close every client's connections"""
+        self._executor.shutdown(wait=False)
+        for client in self.clients.values():
+            client.close()
+
+    def map(self, func: Callable[[ALSHttpClient], T], timeout: Optional[float] = None) -> PartialResult[Hashable, T]:
+        """Call `func` with every client concurrently
+
+        Hosts that raise, or that haven't finished within `timeout` seconds of
+        their call starting (the fleet's timeout if not given), are reported in
+        the result's `errors` instead of `results`. The timeout is also applied
+        as the client's `deadline()`, so its requests give up in time too. Hosts
+        waiting for a free worker aren't timed until their call starts."""
+        if timeout is None:
+            timeout = self.timeout
+
+        started: Dict[Hashable, float] = {}
+
+        def run(host: Hashable, client: ALSHttpClient) -> T:
+            started[host] = time.monotonic()
+            deadline = getattr(client, 'deadline', None)
+            if timeout is None or deadline is None:
+                return func(client)
+            with deadline(timeout):
+                return func(client)
+
+        futures: Dict[Future, Hashable] = {self._executor.submit(run, host, client): host
+                                           for host, client in self.clients.items()}
+
+        result: PartialResult[Hashable, T] = PartialResult()
+        pending = set(futures)
+        while pending:
+            wait_for = None
+            if timeout is not None:
+                now = time.monotonic()
+                for future in [f for f in pending if futures[f] in started and started[futures[f]] + timeout <= now]:
+                    pending.discard(future)
+                    host = futures[future]
+                    result.errors[host] = TimeoutError('{} did not respond within {} seconds'.format(host, timeout))
+                if not pending:
+                    break
+                # Check again when the earliest running call runs out of time (or after a full timeout
+                # if none have started, in case one starts and hangs)
+                ends = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+                wait_for = max(0.0, min(ends) - now) if ends else timeout
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                host = futures[future]
+                if future.exception() is not None:
+                    result.errors[host] = future.exception()
+                else:
+                    result.results[host] = future.result()
+        return result
+
+    def call(self, method: str, *args: Any, timeout: Optional[float] = None,
+             **kwargs: Any) -> PartialResult[Hashable, Any]:
+        """Call the ALSHttpClient method named `method` on every client concurrently"""
+        return self.map(lambda client: getattr(client, method)(*args, **kwargs), timeout=timeout)
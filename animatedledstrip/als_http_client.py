@@ -18,12 +18,32 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 #  THE SOFTWARE.
 
+import copy
 import json
-from urllib.request import Request, urlopen
-from typing import Any, Dict, List, TYPE_CHECKING
-
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.client import HTTPConnection, HTTPException, HTTPResponse
+from typing import Any, BinaryIO, Callable, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Optional, Tuple, \
+    TypeVar, TYPE_CHECKING
+from urllib.error import HTTPError
+
+from animatedledstrip.animation_validator import AnimationValidator, strip_dimensionality
+from animatedledstrip.circuit_breaker import CircuitBreaker, CircuitOpenError
+from animatedledstrip.client_metrics import ClientMetrics, InstrumentedJsonDecoder, RequestEvent, endpoint_name
+from animatedledstrip.connection_pool import HTTPConnectionPool
+from animatedledstrip.fast_json_encoder import ALSFastJsonEncoder
 from animatedledstrip.json_decoder import ALSJsonDecoder
 from animatedledstrip.json_encoder import ALSJsonEncoder
+from animatedledstrip.packed_colors import parse_packed_colors
+from animatedledstrip.partial_result import PartialResult
+from animatedledstrip.response_cache import ResponseCache
+from animatedledstrip.section_tree import SectionTree
+from animatedledstrip.single_flight import SingleFlight
+from animatedledstrip.spatial_index import SpatialIndex
+from animatedledstrip.strip_color_stream import StripColorFrame, stream_strip_color
 
 if TYPE_CHECKING:
     from animatedledstrip.animation_info import AnimationInfo
@@ -33,92 +53,464 @@ if TYPE_CHECKING:
     from animatedledstrip.section import Section
     from animatedledstrip.strip_info import StripInfo
 
+T = TypeVar('T')
+
+
+def _decode_json(data: bytes, data_type: str) -> Any:
+    return json.loads(data)
+
+
+def _decode_packed_colors(data: bytes, data_type: str) -> Any:
+    return parse_packed_colors(data)
+
+
+def _is_host_failure(error: BaseException) -> bool:
+    """Whether an error means the server is down or unhealthy, rather than that the request was bad"""
+    if isinstance(error, HTTPError):
+        return error.code >= 500
+    return isinstance(error, (OSError, HTTPException))
+
 
 class ALSHttpClient:
 
-    def __init__(self, ip_address: str):
+    def __init__(self,
+                 ip_address: str,
+                 port: int = 8080,
+                 pool_size: int = 4,
+                 idle_timeout: float = 30.0,
+                 timeout: Optional[float] = None,
+                 cache_ttl: Optional[float] = None,
+                 cache_size: int = 128,
+                 metrics: Optional[ClientMetrics] = None,
+                 call_timeout: Optional[float] = None,
+                 retries: int = 0,
+                 backoff: float = 0.05,
+                 max_backoff: float = 1.0,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 coalesce: Optional[str] = None):
         self.ip_address = ip_address
+        self.port = port
         self.encoder = ALSJsonEncoder()
+        self.fast_encoder = ALSFastJsonEncoder()
         self.decoder = ALSJsonDecoder()
+        self.pool = HTTPConnectionPool(ip_address, port, max_size=pool_size, idle_timeout=idle_timeout, timeout=timeout)
+
+        # Requests and decoding are only timed if a ClientMetrics is given
+        self.metrics: Optional[ClientMetrics] = metrics
+        if metrics is not None:
+            self.decoder = InstrumentedJsonDecoder(metrics)
+            self.pool.metrics = metrics
+
+        # Responses of the animation and section catalog endpoints are cached if a TTL is given.
+        # Cached objects are shared between callers, so they shouldn't be modified.
+        self.cache: Optional[ResponseCache] = ResponseCache(cache_ttl, cache_size) if cache_ttl is not None else None
+
+        # `timeout` limits each socket operation, while `call_timeout` and `deadline()` limit a call as a whole.
+        # Failed GETs are retried up to `retries` times with jittered exponential backoff.
+        self.call_timeout: Optional[float] = call_timeout
+        self.retries: int = retries
+        self.backoff: float = backoff
+        self.max_backoff: float = max_backoff
+        self.circuit_breaker: Optional[CircuitBreaker] = circuit_breaker
+        self._local = threading.local()
+
+        # Identical GETs made at the same time share one request and decoded result if `coalesce` is set.
+        # With 'copy' each caller gets its own copy; with 'shared' they all get the same objects,
+        # which shouldn't be modified.
+        if coalesce not in (None, 'copy', 'shared'):
+            raise ValueError("coalesce must be None, 'copy' or 'shared', not {!r}".format(coalesce))
+        self.coalesce: Optional[str] = coalesce
+        self._single_flight = SingleFlight()
+
+        # Built on the first call to get_section_tree and get_spatial_index
+        self._section_tree: Optional[SectionTree] = None
+        self._spatial_index: Optional[SpatialIndex] = None
+
+        # Batch calls run on up to one worker per pooled connection; created on first use
+        self._batch_workers: int = pool_size
+        self._batch_executor: Optional[ThreadPoolExecutor] = None
+        self._batch_lock = threading.Lock()
+
+        # Validators compiled from each animation's AnimationInfo, by animation name
+        self._validators: Dict[str, AnimationValidator] = {}
+        self._strip_dimensionality: Optional[FrozenSet[str]] = None
+
+    def __enter__(self) -> 'ALSHttpClient':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close any keep-alive connections held by the client"""
+        with self._batch_lock:
+            if self._batch_executor is not None:
+                self._batch_executor.shutdown(wait=False)
+                self._batch_executor = None
+        self.pool.clear()
 
     def _resolve_url(self, url: str) -> str:
-        return 'http://' + self.ip_address + ':8080' + url
+        return 'http://' + self.ip_address + ':' + str(self.port) + url
+
+    @contextmanager
+    def deadline(self, seconds: float) -> Iterator[None]:
+        """Make every request this thread sends inside the `with` block give up once `seconds` have passed
+
+        Nested deadlines can only shorten the enclosing one. Time spent decoding
+        responses counts too, so a block of several calls shares one budget."""
+        previous = getattr(self._local, 'deadline', None)
+        deadline = time.monotonic() + seconds
+        self._local.deadline = deadline if previous is None else min(deadline, previous)
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+
+    def _call_deadline(self) -> Optional[float]:
+        deadline = getattr(self._local, 'deadline', None)
+        if self.call_timeout is not None:
+            call_deadline = time.monotonic() + self.call_timeout
+            if deadline is None or call_deadline < deadline:
+                return call_deadline
+        return deadline
+
+    def _request(self, method: str, url: str, body: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None) -> bytes:
+        deadline = self._call_deadline()
+        # Only GETs are idempotent, so only they are retried
+        retries = self.retries if method == 'GET' else 0
+        attempt = 0
+        while True:
+            try:
+                return self._attempt(method, url, body, headers, deadline)
+            except Exception as e:
+                if attempt >= retries or isinstance(e, CircuitOpenError) or not _is_host_failure(e):
+                    raise
+                # Full jitter: sleep a random time up to the exponential backoff
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    def _attempt(self, method: str, url: str, body: Optional[bytes], headers: Optional[Dict[str, str]],
+                 deadline: Optional[float]) -> bytes:
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return self._send_request(method, url, body, headers, deadline)
+
+        breaker.before_call()
+        try:
+            data = self._send_request(method, url, body, headers, deadline)
+        except Exception as e:
+            if _is_host_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except BaseException:
+            breaker.record_cancelled()
+            raise
+        breaker.record_success()
+        return data
+
+    def _send_request(self, method: str, url: str, body: Optional[bytes], headers: Optional[Dict[str, str]],
+                      deadline: Optional[float]) -> bytes:
+        metrics = self.metrics
+        if metrics is None:
+            return self.pool.request(method, url, body, headers, deadline)
+
+        event = RequestEvent(method, endpoint_name(url))
+        event.bytes_sent = len(body) if body else 0
+        metrics.request_started()
+        start = time.perf_counter()
+        try:
+            conn, response = self.pool.urlopen(method, url, body, headers, deadline)
+            event.status = response.status
+            received = time.perf_counter()
+            event.wait = received - start
+            data = self.pool.read_response(conn, response, deadline)
+            self.pool.release_response(conn, response)
+            event.transfer = time.perf_counter() - received
+            event.bytes_received = len(data)
+            return data
+        except BaseException as e:
+            self._record_error(event, e, start)
+            raise
+        finally:
+            metrics.request_finished(event)
+
+    @staticmethod
+    def _record_error(event: RequestEvent, error: BaseException, start: float):
+        event.error = error
+        if isinstance(error, HTTPError):
+            event.status = error.code
+        if not event.wait:
+            event.wait = time.perf_counter() - start
 
     def _get_data(self, url: str) -> Any:
-        return urlopen(Request(self._resolve_url(url))).read()
+        return self._request('GET', url)
 
     def _post_data(self, url: str, data: Any) -> Any:
-        return urlopen(Request(self._resolve_url(url),
-                               method='POST',
-                               data=bytes(self.encoder.encode(data), 'utf-8'),
-                               headers={'Content-Type': 'application/json'})).read()
+        return self._request('POST', url,
+                             body=self.fast_encoder.encode(data),
+                             headers={'Content-Type': 'application/json'})
 
     def _delete_data(self, url: str) -> Any:
-        return urlopen(Request(self._resolve_url(url), method='DELETE')).read()
+        return self._request('DELETE', url)
+
+    def _open_stream(self, url: str) -> Tuple[HTTPConnection, HTTPResponse]:
+        # Streams aren't retried, since part of the response may already have been handed out
+        deadline = self._call_deadline()
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return self.pool.urlopen('GET', url, deadline=deadline)
+
+        breaker.before_call()
+        try:
+            conn, response = self.pool.urlopen('GET', url, deadline=deadline)
+        except Exception as e:
+            if _is_host_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except BaseException:
+            breaker.record_cancelled()
+            raise
+        breaker.record_success()
+        return conn, response
+
+    def _iter_data(self, url: str, decode: Callable[[BinaryIO, str], Iterator[T]], data_type: str) -> Iterator[T]:
+        metrics = self.metrics
+        if metrics is None:
+            conn, response = self._open_stream(url)
+            try:
+                yield from decode(response, data_type)
+                response.read()
+            finally:
+                # The connection is only reused if the whole response was read
+                self.pool.release_response(conn, response)
+            return
+
+        event = RequestEvent('GET', endpoint_name(url))
+        metrics.request_started()
+        start = time.perf_counter()
+        try:
+            conn, response = self._open_stream(url)
+            event.status = response.status
+            received = time.perf_counter()
+            event.wait = received - start
+            event.bytes_received = int(response.getheader('Content-Length', 0))
+            try:
+                yield from decode(response, data_type)
+                response.read()
+            finally:
+                self.pool.release_response(conn, response)
+            # Streamed bodies are decoded as they arrive, so the transfer time includes decoding
+            event.transfer = time.perf_counter() - received
+        except BaseException as e:
+            self._record_error(event, e, start)
+            raise
+        finally:
+            metrics.request_finished(event)
+
+    def _get_decoded(self, url: str, decode: Callable[[Any, str], T], data_type: str) -> T:
+        if self.coalesce is None:
+            return decode(self._get_data(url), data_type)
+
+        value, shared = self._single_flight.do((url, decode, data_type),
+                                               lambda: decode(self._get_data(url), data_type),
+                                               self._call_deadline())
+        if shared and self.coalesce == 'copy':
+            # Every caller of a shared call gets its own copy, so none of them sees another's changes
+            return copy.deepcopy(value)
+        return value
+
+    def _get_cached(self, url: str, decode: Callable[[Any, str], T], data_type: str) -> T:
+        if self.cache is None:
+            return self._get_decoded(url, decode, data_type)
+        return self.cache.get_or_load(url, lambda: self._get_decoded(url, decode, data_type))
+
+    def _run_batch(self, func: Callable[[Any], T], items: Iterable[Tuple[Hashable, Any]]) -> PartialResult[Any, T]:
+        """Call `func` on each item concurrently, keeping results and errors in the order the items were given"""
+        with self._batch_lock:
+            if self._batch_executor is None:
+                self._batch_executor = ThreadPoolExecutor(max_workers=self._batch_workers,
+                                                          thread_name_prefix='als-batch')
+            # Workers run under the calling thread's deadline
+            deadline = getattr(self._local, 'deadline', None)
+            futures = [(key, self._batch_executor.submit(self._run_with_deadline, deadline, func, item))
+                       for key, item in items]
+
+        result: PartialResult[Any, T] = PartialResult()
+        for key, future in futures:
+            error = future.exception()
+            if error is not None:
+                result.errors[key] = error
+            else:
+                result.results[key] = future.result()
+        return result
+
+    def _run_with_deadline(self, deadline: Optional[float], func: Callable[[Any], T], item: Any) -> T:
+        self._local.deadline = deadline
+        try:
+            return func(item)
+        finally:
+            self._local.deadline = None
+
+    def _invalidate_cache(self, prefix: str):
+        if self.cache is not None:
+            self.cache.invalidate(prefix)
+        if prefix.startswith('/animation'):
+            self._validators.clear()
 
     def get_animation_info(self, anim_name: str) -> 'AnimationInfo':
-        return self.decoder.decode_object_with_type(self._get_data('/animation/' + anim_name), 'AnimationInfo')
+        return self._get_cached('/animation/' + anim_name, self.decoder.decode_object_with_type, 'AnimationInfo')
 
     def get_supported_animations(self) -> List['AnimationInfo']:
-        return self.decoder.decode_list_with_type(self._get_data('/animations'), 'AnimationInfo')
+        return self._get_cached('/animations', self.decoder.decode_list_with_type, 'AnimationInfo')
+
+    def iter_supported_animations(self) -> Iterator['AnimationInfo']:
+        """Like get_supported_animations, but decodes each animation as it is received"""
+        return self._iter_data('/animations', self.decoder.iter_list_with_type, 'AnimationInfo')
 
     def get_supported_animations_map(self) -> Dict[str, 'AnimationInfo']:
-        return self.decoder.decode_map_with_type(self._get_data('/animations/map'), 'AnimationInfo')
+        return self._get_cached('/animations/map', self.decoder.decode_map_with_type, 'AnimationInfo')
 
     def get_supported_animations_dict(self) -> Dict[str, 'AnimationInfo']:
         return self.get_supported_animations_map()
 
     def get_supported_animations_names(self) -> List[str]:
-        return json.loads(self._get_data('/animations/names'))
+        return self._get_decoded('/animations/names', _decode_json, '')
 
     def create_new_group(self, new_group: 'NewAnimationGroupInfo'):
-        return self.decoder.decode_object_with_type(self._post_data('/animations/newGroup', new_group), 'AnimationInfo')
+        try:
+            return self.decoder.decode_object_with_type(self._post_data('/animations/newGroup', new_group),
+                                                        'AnimationInfo')
+        finally:
+            self._invalidate_cache('/animation')
 
     def get_running_animations(self) -> Dict[str, 'RunningAnimationParams']:
-        return self.decoder.decode_map_with_type(self._get_data('/running'), 'RunningAnimationParams')
+        return self._get_decoded('/running', self.decoder.decode_map_with_type, 'RunningAnimationParams')
+
+    def iter_running_animations(self) -> Iterator[Tuple[str, 'RunningAnimationParams']]:
+        """Like get_running_animations, but yields each (id, params) pair as it is received"""
+        return self._iter_data('/running', self.decoder.iter_map_with_type, 'RunningAnimationParams')
 
     def get_running_animations_ids(self) -> List[str]:
-        return json.loads(self._get_data('/running/ids'))
+        return self._get_decoded('/running/ids', _decode_json, '')
 
     def get_running_animation_params(self, anim_id: str) -> 'RunningAnimationParams':
-        return self.decoder.decode_object_with_type(self._get_data('/running/' + anim_id), 'RunningAnimationParams')
+        return self._get_decoded('/running/' + anim_id, self.decoder.decode_object_with_type,
+                                 'RunningAnimationParams')
 
     def end_animation(self, anim_id: str) -> 'RunningAnimationParams':
         return self.decoder.decode_object_with_type(self._delete_data('/running/' + anim_id), 'RunningAnimationParams')
 
     def get_section(self, section_name: str) -> 'Section':
-        return self.decoder.decode_object_with_type(self._get_data('/sections/' + section_name), 'Section')
+        return self._get_cached('/sections/' + section_name, self.decoder.decode_object_with_type, 'Section')
 
     def get_sections(self) -> List['Section']:
-        return self.decoder.decode_list_with_type(self._get_data('/sections'), 'Section')
+        return self._get_cached('/sections', self.decoder.decode_list_with_type, 'Section')
+
+    def iter_sections(self) -> Iterator['Section']:
+        """Like get_sections, but decodes each section as it is received"""
+        return self._iter_data('/sections', self.decoder.iter_list_with_type, 'Section')
 
     def create_new_section(self, new_section: 'Section') -> 'Section':
-        return self.decoder.decode_object_with_type(self._post_data('/sections', new_section), 'Section')
+        try:
+            section = self.decoder.decode_object_with_type(self._post_data('/sections', new_section), 'Section')
+        finally:
+            self._invalidate_cache('/sections')
+        if self._section_tree is not None:
+            self._section_tree.add(section)
+        return section
 
     def get_sections_map(self) -> Dict[str, 'Section']:
-        return self.decoder.decode_map_with_type(self._get_data('/sections/map'), 'Section')
+        return self._get_cached('/sections/map', self.decoder.decode_map_with_type, 'Section')
 
     def get_sections_dict(self) -> Dict[str, 'Section']:
         return self.get_sections_map()
 
-    def start_animation(self, anim_params: 'AnimationToRunParams') -> 'RunningAnimationParams':
+    def get_section_tree(self, refresh: bool = False) -> SectionTree:
+        """The hierarchy of the strip's sections, fetched once and then kept up to date by create_new_section"""
+        if self._section_tree is None or refresh:
+            self._section_tree = SectionTree(self.get_sections_map())
+        return self._section_tree
+
+    def get_animation_validator(self, anim_name: str) -> AnimationValidator:
+        """Get the validator for an animation, fetching its AnimationInfo the first time"""
+        validator = self._validators.get(anim_name)
+        if validator is None:
+            validator = AnimationValidator(self.get_animation_info(anim_name))
+            self._validators[anim_name] = validator
+        return validator
+
+    def validate_animation(self, anim_params: 'AnimationToRunParams',
+                           fill_defaults: bool = True) -> 'AnimationToRunParams':
+        """Check `anim_params` against the animation's info without contacting the server (after the first time)
+
+        Raises AnimationValidationError describing every problem found.
+        Missing parameters are filled with their defaults if `fill_defaults` is True."""
+        if self._strip_dimensionality is None:
+            self._strip_dimensionality = strip_dimensionality(self.get_strip_info())
+        return self.get_animation_validator(anim_params.animation).validate(anim_params, self._strip_dimensionality,
+                                                                            fill_defaults)
+
+    def start_animation(self, anim_params: 'AnimationToRunParams',
+                        validate: bool = False) -> 'RunningAnimationParams':
+        if validate:
+            self.validate_animation(anim_params)
         return self.decoder.decode_object_with_type(self._post_data('/start', anim_params), 'RunningAnimationParams')
 
+    def start_animations(self, anim_params: Iterable['AnimationToRunParams']) \
+            -> PartialResult[int, 'RunningAnimationParams']:
+        """Start several animations concurrently
+
+        Results and errors are keyed by each animation's position in `anim_params`."""
+        return self._run_batch(self.start_animation, enumerate(anim_params))
+
+    def end_animations(self, anim_ids: Iterable[str]) -> PartialResult[str, 'RunningAnimationParams']:
+        """End several animations concurrently; results and errors are keyed by animation ID"""
+        return self._run_batch(self.end_animation, ((anim_id, anim_id) for anim_id in anim_ids))
+
+    def end_all_running(self) -> PartialResult[str, 'RunningAnimationParams']:
+        """End every running animation"""
+        return self.end_animations(self.get_running_animations_ids())
+
     def save_animation(self, anim_params: 'AnimationToRunParams') -> str:
-        return self._post_data('/save', anim_params)
+        try:
+            return self._post_data('/save', anim_params)
+        finally:
+            self._invalidate_cache('/animation')
 
     def get_saved_animations(self) -> List['AnimationToRunParams']:
-        return self.decoder.decode_list_with_type(self._get_data('/saved'), 'AnimationToRunParams')
+        return self._get_decoded('/saved', self.decoder.decode_list_with_type, 'AnimationToRunParams')
 
     def clear_strip(self):
         # TODO: Fix 404
         self._post_data('/strip/clear', None)
 
     def get_current_strip_color(self) -> List[int]:
-        return json.loads(self._get_data('/strip/color'))
+        return self._get_decoded('/strip/color', _decode_json, '')
+
+    def get_current_strip_color_array(self) -> Any:
+        """Like get_current_strip_color, but returns a packed uint32 buffer (a NumPy array if available)"""
+        return self._get_decoded('/strip/color', _decode_packed_colors, '')
+
+    def stream_strip_color(self, fps: float = 30.0, max_frames: Optional[int] = None) -> Iterator[StripColorFrame]:
+        """Poll the strip's colors at `fps` and yield a StripColorFrame each time they change"""
+        return stream_strip_color(self.get_current_strip_color_array, fps, max_frames)
 
     def get_strip_info(self) -> 'StripInfo':
-        return self.decoder.decode_object_with_type(self._get_data('/strip/info'), 'StripInfo')
+        return self._get_cached('/strip/info', self.decoder.decode_object_with_type, 'StripInfo')
+
+    def get_spatial_index(self, refresh: bool = False) -> SpatialIndex:
+        """A SpatialIndex over the strip's LED locations, built on the first call and then kept"""
+        if self._spatial_index is None or refresh:
+            self._spatial_index = SpatialIndex(self.get_strip_info().led_locations)
+        return self._spatial_index
 
     def end_animation_from_params(self, anim_params: 'RunningAnimationParams') -> 'RunningAnimationParams':
         return self.end_animation(anim_params.anim_id)
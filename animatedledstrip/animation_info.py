@@ -24,12 +24,17 @@ from typing import List, Optional, Dict
 class AnimationParameter:
     """Specifies an animation parameter that can be sent to an animation"""
 
+    __slots__ = ('name', 'description', 'default', 'data_type')
+
     def __init__(self, name: str = '', description: str = '', default=None, data_type=None):
         self.name: str = name
         self.description: str = description
         self.default = default
         self.data_type = data_type
 
+    def __reduce__(self):
+        return AnimationParameter, (self.name, self.description, self.default, self.data_type)
+
     def json_dict(self) -> Dict:
         return {
             'name': self.name,
@@ -0,0 +1,125 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import copy
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type, TYPE_CHECKING
+
+from .color_container import ColorContainer, PreparedColorContainer
+from .distance import AbsoluteDistance, PercentDistance
+from .equation import Equation
+from .location import Location
+from .rotation import DegreesRotation, RadiansRotation
+
+if TYPE_CHECKING:
+    from .animation_info import AnimationInfo, AnimationParameter
+    from .animation_to_run_params import AnimationToRunParams
+    from .strip_info import StripInfo
+
+# Parameter groups shared by AnimationInfo and AnimationToRunParams, with the value types each accepts
+_PARAM_GROUPS: List[Tuple[str, str, Tuple[Type, ...]]] = [
+    ('int_params', 'int', (int,)),
+    ('double_params', 'double', (float, int)),
+    ('string_params', 'string', (str,)),
+    ('location_params', 'location', (Location,)),
+    ('distance_params', 'distance', (AbsoluteDistance, PercentDistance)),
+    ('rotation_params', 'rotation', (DegreesRotation, RadiansRotation)),
+    ('equation_params', 'equation', (Equation,)),
+]
+
+
+def strip_dimensionality(strip_info: 'StripInfo') -> FrozenSet[str]:
+    """The dimensionality values (as used in AnimationInfo.dimensionality) a strip supports"""
+    supported = set()
+    if strip_info.is_1d_supported:
+        supported.add('ONE_DIMENSIONAL')
+    if strip_info.is_2d_supported:
+        supported.add('TWO_DIMENSIONAL')
+    if strip_info.is_3d_supported:
+        supported.add('THREE_DIMENSIONAL')
+    return frozenset(supported)
+
+
+class AnimationValidationError(ValueError):
+    """Raised when AnimationToRunParams don't fit the animation they are for"""
+
+    def __init__(self, animation: str, problems: List[str]):
+        super().__init__('Invalid parameters for {}: {}'.format(animation, '; '.join(problems)))
+        self.animation: str = animation
+        self.problems: List[str] = problems
+
+
+class AnimationValidator:
+    """Checks AnimationToRunParams against one animation's AnimationInfo
+
+    Everything needed for the checks is worked out once when the validator is
+    created, so reuse a validator for every start of the same animation."""
+
+    def __init__(self, info: 'AnimationInfo'):
+        self.name: str = info.name
+        self.names: FrozenSet[str] = frozenset(n.lower() for n in (info.name, info.abbr) if n)
+        self.minimum_colors: int = info.minimum_colors
+        self.dimensionality: FrozenSet[str] = frozenset(info.dimensionality)
+
+        # (attribute, parameter kind, accepted types, {name: default})
+        self._groups: List[Tuple[str, str, Tuple[Type, ...], Dict[str, Any]]] = []
+        for attr, kind, types in _PARAM_GROUPS:
+            params: List['AnimationParameter'] = getattr(info, attr)
+            self._groups.append((attr, kind, types, {p.name: p.default for p in params}))
+
+    def validate(self,
+                 anim_params: 'AnimationToRunParams',
+                 supported_dimensionality: Optional[FrozenSet[str]] = None,
+                 fill_defaults: bool = True) -> 'AnimationToRunParams':
+        """Check `anim_params`, raising AnimationValidationError listing every problem found
+
+        Parameters the animation has but `anim_params` doesn't set are filled
+        in (in place) with their defaults if `fill_defaults` is True. The
+        dimensionality check is skipped if `supported_dimensionality` is None."""
+        problems = []
+
+        if anim_params.animation.lower() not in self.names:
+            problems.append('animation is {!r}, not {!r}'.format(anim_params.animation, self.name))
+
+        if len(anim_params.colors) < self.minimum_colors:
+            problems.append('needs at least {} colors, got {}'.format(self.minimum_colors, len(anim_params.colors)))
+        for i, color in enumerate(anim_params.colors):
+            if not isinstance(color, (ColorContainer, PreparedColorContainer)):
+                problems.append('color {} is a {}, not a ColorContainer'.format(i, type(color).__name__))
+
+        if supported_dimensionality is not None and self.dimensionality \
+                and not self.dimensionality & supported_dimensionality:
+            problems.append('needs one of {}, but the strip supports {}'.format(
+                sorted(self.dimensionality), sorted(supported_dimensionality)))
+
+        for attr, kind, types, defaults in self._groups:
+            values: Dict[str, Any] = getattr(anim_params, attr)
+            for key, value in values.items():
+                if key not in defaults:
+                    problems.append('unknown {} parameter {!r}'.format(kind, key))
+                elif not isinstance(value, types) or isinstance(value, bool):
+                    problems.append('{} parameter {!r} is a {}'.format(kind, key, type(value).__name__))
+            if fill_defaults and len(values) < len(defaults):
+                for key, default in defaults.items():
+                    if key not in values and default is not None:
+                        values[key] = copy.deepcopy(default)
+
+        if problems:
+            raise AnimationValidationError(anim_params.animation, problems)
+        return anim_params
@@ -0,0 +1,207 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import asyncio
+import io
+import select
+import time
+from collections import deque
+from email.message import Message
+from typing import Deque, Dict, Optional, Tuple
+from urllib.error import HTTPError
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+# Errors that mean a reused keep-alive connection was closed by the server
+# while it sat idle in the pool; idempotent requests are retried on a fresh connection
+_STALE_CONNECTION_ERRORS = (asyncio.IncompleteReadError, ConnectionResetError,
+                            ConnectionAbortedError, BrokenPipeError)
+
+# The same errors can also come after the server has acted on the request, so only
+# requests that are safe to repeat are resent automatically
+_IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+def _is_dropped(conn: _Connection) -> bool:
+    """Whether an idle connection has been closed by the server (it is readable before a request is sent)"""
+    if conn[0].at_eof():
+        return True
+    sock = conn[1].get_extra_info('socket')
+    if sock is None:
+        return False
+    try:
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+class AsyncHTTPResponse:
+    """Status, headers and body of a response read by AsyncHTTPConnectionPool"""
+
+    def __init__(self, status: int, reason: str, headers: Message, body: bytes):
+        self.status: int = status
+        self.reason: str = reason
+        self.headers: Message = headers
+        self.body: bytes = body
+
+
+class AsyncHTTPConnectionPool:
+    """Keeps persistent HTTP/1.1 connections to a single server for use from an asyncio event loop"""
+
+    def __init__(self,
+                 host: str,
+                 port: int = 8080,
+                 max_size: int = 16,
+                 idle_timeout: float = 30.0,
+                 max_connections: Optional[int] = None):
+        self.host: str = host
+        self.port: int = port
+        self.max_size: int = max_size
+        self.idle_timeout: float = idle_timeout
+        self.max_connections: Optional[int] = max_connections
+
+        self._idle: Deque[Tuple[_Connection, float]] = deque()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _acquire(self) -> Tuple[_Connection, bool]:
+        now = time.monotonic()
+        while self._idle:
+            conn, last_used = self._idle.pop()
+            if now - last_used <= self.idle_timeout and not conn[0].at_eof():
+                return conn, True
+            conn[1].close()
+        return await asyncio.open_connection(self.host, self.port), False
+
+    def _release(self, conn: _Connection):
+        if len(self._idle) < self.max_size:
+            self._idle.append((conn, time.monotonic()))
+        else:
+            conn[1].close()
+
+    async def _send(self, conn: _Connection, method: str, url: str,
+                    body: Optional[bytes], headers: Dict[str, str]) -> Tuple[AsyncHTTPResponse, bool]:
+        reader, writer = conn
+
+        lines = ['{} {} HTTP/1.1'.format(method, url),
+                 'Host: {}:{}'.format(self.host, self.port),
+                 'Content-Length: {}'.format(len(body) if body is not None else 0)]
+        lines.extend('{}: {}'.format(k, v) for k, v in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if body:
+            writer.write(body)
+        await writer.drain()
+
+        status_line = await reader.readuntil(b'\r\n')
+        version, status, reason = (status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+
+        response_headers = Message()
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            response_headers[key.strip()] = value.strip()
+
+        keep_alive = version == 'HTTP/1.1' and response_headers.get('Connection', '').lower() != 'close'
+        if response_headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';', 1)[0], 16)
+                if size == 0:
+                    await self._read_trailers(reader)
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b''.join(chunks)
+        elif method == 'HEAD' or status in ('204', '304'):
+            # These never have a body, even if Content-Length is sent
+            data = b''
+        elif 'Content-Length' in response_headers:
+            data = await reader.readexactly(int(response_headers['Content-Length']))
+        else:
+            data = await reader.read()
+            keep_alive = False
+
+        return AsyncHTTPResponse(int(status), reason, response_headers, data), keep_alive
+
+    @staticmethod
+    async def _read_trailers(reader: asyncio.StreamReader):
+        while await reader.readuntil(b'\r\n') != b'\r\n':
+            pass
+
+    async def request(self, method: str, url: str, body: Optional[bytes] = None,
+                      headers: Optional[Dict[str, str]] = None) -> bytes:
+        """Send a request and return the full response body"""
+        if self.max_connections is None:
+            return await self._request(method, url, body, headers)
+
+        # Created lazily so the semaphore belongs to the loop the pool is used from
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        async with self._slots:
+            return await self._request(method, url, body, headers)
+
+    async def _request(self, method: str, url: str, body: Optional[bytes],
+                       headers: Optional[Dict[str, str]]) -> bytes:
+        if headers is None:
+            headers = {}
+
+        conn, reused = await self._acquire()
+        idempotent = method in _IDEMPOTENT_METHODS
+        if reused and not idempotent and _is_dropped(conn):
+            # Check before sending, since a request that isn't safe to repeat can't be retried afterwards
+            conn[1].close()
+            conn, reused = await asyncio.open_connection(self.host, self.port), False
+        try:
+            response, keep_alive = await self._send(conn, method, url, body, headers)
+        except _STALE_CONNECTION_ERRORS:
+            conn[1].close()
+            if not reused or not idempotent:
+                raise
+            conn = await asyncio.open_connection(self.host, self.port)
+            try:
+                response, keep_alive = await self._send(conn, method, url, body, headers)
+            except BaseException:
+                conn[1].close()
+                raise
+        except BaseException:
+            conn[1].close()
+            raise
+
+        if keep_alive:
+            self._release(conn)
+        else:
+            conn[1].close()
+
+        if response.status >= 400:
+            raise HTTPError('http://{}:{}{}'.format(self.host, self.port, url),
+                            response.status, response.reason, response.headers, io.BytesIO(response.body))
+
+        return response.body
+
+    async def clear(self):
+        """Close all idle connections"""
+        while self._idle:
+            writer = self._idle.pop()[0][1]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
@@ -0,0 +1,105 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import threading
+import time
+from typing import Callable
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request while a circuit breaker is open"""
+
+    def __init__(self, retry_after: float):
+        super().__init__('Circuit breaker is open, not retrying for another {:.1f} s'.format(retry_after))
+        self.retry_after: float = retry_after
+
+
+class CircuitBreaker:
+    """Fails calls to a host fast after it has failed repeatedly
+
+    After `failure_threshold` consecutive failures the breaker opens and every
+    call raises CircuitOpenError for `reset_timeout` seconds. Then a single
+    trial call is let through: if it succeeds the breaker closes again, and if
+    it fails the breaker stays open for another `reset_timeout`. A trial that
+    is cancelled, or doesn't finish within `reset_timeout`, is replaced by the
+    next call."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.failures: int = 0
+
+        self._clock = clock
+        self._state: str = CircuitBreaker.CLOSED
+        self._opened_at: float = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == CircuitBreaker.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return CircuitBreaker.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """Raise CircuitOpenError if a call shouldn't be made right now"""
+        with self._lock:
+            if self._state == CircuitBreaker.CLOSED:
+                return
+            now = self._clock()
+            waited = now - self._opened_at
+            if waited >= self.reset_timeout:
+                # Let this call through as the trial; others keep failing fast until it finishes.
+                # A trial that hasn't reported back within `reset_timeout` is given up on and replaced.
+                self._state = CircuitBreaker.HALF_OPEN
+                self._opened_at = now
+                return
+            raise CircuitOpenError(max(self.reset_timeout - waited, 0.0))
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = CircuitBreaker.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._state == CircuitBreaker.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = CircuitBreaker.OPEN
+                self._opened_at = self._clock()
+
+    def record_cancelled(self):
+        """Record a call that ended without showing whether the host works (e.g. it was interrupted)
+
+        A cancelled trial call lets the next call through as a new trial."""
+        with self._lock:
+            if self._state == CircuitBreaker.HALF_OPEN:
+                self._state = CircuitBreaker.OPEN
+                self._opened_at = self._clock() - self.reset_timeout
+
+    def reset(self):
+        self.record_success()
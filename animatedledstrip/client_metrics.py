@@ -0,0 +1,329 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import bisect
+import json
+import logging
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .json_decoder import ALSJsonDecoder
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) of the latency histogram buckets
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                                      10.0)
+
+
+def endpoint_name(url: str) -> str:
+    """Replace the animation, section or ID in a URL with a placeholder, so metrics are kept per endpoint"""
+    parts = url.split('?', 1)[0].split('/')
+    if len(parts) == 3:
+        if parts[1] == 'animation':
+            parts[2] = '{name}'
+        elif parts[1] == 'running' and parts[2] != 'ids':
+            parts[2] = '{id}'
+        elif parts[1] == 'sections' and parts[2] != 'map':
+            parts[2] = '{name}'
+    return '/'.join(parts)
+
+
+class Histogram:
+    """Counts observations into fixed buckets, like a Prometheus histogram"""
+
+    __slots__ = ['buckets', 'counts', 'count', 'sum']
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: Sequence[float] = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """(upper bound, number of observations <= upper bound) for each bucket, ending with +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(list(self.buckets) + [float('inf')], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': {str(bound): count for bound, count in self.cumulative_counts()},
+        }
+
+
+class RequestEvent:
+    """Timings and sizes of a single request, passed to ClientMetrics listeners
+
+    `wait` is the time until the response headers arrived (including connecting
+    and server processing) and `transfer` the time spent reading the body."""
+
+    __slots__ = ['method', 'endpoint', 'status', 'wait', 'transfer', 'bytes_sent', 'bytes_received', 'error']
+
+    def __init__(self, method: str, endpoint: str):
+        self.method: str = method
+        self.endpoint: str = endpoint
+        self.status: Optional[int] = None
+        self.wait: float = 0.0
+        self.transfer: float = 0.0
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+        self.error: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        return 'RequestEvent({} {} status={} wait={:.6f} transfer={:.6f})'.format(
+            self.method, self.endpoint, self.status, self.wait, self.transfer)
+
+
+class _EndpointMetrics:
+    __slots__ = ['wait', 'transfer', 'requests', 'errors', 'bytes_sent', 'bytes_received']
+
+    def __init__(self, buckets: Sequence[float]):
+        self.wait = Histogram(buckets)
+        self.transfer = Histogram(buckets)
+        self.requests: int = 0
+        self.errors: Dict[str, int] = {}
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+
+
+class ClientMetrics:
+    """Collects per-endpoint latency, transfer size, decode time and error metrics from an ALSHttpClient
+
+    Pass one to the client with `ALSHttpClient(..., metrics=ClientMetrics())`.
+    Callbacks added with `add_listener` are called with a RequestEvent after
+    every request. Exceptions raised by a listener are logged and otherwise
+    ignored, so a broken listener can't change the outcome of a request."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: Sequence[float] = tuple(buckets)
+        self.listeners: List[Callable[[RequestEvent], None]] = []
+        self.in_flight: int = 0
+        self.connections_opened: int = 0
+
+        self._endpoints: Dict[Tuple[str, str], _EndpointMetrics] = {}
+        self._connect = Histogram(self.buckets)
+        self._parse: Dict[str, Histogram] = {}
+        self._build: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[RequestEvent], None]):
+        self.listeners.append(listener)
+
+    def reset(self):
+        with self._lock:
+            self.connections_opened = 0
+            self._endpoints.clear()
+            self._connect = Histogram(self.buckets)
+            self._parse.clear()
+            self._build.clear()
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, event: RequestEvent):
+        with self._lock:
+            self.in_flight -= 1
+            key = (event.method, event.endpoint)
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = _EndpointMetrics(self.buckets)
+            endpoint.requests += 1
+            endpoint.wait.observe(event.wait)
+            endpoint.bytes_sent += event.bytes_sent
+            endpoint.bytes_received += event.bytes_received
+            if event.error is None:
+                endpoint.transfer.observe(event.transfer)
+            else:
+                kind = str(event.status) if event.status is not None else type(event.error).__name__
+                endpoint.errors[kind] = endpoint.errors.get(kind, 0) + 1
+
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception('Metrics listener %r failed for %r', listener, event)
+
+    def observe_connect(self, seconds: float):
+        with self._lock:
+            self.connections_opened += 1
+            self._connect.observe(seconds)
+
+    def observe_decode(self, data_type: str, parse: float, build: float):
+        """Record the time spent parsing JSON and building model objects of `data_type`"""
+        with self._lock:
+            histogram = self._parse.get(data_type)
+            if histogram is None:
+                histogram = self._parse[data_type] = Histogram(self.buckets)
+                self._build[data_type] = Histogram(self.buckets)
+            histogram.observe(parse)
+            self._build[data_type].observe(build)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'in_flight': self.in_flight,
+                'connections_opened': self.connections_opened,
+                'connect': self._connect.to_dict(),
+                'endpoints': {
+                    method + ' ' + endpoint: {
+                        'requests': m.requests,
+                        'errors': dict(m.errors),
+                        'bytes_sent': m.bytes_sent,
+                        'bytes_received': m.bytes_received,
+                        'wait': m.wait.to_dict(),
+                        'transfer': m.transfer.to_dict(),
+                    } for (method, endpoint), m in self._endpoints.items()
+                },
+                'decode': {
+                    data_type: {'parse': self._parse[data_type].to_dict(), 'build': self._build[data_type].to_dict()}
+                    for data_type in self._parse
+                },
+            }
+
+    def to_prometheus(self, prefix: str = 'als_client') -> str:
+        """Export the metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def labels(**values: str) -> str:
+            return '{' + ','.join('{}={}'.format(k, json.dumps(v)) for k, v in values.items()) + '}'
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append('# HELP {}_{} {}'.format(prefix, name, help_text))
+            lines.append('# TYPE {}_{} {}'.format(prefix, name, kind))
+
+        def histogram(name: str, h: Histogram, **values: str):
+            for bound, count in h.cumulative_counts():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append('{}_{}_bucket{} {}'.format(prefix, name, labels(**values, le=le), count))
+            lines.append('{}_{}_sum{} {!r}'.format(prefix, name, labels(**values), h.sum))
+            lines.append('{}_{}_count{} {}'.format(prefix, name, labels(**values), h.count))
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            header('in_flight_requests', 'gauge', 'Requests currently in flight')
+            lines.append('{}_in_flight_requests {}'.format(prefix, self.in_flight))
+
+            header('connect_seconds', 'histogram', 'Time to open a new connection')
+            histogram('connect_seconds', self._connect)
+
+            header('requests_total', 'counter', 'Requests sent')
+            for (method, endpoint), m in endpoints:
+                lines.append('{}_requests_total{} {}'.format(
+                    prefix, labels(method=method, endpoint=endpoint), m.requests))
+
+            header('errors_total', 'counter', 'Requests that failed, by HTTP status or exception type')
+            for (method, endpoint), m in endpoints:
+                for kind, count in sorted(m.errors.items()):
+                    lines.append('{}_errors_total{} {}'.format(
+                        prefix, labels(method=method, endpoint=endpoint, error=kind), count))
+
+            for name, attr, help_text in (('sent_bytes_total', 'bytes_sent', 'Request body bytes sent'),
+                                          ('received_bytes_total', 'bytes_received', 'Response body bytes received')):
+                header(name, 'counter', help_text)
+                for (method, endpoint), m in endpoints:
+                    lines.append('{}_{}{} {}'.format(prefix, name, labels(method=method, endpoint=endpoint),
+                                                     getattr(m, attr)))
+
+            header('wait_seconds', 'histogram', 'Time until the response headers arrived')
+            for (method, endpoint), m in endpoints:
+                histogram('wait_seconds', m.wait, method=method, endpoint=endpoint)
+
+            header('transfer_seconds', 'histogram', 'Time spent reading response bodies')
+            for (method, endpoint), m in endpoints:
+                histogram('transfer_seconds', m.transfer, method=method, endpoint=endpoint)
+
+            header('parse_seconds', 'histogram', 'Time spent parsing response JSON')
+            for data_type in sorted(self._parse):
+                histogram('parse_seconds', self._parse[data_type], type=data_type)
+
+            header('build_seconds', 'histogram', 'Time spent building model objects from parsed JSON')
+            for data_type in sorted(self._build):
+                histogram('build_seconds', self._build[data_type], type=data_type)
+
+        return '\n'.join(lines) + '\n'
+
+
+class InstrumentedJsonDecoder(ALSJsonDecoder):
+    """An ALSJsonDecoder that records how long parsing and building each response takes"""
+
+    def __init__(self, metrics: ClientMetrics, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics: ClientMetrics = metrics
+
+    def decode_object_with_type(self, obj, data_type: str):
+        start = time.perf_counter()
+        parsed = json.loads(obj)
+        parsed_at = time.perf_counter()
+        result = self.decoders[data_type](parsed)
+        self.metrics.observe_decode(data_type, parsed_at - start, time.perf_counter() - parsed_at)
+        return result
+
+    def decode_list_with_type(self, obj, data_type: str):
+        decoder = self.decoders[data_type]
+        start = time.perf_counter()
+        parsed = json.loads(obj)
+        parsed_at = time.perf_counter()
+        result = [decoder(o) for o in parsed]
+        self.metrics.observe_decode(data_type, parsed_at - start, time.perf_counter() - parsed_at)
+        return result
+
+    def decode_map_with_type(self, obj, data_type: str):
+        decoder = self.decoders[data_type]
+        start = time.perf_counter()
+        parsed = json.loads(obj)
+        parsed_at = time.perf_counter()
+        result = {k: decoder(v) for k, v in parsed.items()}
+        self.metrics.observe_decode(data_type, parsed_at - start, time.perf_counter() - parsed_at)
+        return result
+
+    def _timed_iter(self, items: Iterator[Any], data_type: str) -> Iterator[Any]:
+        # Streamed responses are read, parsed and built together, so the time
+        # is recorded as parsing once the whole response has been consumed
+        elapsed = 0.0
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                elapsed += time.perf_counter() - start
+                self.metrics.observe_decode(data_type, elapsed, 0.0)
+                return
+            elapsed += time.perf_counter() - start
+            yield item
+
+    def iter_list_with_type(self, stream: BinaryIO, data_type: str) -> Iterator[Any]:
+        return self._timed_iter(super().iter_list_with_type(stream, data_type), data_type)
+
+    def iter_map_with_type(self, stream: BinaryIO, data_type: str) -> Iterator[Tuple[str, Any]]:
+        return self._timed_iter(super().iter_map_with_type(stream, data_type), data_type)
@@ -18,20 +18,37 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 #  THE SOFTWARE.
 
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
+
+from .color_preparation import prepare_colors
+from .packed_colors import to_packed_array
 
 
 class ColorContainer:
     """Stores an array of colors"""
 
+    __slots__ = ('colors',)
+
     def __init__(self, colors: Optional[List[int]] = None):
         if colors is None:
             self.colors = []
         else:
             self.colors = colors
 
+    @classmethod
+    def from_buffer(cls, colors: Any) -> 'ColorContainer':
+        """Create a ColorContainer from a buffer of packed colors (such as a NumPy array), stored as an `array('I')`"""
+        return cls(to_packed_array(colors))
+
     def __eq__(self, other) -> bool:
-        return isinstance(other, ColorContainer) and self.colors == other.colors
+        if not isinstance(other, ColorContainer):
+            return False
+        if type(self.colors) is type(other.colors):
+            return self.colors == other.colors
+        return list(self.colors) == list(other.colors)
+
+    def __reduce__(self):
+        return ColorContainer, (self.colors,)
 
     def add_color(self, color: int) -> 'ColorContainer':
         """Add a color to the ColorContainer's list of colors"""
@@ -40,6 +57,10 @@ class ColorContainer:
         # Return this instance so method calls can be chained
         return self
 
+    def prepare(self, length: int) -> 'PreparedColorContainer':
+        """Spread the colors over `length` pixels the way the server does, without asking the server"""
+        return PreparedColorContainer(prepare_colors(self.colors, length), list(self.colors))
+
     def json_dict(self) -> Dict:
         return {
             'type': 'ColorContainer',
@@ -49,6 +70,8 @@ class ColorContainer:
 
 class PreparedColorContainer:
 
+    __slots__ = ('colors', 'original_colors')
+
     def __init__(self, colors: Optional[List[int]] = None, original_colors: Optional[List[int]] = None):
         if colors is None:
             self.colors = []
@@ -60,6 +83,14 @@ class PreparedColorContainer:
         else:
             self.original_colors = original_colors
 
+    @classmethod
+    def from_buffer(cls, colors: Any, original_colors: Any = ()) -> 'PreparedColorContainer':
+        """Create a PreparedColorContainer from buffers of packed colors, stored as `array('I')`s"""
+        return cls(to_packed_array(colors), to_packed_array(original_colors))
+
+    def __reduce__(self):
+        return PreparedColorContainer, (self.colors, self.original_colors)
+
     def json_dict(self) -> Dict:
         return {
             'type': 'PreparedColorContainer',
@@ -0,0 +1,97 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from array import array
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+from . import numpy_support
+
+_CHANNEL_SHIFTS = (16, 8, 0)
+
+
+def _breakpoints(num_colors: int, length: int) -> List[int]:
+    """The first pixel of each color's segment when `num_colors` colors are spread evenly over `length` pixels"""
+    spacing = length / num_colors
+    return [int(j * spacing) for j in range(num_colors)]
+
+
+# Results are cached as packed uint32 buffers (4 bytes per pixel) rather than lists of ints
+@lru_cache(maxsize=256)
+def _prepare(colors: Tuple[int, ...], length: int) -> array:
+    num_colors = len(colors)
+    if num_colors == 0 or length <= 0:
+        return array('I')
+    if num_colors == 1:
+        return array('I', [colors[0] & 0xFFFFFF]) * length
+
+    starts = _breakpoints(num_colors, length)
+    ends = starts[1:] + [length]
+
+    numpy = numpy_support.numpy
+    if numpy is not None:
+        packed = numpy.asarray(colors, dtype=numpy.int64)
+        following = numpy.roll(packed, -1)
+        starts_array = numpy.asarray(starts, dtype=numpy.int64)
+        ends_array = numpy.asarray(ends, dtype=numpy.int64)
+        pixels = numpy.arange(length, dtype=numpy.int64)
+        segment = numpy.searchsorted(starts_array, pixels, side='right') - 1
+        start = starts_array[segment]
+        fraction = (pixels - start) / (ends_array[segment] - start)
+
+        result = numpy.zeros(length, dtype=numpy.int64)
+        for shift in _CHANNEL_SHIFTS:
+            a = ((packed >> shift) & 0xFF)[segment]
+            b = ((following >> shift) & 0xFF)[segment]
+            result |= (a + numpy.trunc((b - a) * fraction).astype(numpy.int64)) << shift
+        packed = array('I')
+        packed.frombytes(result.astype(numpy.uint32).tobytes())
+        return packed
+
+    packed = array('I')
+    for j, (start, end) in enumerate(zip(starts, ends)):
+        if end <= start:
+            continue
+        current = colors[j]
+        following = colors[(j + 1) % num_colors]
+        channels = [((current >> shift) & 0xFF, ((following >> shift) & 0xFF) - ((current >> shift) & 0xFF), shift)
+                    for shift in _CHANNEL_SHIFTS]
+        size = end - start
+        for i in range(size):
+            fraction = i / size
+            color = 0
+            for a, difference, shift in channels:
+                color |= (a + int(difference * fraction)) << shift
+            packed.append(color)
+    return packed
+
+
+def prepare_colors(colors: Sequence[int], length: int) -> List[int]:
+    """Spread packed 0xRRGGBB colors evenly over `length` pixels, blending each into the next
+
+    Each color starts a segment of (nearly) equal length, and the pixels in a
+    segment fade linearly from its color toward the next one; the last
+    segment fades back toward the first color. Results are cached by colors
+    and length, so preparing the same colors again costs only a list copy."""
+    return _prepare(tuple(colors), length).tolist()
+
+
+def prepare_colors_cache_info():
+    return _prepare.cache_info()
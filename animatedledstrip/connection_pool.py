@@ -0,0 +1,203 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import io
+import select
+import socket
+import threading
+import time
+from collections import deque
+from http.client import HTTPConnection, HTTPResponse, RemoteDisconnected
+from typing import Deque, Dict, Optional, Tuple, TYPE_CHECKING
+from urllib.error import HTTPError
+
+if TYPE_CHECKING:
+    from .client_metrics import ClientMetrics
+
+# Errors that mean a reused keep-alive connection was closed by the server
+# while it sat idle in the pool; idempotent requests are retried on a fresh connection
+_STALE_CONNECTION_ERRORS = (RemoteDisconnected, ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+
+# The same errors can also come after the server has acted on the request, so only
+# requests that are safe to repeat are resent automatically
+_IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+def _remaining(deadline: float) -> float:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError('Deadline exceeded')
+    return remaining
+
+
+def _set_timeout(conn: HTTPConnection, timeout: Optional[float]):
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+
+
+def _is_dropped(conn: HTTPConnection) -> bool:
+    """Whether an idle connection's socket has been closed by the server (it is readable before a request is sent)"""
+    if conn.sock is None:
+        return True
+    try:
+        return bool(select.select([conn.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+def _raise_timeout(error: BaseException, deadline: Optional[float]):
+    """Turn a socket timeout caused by a deadline into a TimeoutError"""
+    if deadline is not None and isinstance(error, socket.timeout) and not isinstance(error, TimeoutError):
+        raise TimeoutError('Deadline exceeded') from error
+
+
+class HTTPConnectionPool:
+    """Keeps persistent HTTP/1.1 connections to a single server so requests can reuse them"""
+
+    def __init__(self,
+                 host: str,
+                 port: int = 8080,
+                 max_size: int = 4,
+                 idle_timeout: float = 30.0,
+                 timeout: Optional[float] = None):
+        self.host: str = host
+        self.port: int = port
+        self.max_size: int = max_size
+        self.idle_timeout: float = idle_timeout
+        self.timeout: Optional[float] = timeout
+        self.metrics: Optional['ClientMetrics'] = None
+
+        self._idle: Deque[Tuple[HTTPConnection, float]] = deque()
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> HTTPConnection:
+        return HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> Tuple[HTTPConnection, bool]:
+        """Get an idle connection if one is available, otherwise create a new one"""
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                conn, last_used = self._idle.pop()
+                if now - last_used <= self.idle_timeout:
+                    return conn, True
+                conn.close()
+        return self._new_connection(), False
+
+    def _release(self, conn: HTTPConnection):
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def _send(self, conn: HTTPConnection, method: str, url: str,
+              body: Optional[bytes], headers: Dict[str, str], deadline: Optional[float]) -> HTTPResponse:
+        if deadline is not None:
+            _set_timeout(conn, _remaining(deadline))
+        if conn.sock is None:
+            start = time.perf_counter()
+            conn.connect()
+            if self.metrics is not None:
+                self.metrics.observe_connect(time.perf_counter() - start)
+            if deadline is not None:
+                _set_timeout(conn, _remaining(deadline))
+        conn.request(method, url, body=body, headers=headers)
+        return conn.getresponse()
+
+    def urlopen(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None,
+                deadline: Optional[float] = None) -> Tuple[HTTPConnection, HTTPResponse]:
+        """Send a request and return the connection and the unread response
+
+        The connection must be handed back with `release_response` once the
+        response body has been consumed. If a `deadline` (a `time.monotonic()`
+        value) is given, connecting and waiting for the response stop there
+        with a TimeoutError."""
+        if headers is None:
+            headers = {}
+
+        conn, reused = self._acquire()
+        idempotent = method in _IDEMPOTENT_METHODS
+        if reused and not idempotent and _is_dropped(conn):
+            # Check before sending, since a request that isn't safe to repeat can't be retried afterwards
+            conn.close()
+            conn, reused = self._new_connection(), False
+        try:
+            response = self._send(conn, method, url, body, headers, deadline)
+        except _STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused or not idempotent:
+                raise
+            conn = self._new_connection()
+            try:
+                response = self._send(conn, method, url, body, headers, deadline)
+            except BaseException as e:
+                conn.close()
+                _raise_timeout(e, deadline)
+                raise
+        except BaseException as e:
+            conn.close()
+            _raise_timeout(e, deadline)
+            raise
+
+        if response.status >= 400:
+            data = self.read_response(conn, response, deadline)
+            self.release_response(conn, response)
+            raise HTTPError('http://{}:{}{}'.format(self.host, self.port, url),
+                            response.status, response.reason, response.headers, io.BytesIO(data))
+
+        return conn, response
+
+    def release_response(self, conn: HTTPConnection, response: HTTPResponse):
+        """Return a connection to the pool, or close it if its response was not fully read"""
+        if response.will_close or not response.isclosed():
+            conn.close()
+        else:
+            if conn.timeout != self.timeout:
+                _set_timeout(conn, self.timeout)
+            self._release(conn)
+
+    @staticmethod
+    def read_response(conn: HTTPConnection, response: HTTPResponse, deadline: Optional[float]) -> bytes:
+        """Read the whole response body, closing the connection if that fails"""
+        try:
+            if deadline is not None:
+                _set_timeout(conn, _remaining(deadline))
+            return response.read()
+        except BaseException as e:
+            conn.close()
+            _raise_timeout(e, deadline)
+            raise
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None, deadline: Optional[float] = None) -> bytes:
+        """Send a request and return the full response body"""
+        conn, response = self.urlopen(method, url, body, headers, deadline)
+        data = self.read_response(conn, response, deadline)
+        self.release_response(conn, response)
+        return data
+
+    def clear(self):
+        """Close all idle connections"""
+        with self._lock:
+            while self._idle:
+                self._idle.pop()[0].close()
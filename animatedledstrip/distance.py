@@ -23,11 +23,16 @@ from typing import Dict
 
 class AbsoluteDistance:
 
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
         self.x = x
         self.y = y
         self.z = z
 
+    def __reduce__(self):
+        return AbsoluteDistance, (self.x, self.y, self.z)
+
     def json_dict(self) -> Dict:
         return {
             'type': 'AbsoluteDistance',
@@ -39,11 +44,16 @@ class AbsoluteDistance:
 
 class PercentDistance:
 
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
         self.x = x
         self.y = y
         self.z = z
 
+    def __reduce__(self):
+        return PercentDistance, (self.x, self.y, self.z)
+
     def json_dict(self) -> Dict:
         return {
             'type': 'PercentDistance',
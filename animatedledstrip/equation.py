@@ -18,10 +18,57 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 #  THE SOFTWARE.
 
-from typing import List, Optional, Dict
+from array import array
+from functools import lru_cache
+from math import comb
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import numpy_support
+
+
+@lru_cache(maxsize=1024)
+def _compile(types: Tuple[type, ...], coefficients: Tuple[float, ...]) -> Callable[[Any], Any]:
+    """A function evaluating the polynomial by Horner's method
+
+    Only + and * are used, so the function also works element-wise on NumPy arrays.
+    `types` is part of the cache key so int and float coefficients (which are equal) aren't mixed up."""
+    if not coefficients:
+        coefficients = (0.0,)
+    highest = coefficients[-1]
+    rest = coefficients[-2::-1]
+
+    def evaluate(x: Any) -> Any:
+        result = highest
+        for c in rest:
+            result = result * x + c
+        return result
+
+    return evaluate
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """Solve a small linear system by Gaussian elimination with partial pivoting"""
+    n = len(vector)
+    rows = [row[:] + [v] for row, v in zip(matrix, vector)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        if rows[pivot][col] == 0:
+            raise ValueError('Not enough distinct x values to fit an equation of degree {}'.format(n - 1))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, n + 1):
+                rows[r][c] -= factor * rows[col][c]
+    result = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        result[r] = (rows[r][n] - sum(rows[r][c] * result[c] for c in range(r + 1, n))) / rows[r][r]
+    return result
 
 
 class Equation:
+    """A polynomial, with coefficients in order of increasing power of x"""
+
+    __slots__ = ('coefficients',)
 
     def __init__(self, coefficients: Optional[List[float]] = None):
         if coefficients is None:
@@ -29,6 +76,76 @@ class Equation:
         else:
             self.coefficients: List[float] = coefficients
 
+    def __reduce__(self):
+        return Equation, (self.coefficients,)
+
+    def __call__(self, x: float) -> float:
+        return self.compile()(x)
+
+    def compile(self) -> Callable[[float], float]:
+        """A function evaluating the equation by Horner's method, cached for each set of coefficients"""
+        coefficients = tuple(self.coefficients)
+        return _compile(tuple(map(type, coefficients)), coefficients)
+
+    def evaluate_many(self, xs: Iterable[float]) -> Any:
+        """Evaluate the equation at every x at once
+
+        Returns a float64 NumPy array if NumPy is available, otherwise an `array('d')`."""
+        func = self.compile()
+        numpy = numpy_support.numpy
+        if numpy is not None:
+            if hasattr(xs, '__len__'):
+                xs = numpy.asarray(xs, dtype=numpy.float64)
+            else:
+                xs = numpy.fromiter(xs, dtype=numpy.float64)
+            if len(self.coefficients) <= 1:
+                return numpy.full(xs.shape, func(0.0))
+            return func(xs)
+        return array('d', map(func, xs))
+
+    @classmethod
+    def fit(cls, xs: Sequence[float], ys: Sequence[float], degree: int) -> 'Equation':
+        """The equation of the given degree that best fits the (x, y) points, by least squares"""
+        if len(xs) != len(ys):
+            raise ValueError('Got {} x values but {} y values'.format(len(xs), len(ys)))
+        if len(xs) <= degree:
+            raise ValueError('At least {} points are needed to fit an equation of degree {}'
+                             .format(degree + 1, degree))
+
+        numpy = numpy_support.numpy
+        if numpy is not None:
+            coefficients = numpy.polynomial.polynomial.polyfit(numpy.asarray(xs, dtype=numpy.float64),
+                                                               numpy.asarray(ys, dtype=numpy.float64), degree)
+            return cls([float(c) for c in coefficients])
+
+        # Map x onto [-1, 1] first: powers of raw x (e.g. 1000^6) leave the normal equations too
+        # badly conditioned to recover the small coefficients
+        low, high = min(xs), max(xs)
+        center = (low + high) / 2
+        scale = (high - low) / 2 or 1.0
+
+        # Solve the normal equations: sums of t^(i + j) times the coefficients equal sums of y * t^i
+        power_sums = [0.0] * (2 * degree + 1)
+        moments = [0.0] * (degree + 1)
+        for x, y in zip(xs, ys):
+            t = (x - center) / scale
+            power = 1.0
+            for i in range(2 * degree + 1):
+                power_sums[i] += power
+                if i <= degree:
+                    moments[i] += y * power
+                power *= t
+        matrix = [[power_sums[i + j] for j in range(degree + 1)] for i in range(degree + 1)]
+        scaled = _solve(matrix, moments)
+
+        # Expand b_k * ((x - center) / scale)^k back into powers of x
+        coefficients = [0.0] * (degree + 1)
+        for k, b in enumerate(scaled):
+            factor = b / scale ** k
+            for j in range(k + 1):
+                coefficients[j] += factor * comb(k, j) * (-center) ** (k - j)
+        return cls(coefficients)
+
     def json_dict(self) -> Dict:
         return {
             'type': 'Equation',
@@ -0,0 +1,133 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+# Generators for realistic server data of configurable size, used by the fake
+# server and the benchmarks
+
+import json
+import math
+from typing import Dict, List
+
+
+def location(i: int) -> Dict:
+    return {'x': float(i % 40), 'y': float(i // 40 % 40), 'z': float(i // 1600)}
+
+
+def animation_parameter(name: str, default) -> Dict:
+    return {'name': name, 'description': 'The {} parameter'.format(name), 'default': default}
+
+
+def animation_info(i: int) -> Dict:
+    return {
+        'name': 'Animation{}'.format(i),
+        'abbr': 'A{}'.format(i),
+        'description': 'Test animation number {}'.format(i),
+        'runCountDefault': -1,
+        'minimumColors': 1,
+        'unlimitedColors': i % 2 == 0,
+        'dimensionality': ['ONE_DIMENSIONAL', 'TWO_DIMENSIONAL', 'THREE_DIMENSIONAL'],
+        'intParams': [animation_parameter('interMovementDelay', 10), animation_parameter('spacing', 3)],
+        'doubleParams': [animation_parameter('speed', 1.5)],
+        'stringParams': [animation_parameter('mode', 'normal')],
+        'locationParams': [animation_parameter('center', location(i))],
+        'distanceParams': [animation_parameter('distance', {'type': 'AbsoluteDistance', 'x': 1.0, 'y': 2.0,
+                                                            'z': 3.0})],
+        'rotationParams': [animation_parameter('rotation', {'type': 'RadiansRotation', 'xRotation': 0.0,
+                                                            'yRotation': 0.0, 'zRotation': math.pi,
+                                                            'rotationOrder': ['ROTATE_Z', 'ROTATE_X']})],
+        'equationParams': [animation_parameter('equation', {'coefficients': [0.0, 1.0, 0.5]})],
+    }
+
+
+def source_params(i: int) -> Dict:
+    return {
+        'animation': 'Animation{}'.format(i),
+        'colors': [{'type': 'ColorContainer', 'colors': [0xFF0000, 0x00FF00, 0x0000FF]}],
+        'id': str(i),
+        'section': 'fullStrip',
+        'runCount': -1,
+        'intParams': {'interMovementDelay': 10},
+        'doubleParams': {'speed': 1.5},
+        'stringParams': {},
+        'locationParams': {'center': location(i)},
+        'distanceParams': {'distance': {'type': 'PercentDistance', 'x': 50.0, 'y': 50.0, 'z': 50.0}},
+        'rotationParams': {'rotation': {'type': 'DegreesRotation', 'xRotation': 0.0, 'yRotation': 0.0,
+                                        'zRotation': 90.0, 'rotationOrder': ['ROTATE_Z', 'ROTATE_X']}},
+        'equationParams': {'equation': {'coefficients': [0.0, 1.0, 0.5]}},
+    }
+
+
+def running_animation(i: int, num_leds: int = 240) -> Dict:
+    colors = [0xFF0000, 0x00FF00, 0x0000FF]
+    return {
+        'animationName': 'Animation{}'.format(i),
+        'colors': [{'type': 'PreparedColorContainer', 'colors': [colors[p % 3] for p in range(num_leds)],
+                    'originalColors': colors}],
+        'id': str(i),
+        'section': 'fullStrip',
+        'runCount': -1,
+        'intParams': {'interMovementDelay': 10},
+        'doubleParams': {'speed': 1.5},
+        'stringParams': {},
+        'locationParams': {'center': location(i)},
+        'distanceParams': {'distance': {'type': 'AbsoluteDistance', 'x': 1.0, 'y': 2.0, 'z': 3.0}},
+        'rotationParams': {'rotation': {'type': 'RadiansRotation', 'xRotation': 0.0, 'yRotation': 0.0,
+                                        'zRotation': math.pi, 'rotationOrder': ['ROTATE_Z', 'ROTATE_X']}},
+        'equationParams': {'equation': {'coefficients': [0.0, 1.0, 0.5]}},
+        'sourceParams': source_params(i),
+    }
+
+
+def section(i: int, num_pixels: int) -> Dict:
+    start = i * num_pixels
+    return {'name': 'section{}'.format(i), 'pixels': list(range(start, start + num_pixels)),
+            'parentSectionName': 'fullStrip'}
+
+
+def strip_info(num_leds: int) -> Dict:
+    return {
+        'numLEDs': num_leds,
+        'pin': 12,
+        'renderDelay': 10,
+        'isRenderLoggingEnabled': False,
+        'renderLogFile': '',
+        'rendersBetweenLogSaves': 1000,
+        'is1DSupported': True,
+        'is2DSupported': True,
+        'is3DSupported': True,
+        'ledLocations': [location(i) for i in range(num_leds)],
+    }
+
+
+def strip_info_json(num_leds: int) -> bytes:
+    return json.dumps(strip_info(num_leds)).encode()
+
+
+def animation_map_json(num_animations: int) -> bytes:
+    return json.dumps({'Animation{}'.format(i): animation_info(i) for i in range(num_animations)}).encode()
+
+
+def running_map_json(num_running: int, num_leds: int = 240) -> bytes:
+    return json.dumps({str(i): running_animation(i, num_leds) for i in range(num_running)}).encode()
+
+
+def sections_json(num_sections: int, num_pixels: int = 100) -> bytes:
+    sections: List[Dict] = [section(i, num_pixels) for i in range(num_sections)]
+    return json.dumps(sections).encode()
@@ -0,0 +1,285 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import fake_data
+
+
+class _FakeALSRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: '_FakeALSHTTPServer'
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, status: int, body: Any = None):
+        data = json.dumps(body, separators=(',', ':')).encode() if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method: str):
+        fake = self.server.fake
+        body = None
+        if 'Content-Length' in self.headers:
+            body = self.rfile.read(int(self.headers['Content-Length']))
+
+        with fake.lock:
+            fake.request_count += 1
+        if fake.latency > 0:
+            time.sleep(fake.latency)
+        if fake.error_rate > 0 and fake.random.random() < fake.error_rate:
+            self._respond(500, {'error': 'Injected failure'})
+            return
+
+        try:
+            status, response = fake.handle(method, self.path, json.loads(body) if body else None)
+        except (KeyError, TypeError, ValueError) as e:
+            status, response = 400, {'error': str(e)}
+        self._respond(status, response)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+class _FakeALSHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], fake: 'FakeALSServer'):
+        super().__init__(address, _FakeALSRequestHandler)
+        self.fake: 'FakeALSServer' = fake
+
+
+class FakeALSServer:
+    """A local stand-in for an AnimatedLEDStrip server, for tests and benchmarks
+
+    Implements the endpoints ALSHttpClient uses, backed by generated data of
+    configurable size. `latency` (seconds added to every response) and
+    `error_rate` (fraction of requests answered with a 500) can be changed
+    while the server is running."""
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 num_leds: int = 240,
+                 num_animations: int = 20,
+                 num_sections: int = 4,
+                 num_running: int = 0,
+                 latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.num_leds: int = num_leds
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.request_count: int = 0
+
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+
+        self.animations: Dict[str, Dict] = {}
+        for i in range(num_animations):
+            info = fake_data.animation_info(i)
+            self.animations[info['name']] = info
+
+        section_size = max(num_leds // max(num_sections, 1), 1)
+        self.sections: Dict[str, Dict] = {'fullStrip': {'name': 'fullStrip', 'pixels': list(range(num_leds)),
+                                                        'parentSectionName': ''}}
+        for i in range(num_sections):
+            section = fake_data.section(i, section_size)
+            self.sections[section['name']] = section
+
+        self.running: Dict[str, Dict] = {}
+        for i in range(num_running):
+            running = fake_data.running_animation(i, num_leds)
+            self.running[running['id']] = running
+        self._next_id = num_running
+
+        self.saved: List[Dict] = []
+        self.strip_info: Dict = fake_data.strip_info(num_leds)
+        self.strip_colors: List[int] = [0] * num_leds
+
+        self._httpd = _FakeALSHTTPServer((host, port), self)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._httpd.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def __enter__(self) -> 'FakeALSServer':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """Serve requests from a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-als-server', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread (if `start` was called) and close the listening socket"""
+        # shutdown() waits for serve_forever to exit, so it would hang if the server was never started
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def serve_forever(self):
+        """Serve requests from the calling thread"""
+        self._httpd.serve_forever()
+
+    def _start_animation(self, params: Dict) -> Dict:
+        anim_id = params.get('id') or str(self._next_id)
+        self._next_id += 1
+        section = self.sections.get(params.get('section') or 'fullStrip', self.sections['fullStrip'])
+        num_pixels = len(section['pixels'])
+        running = {
+            'animationName': params['animation'],
+            'colors': [{'type': 'PreparedColorContainer',
+                        'colors': [c['colors'][i % len(c['colors'])] for i in range(num_pixels)] if c['colors'] else [],
+                        'originalColors': c['colors']} for c in params.get('colors', [])],
+            'id': anim_id,
+            'section': section['name'],
+            'runCount': params.get('runCount', 0),
+            'intParams': params.get('intParams', {}),
+            'doubleParams': params.get('doubleParams', {}),
+            'stringParams': params.get('stringParams', {}),
+            'locationParams': params.get('locationParams', {}),
+            'distanceParams': params.get('distanceParams', {}),
+            'rotationParams': params.get('rotationParams', {}),
+            'equationParams': params.get('equationParams', {}),
+            'sourceParams': dict(params, id=anim_id),
+        }
+        self.running[anim_id] = running
+
+        # Show the animation's first color on its section so the strip's colors change
+        if running['colors'] and running['colors'][0]['colors']:
+            color = running['colors'][0]['colors'][0]
+            for pixel in section['pixels']:
+                if pixel < len(self.strip_colors):
+                    self.strip_colors[pixel] = color
+        return running
+
+    def handle(self, method: str, path: str, body: Any) -> Tuple[int, Any]:
+        """Handle one request, returning the status and the object to send back as JSON"""
+        parts = path.split('?', 1)[0].strip('/').split('/')
+        with self.lock:
+            if method == 'GET':
+                if parts == ['animations']:
+                    return 200, list(self.animations.values())
+                if parts == ['animations', 'map']:
+                    return 200, self.animations
+                if parts == ['animations', 'names']:
+                    return 200, list(self.animations)
+                if len(parts) == 2 and parts[0] == 'animation' and parts[1] in self.animations:
+                    return 200, self.animations[parts[1]]
+                if parts == ['running']:
+                    return 200, self.running
+                if parts == ['running', 'ids']:
+                    return 200, list(self.running)
+                if len(parts) == 2 and parts[0] == 'running' and parts[1] in self.running:
+                    return 200, self.running[parts[1]]
+                if parts == ['sections']:
+                    return 200, list(self.sections.values())
+                if parts == ['sections', 'map']:
+                    return 200, self.sections
+                if len(parts) == 2 and parts[0] == 'sections' and parts[1] in self.sections:
+                    return 200, self.sections[parts[1]]
+                if parts == ['saved']:
+                    return 200, self.saved
+                if parts == ['strip', 'color']:
+                    return 200, self.strip_colors
+                if parts == ['strip', 'info']:
+                    return 200, self.strip_info
+            elif method == 'POST':
+                if parts == ['animations', 'newGroup']:
+                    info = dict(body['groupInfo'])
+                    self.animations[info['name']] = info
+                    return 200, info
+                if parts == ['sections']:
+                    section = {'name': body['name'], 'pixels': body['pixels'],
+                               'parentSectionName': body.get('parentSectionName', '')}
+                    self.sections[section['name']] = section
+                    return 200, section
+                if parts == ['start']:
+                    return 200, self._start_animation(body)
+                if parts == ['save']:
+                    self.saved.append(body)
+                    return 200, body
+                if parts == ['strip', 'clear']:
+                    self.running.clear()
+                    self.strip_colors = [0] * self.num_leds
+                    return 200, None
+            elif method == 'DELETE':
+                if len(parts) == 2 and parts[0] == 'running' and parts[1] in self.running:
+                    return 200, self.running.pop(parts[1])
+        return 404, None
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Run a fake AnimatedLEDStrip server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--leds', type=int, default=240, help='number of LEDs in the strip')
+    parser.add_argument('--animations', type=int, default=20, help='number of supported animations')
+    parser.add_argument('--sections', type=int, default=4, help='number of sections besides fullStrip')
+    parser.add_argument('--running', type=int, default=0, help='number of animations running at startup')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests that fail with a 500')
+    parser.add_argument('--seed', type=int, default=None)
+    options = parser.parse_args(args)
+
+    server = FakeALSServer(options.host, options.port, num_leds=options.leds, num_animations=options.animations,
+                           num_sections=options.sections, num_running=options.running, latency=options.latency,
+                           error_rate=options.error_rate, seed=options.seed)
+    print('Fake AnimatedLEDStrip server listening on {}:{}'.format(server.host, server.port), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import json
+from array import array
+from typing import Any
+
+from .pixel_ranges import PixelRanges
+
+
+def _default(o: Any) -> Any:
+    """Convert values the json module can't encode itself"""
+    if hasattr(o, 'json_dict'):
+        return o.json_dict()
+    if isinstance(o, array):
+        return o.tolist()
+    if isinstance(o, PixelRanges):
+        return o.to_list()
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(o).__name__))
+
+
+class ALSFastJsonEncoder:
+    """Encodes model objects to compact JSON bytes, ready to send as a request body
+
+    The C JSON encoder does the work, calling back only for model objects
+    (through their json_dict), arrays and PixelRanges. The output is ASCII, so
+    no UTF-8 encoding pass is needed beyond copying the str to bytes. Anything
+    ALSJsonEncoder accepts, including subclasses of the JSON types such as
+    OrderedDict or IntEnum, is accepted here too."""
+
+    def __init__(self):
+        self._encode = json.JSONEncoder(separators=(',', ':'), default=_default).encode
+
+    def encode(self, o: Any) -> bytes:
+        return self._encode(o).encode('ascii')
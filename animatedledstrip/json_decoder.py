@@ -19,14 +19,17 @@
 #  THE SOFTWARE.
 import json
 from json import JSONDecoder
-from typing import Dict, Any
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
 
 from .animation_info import AnimationInfo, AnimationParameter
 from .animation_to_run_params import AnimationToRunParams
 from .color_container import ColorContainer, PreparedColorContainer
 from .distance import AbsoluteDistance, PercentDistance
-from .json_encoder import ALSJsonEncoder
+from .equation import Equation
+from .json_stream import iter_json_array, iter_json_object
 from .location import Location
+from .location_buffer import LocationBuffer
+from .pixel_ranges import PixelRanges
 from .rotation import DegreesRotation, RadiansRotation
 from .running_animation_params import RunningAnimationParams
 from .section import Section
@@ -39,141 +42,207 @@ def add_dicts(dict1: Dict, dict2: Dict) -> Dict:
 
 
 class ALSJsonDecoder(JSONDecoder):
+    """Decodes server responses into model objects
+
+    Parsed JSON objects are turned into model objects in a single pass: each
+    type name maps to a function in `decoders` that builds the object (and any
+    nested model objects) straight from the parsed dict."""
 
     def __init__(self, *args, **kwargs):
         JSONDecoder.__init__(self, object_hook=self.object_hook, *args, **kwargs)
 
-        self.encoder = ALSJsonEncoder()
+        self.decoders: Dict[str, Callable[[Dict], Any]] = {
+            'AbsoluteDistance': self._decode_absolute_distance,
+            'AnimationInfo': self._decode_animation_info,
+            'AnimationToRunParams': self._decode_animation_to_run_params,
+            'ColorContainer': self._decode_color_container,
+            'DegreesRotation': self._decode_degrees_rotation,
+            'Equation': self._decode_equation,
+            'Location': self._decode_location,
+            'PercentDistance': self._decode_percent_distance,
+            'PreparedColorContainer': self._decode_prepared_color_container,
+            'RadiansRotation': self._decode_radians_rotation,
+            'RunningAnimationParams': self._decode_running_animation_params,
+            'Section': self._decode_section,
+            'StripInfo': self._decode_strip_info,
+        }
+
+        # How the default value of an AnimationParameter is decoded, by parameter data type
+        self._param_default_decoders: Dict[str, Callable[[Any], Any]] = {
+            'Location': self._decode_location,
+            'Equation': self._decode_equation,
+            'Distance': self.decode_typed,
+            'Rotation': self.decode_typed,
+        }
 
     def decode_dict(self, json: Dict) -> Any:
-        return self.decode(self.encoder.encode(json))
+        return self.decode_typed(json)
 
     def decode_object_with_type(self, obj, data_type: str):
-        return self.decode_dict(add_dicts(json.loads(obj), {"type": data_type}))
+        return self.decoders[data_type](json.loads(obj))
 
     def decode_list_with_type(self, obj, data_type: str):
-        json_list = json.loads(obj)
-        decoded_list = []
-        for o in json_list:
-            decoded_list.append(self.decode_dict(add_dicts(o, {"type": data_type})))
-        return decoded_list
+        decoder = self.decoders[data_type]
+        return [decoder(o) for o in json.loads(obj)]
 
     def decode_map_with_type(self, obj, data_type: str):
-        json_dict = json.loads(obj)
-        decoded_dict = {}
-        for k in json_dict:
-            decoded_dict.update({k: self.decode_dict(add_dicts(json_dict[k], {"type": data_type}))})
-        return decoded_dict
+        decoder = self.decoders[data_type]
+        return {k: decoder(v) for k, v in json.loads(obj).items()}
+
+    def iter_list_with_type(self, stream: BinaryIO, data_type: str) -> Iterator[Any]:
+        """Decode the elements of a JSON list as they are read from `stream`"""
+        decoder = self.decoders[data_type]
+        for o in iter_json_array(stream):
+            yield decoder(o)
+
+    def iter_map_with_type(self, stream: BinaryIO, data_type: str) -> Iterator[Tuple[str, Any]]:
+        """Decode the (key, value) pairs of a JSON map as they are read from `stream`"""
+        decoder = self.decoders[data_type]
+        for k, v in iter_json_object(stream):
+            yield k, decoder(v)
+
+    def decode_typed(self, obj: Any) -> Any:
+        """Decode a parsed object that names its own type in a `type` field
+
+        Anything that isn't a dict with a known type is returned unchanged, so
+        values that were already decoded by `object_hook` pass through."""
+        if type(obj) is dict:
+            decoder = self.decoders.get(obj.get('type'))
+            if decoder is not None:
+                return decoder(obj)
+        return obj
 
     def object_hook(self, obj):
-        data_type = obj.get('type', '')
-        if data_type == 'AbsoluteDistance':
-            return AbsoluteDistance(obj['x'], obj['y'], obj['z'])
-        elif data_type == 'AnimationInfo':
-            return AnimationInfo(
-                name=obj['name'],
-                abbr=obj['abbr'],
-                description=obj['description'],
-                run_count_default=obj['runCountDefault'],
-                minimum_colors=obj['minimumColors'],
-                unlimited_colors=obj['unlimitedColors'],
-                dimensionality=obj['dimensionality'],
-                int_params=[self.decode_dict(add_dicts(param, {'type': 'AnimationParameter',
-                                                               'data_type': 'int'}))
-                            for param in obj['intParams']],
-                double_params=[self.decode_dict(add_dicts(param, {'type': 'AnimationParameter',
-                                                                  'data_type': 'float'}))
-                               for param in obj['doubleParams']],
-                string_params=[self.decode_dict(add_dicts(param, {'type': 'AnimationParameter',
-                                                                  'data_type': 'str'}))
-                               for param in obj['stringParams']],
-                location_params=[self.decode_dict(add_dicts(param, {'type': 'AnimationParameter',
-                                                                    'data_type': 'Location'}))
-                                 for param in obj['locationParams']],
-                distance_params=[self.decode_dict(add_dicts(param, {'type': 'AnimationParameter',
-                                                                    'data_type': 'Distance'}))
-                                 for param in obj['distanceParams']],
-                rotation_params=[self.decode_dict(add_dicts(param, {'type': 'AnimationParameter',
-                                                                    'data_type': 'Rotation'}))
-                                 for param in obj['rotationParams']],
-                equation_params=[self.decode_dict(add_dicts(param, {'type': 'AnimationParameter',
-                                                                    'data_type': 'Equation'}))
-                                 for param in obj['equationParams']],
-            )
-        elif data_type == 'AnimationParameter':
-            if hasattr(obj, 'default'):
-                if obj['data_type'] == 'Location':
-                    obj['default'] = self.decode_dict(add_dicts(obj['default'], {'type': 'Location'}))
-                elif obj['data_type'] == 'Equation':
-                    obj['default'] = self.decode_dict(add_dicts(obj['default'], {'type': 'Equation'}))
-                else:
-                    obj['default'] = self.decode_dict(obj['default'])
-            return AnimationParameter(name=obj['name'],
-                                      description=obj['description'],
-                                      default=obj['default'],
-                                      data_type=obj['data_type'])
-        elif data_type == 'AnimationToRunParams':
-            return AnimationToRunParams(
-                animation=obj['animation'],
-                colors=[self.decode_dict(param) for param in obj['colors']],
-                anim_id=obj['id'],
-                run_count=obj['runCount'],
-                int_params=obj['intParams'],
-                double_params=obj['doubleParams'],
-                string_params=obj['stringParams'],
-                location_params={key: self.decode_dict(add_dicts(param, {'type': 'Location'}))
-                                 for (key, param) in obj['locationParams']},
-                distance_params={key: self.decode_dict(param) for (key, param) in obj['distanceParams']},
-                rotation_params={key: self.decode_dict(param) for (key, param) in obj['rotationParams']},
-                equation_params={key: self.decode_dict(add_dicts(param, {'type': 'Equation'}))
-                                 for (key, param) in obj['equationParams']},
-            )
-        elif data_type == 'ColorContainer':
-            return ColorContainer(obj['colors'])
-        elif data_type == 'DegreesRotation':
-            return DegreesRotation(obj['xRotation'], obj['yRotation'], obj['zRotation'], obj['rotationOrder'])
-        elif data_type == 'Location':
-            return Location(obj['x'], obj['y'], obj['z'])
-        elif data_type == 'PercentDistance':
-            return PercentDistance(obj['x'], obj['y'], obj['z'])
-        elif data_type == 'PreparedColorContainer':
-            return PreparedColorContainer(obj['colors'], obj['originalColors'])
-        elif data_type == 'RadiansRotation':
-            return RadiansRotation(obj['xRotation'], obj['yRotation'], obj['zRotation'], obj['rotationOrder'])
-        elif data_type == 'RunningAnimationParams':
-            return RunningAnimationParams(
-                animation_name=obj['animationName'],
-                colors=[self.decode_dict(param) for param in obj['colors']],
-                anim_id=obj['id'],
-                run_count=obj['runCount'],
-                int_params=obj['intParams'],
-                double_params=obj['doubleParams'],
-                string_params=obj['stringParams'],
-                location_params={key: self.decode_dict(add_dicts(param, {'type': 'Location'}))
-                                 for (key, param) in obj['locationParams'].items()},
-                distance_params={key: self.decode_dict(add_dicts(param, {'type': 'AbsoluteDistance'}))
-                                 for (key, param) in obj['distanceParams'].items()},
-                rotation_params={key: self.decode_dict(add_dicts(param, {'type': 'RadiansRotation'}))
-                                 for (key, param) in obj['rotationParams'].items()},
-                equation_params={key: self.decode_dict(add_dicts(param, {'type': 'Equation'}))
-                                 for (key, param) in obj['equationParams'].items()},
-                source_params=self.decode_dict(obj['sourceParams'])
-            )
-        elif data_type == 'Section':
-            return Section(obj['name'], obj['pixels'], obj['parentSectionName'])
-        elif data_type == 'StripInfo':
-            return StripInfo(
-                num_leds=obj['numLEDs'],
-                pin=obj['pin'],
-                render_delay=obj['renderDelay'],
-                is_render_logging_enabled=obj['isRenderLoggingEnabled'],
-                render_log_file=obj['renderLogFile'],
-                renders_between_log_saves=obj['rendersBetweenLogSaves'],
-                is_1d_supported=obj['is1DSupported'],
-                is_2d_supported=obj['is2DSupported'],
-                is_3d_supported=obj['is3DSupported'],
-                led_locations=[self.decode_dict(add_dicts(param, {'type': 'Location'}))
-                               for param in obj['ledLocations']] if obj['ledLocations'] is not None else None,
-            )
-        else:
+        decoder = self.decoders.get(obj.get('type', ''))
+        if decoder is None:
+            return obj
+        return decoder(obj)
+
+    @staticmethod
+    def _decode_absolute_distance(obj: Dict) -> AbsoluteDistance:
+        return AbsoluteDistance(obj['x'], obj['y'], obj['z'])
+
+    @staticmethod
+    def _decode_percent_distance(obj: Dict) -> PercentDistance:
+        return PercentDistance(obj['x'], obj['y'], obj['z'])
+
+    @staticmethod
+    def _decode_location(obj: Any) -> Location:
+        if type(obj) is not dict:
+            return obj
+        return Location(obj['x'], obj['y'], obj['z'])
+
+    @staticmethod
+    def _decode_equation(obj: Any) -> Equation:
+        if type(obj) is not dict:
             return obj
+        return Equation(obj['coefficients'])
+
+    @staticmethod
+    def _decode_color_container(obj: Dict) -> ColorContainer:
+        return ColorContainer(obj['colors'])
+
+    @staticmethod
+    def _decode_prepared_color_container(obj: Dict) -> PreparedColorContainer:
+        return PreparedColorContainer(obj['colors'], obj['originalColors'])
+
+    @staticmethod
+    def _decode_degrees_rotation(obj: Dict) -> DegreesRotation:
+        return DegreesRotation(obj['xRotation'], obj['yRotation'], obj['zRotation'], obj['rotationOrder'])
+
+    @staticmethod
+    def _decode_radians_rotation(obj: Dict) -> RadiansRotation:
+        return RadiansRotation(obj['xRotation'], obj['yRotation'], obj['zRotation'], obj['rotationOrder'])
+
+    @staticmethod
+    def _decode_section(obj: Dict) -> Section:
+        return Section(obj['name'], PixelRanges.from_pixels(obj['pixels']), obj['parentSectionName'])
+
+    def _decode_params(self, params: List[Dict], data_type: str) -> List[AnimationParameter]:
+        decode_default: Optional[Callable[[Any], Any]] = self._param_default_decoders.get(data_type)
+        decoded = []
+        for param in params:
+            default = param.get('default')
+            if decode_default is not None and default is not None:
+                default = decode_default(default)
+            decoded.append(AnimationParameter(name=param['name'],
+                                              description=param['description'],
+                                              default=default,
+                                              data_type=data_type))
+        return decoded
+
+    def _decode_animation_info(self, obj: Dict) -> AnimationInfo:
+        return AnimationInfo(
+            name=obj['name'],
+            abbr=obj['abbr'],
+            description=obj['description'],
+            run_count_default=obj['runCountDefault'],
+            minimum_colors=obj['minimumColors'],
+            unlimited_colors=obj['unlimitedColors'],
+            dimensionality=obj['dimensionality'],
+            int_params=self._decode_params(obj['intParams'], 'int'),
+            double_params=self._decode_params(obj['doubleParams'], 'float'),
+            string_params=self._decode_params(obj['stringParams'], 'str'),
+            location_params=self._decode_params(obj['locationParams'], 'Location'),
+            distance_params=self._decode_params(obj['distanceParams'], 'Distance'),
+            rotation_params=self._decode_params(obj['rotationParams'], 'Rotation'),
+            equation_params=self._decode_params(obj['equationParams'], 'Equation'),
+        )
+
+    def _decode_animation_to_run_params(self, obj: Dict) -> AnimationToRunParams:
+        decode_typed = self.decode_typed
+        decode_location = self._decode_location
+        decode_equation = self._decode_equation
+        return AnimationToRunParams(
+            animation=obj['animation'],
+            colors=[decode_typed(param) for param in obj['colors']],
+            anim_id=obj['id'],
+            section=obj.get('section', ''),
+            run_count=obj['runCount'],
+            int_params=obj['intParams'],
+            double_params=obj['doubleParams'],
+            string_params=obj['stringParams'],
+            location_params={key: decode_location(param) for key, param in obj['locationParams'].items()},
+            distance_params={key: decode_typed(param) for key, param in obj['distanceParams'].items()},
+            rotation_params={key: decode_typed(param) for key, param in obj['rotationParams'].items()},
+            equation_params={key: decode_equation(param) for key, param in obj['equationParams'].items()},
+        )
+
+    def _decode_running_animation_params(self, obj: Dict) -> RunningAnimationParams:
+        decode_typed = self.decode_typed
+        decode_location = self._decode_location
+        decode_equation = self._decode_equation
+        source_params = obj['sourceParams']
+        return RunningAnimationParams(
+            animation_name=obj['animationName'],
+            colors=[decode_typed(param) for param in obj['colors']],
+            anim_id=obj['id'],
+            section=obj.get('section', ''),
+            run_count=obj['runCount'],
+            int_params=obj['intParams'],
+            double_params=obj['doubleParams'],
+            string_params=obj['stringParams'],
+            location_params={key: decode_location(param) for key, param in obj['locationParams'].items()},
+            distance_params={key: self._decode_absolute_distance(param) if type(param) is dict else param
+                             for key, param in obj['distanceParams'].items()},
+            rotation_params={key: self._decode_radians_rotation(param) if type(param) is dict else param
+                             for key, param in obj['rotationParams'].items()},
+            equation_params={key: decode_equation(param) for key, param in obj['equationParams'].items()},
+            source_params=self._decode_animation_to_run_params(source_params)
+            if type(source_params) is dict else source_params,
+        )
+
+    def _decode_strip_info(self, obj: Dict) -> StripInfo:
+        led_locations = obj['ledLocations']
+        return StripInfo(
+            num_leds=obj['numLEDs'],
+            pin=obj['pin'],
+            render_delay=obj['renderDelay'],
+            is_render_logging_enabled=obj['isRenderLoggingEnabled'],
+            render_log_file=obj['renderLogFile'],
+            renders_between_log_saves=obj['rendersBetweenLogSaves'],
+            is_1d_supported=obj['is1DSupported'],
+            is_2d_supported=obj['is2DSupported'],
+            is_3d_supported=obj['is3DSupported'],
+            led_locations=LocationBuffer.from_json(led_locations) if led_locations is not None else None,
+        )
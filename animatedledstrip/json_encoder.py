@@ -19,6 +19,7 @@
 #  THE SOFTWARE.
 
 import json
+from array import array
 from json import JSONEncoder
 from typing import Any
 
@@ -30,5 +31,7 @@ class ALSJsonEncoder(JSONEncoder):
         if hasattr(o, 'json_dict'):
             # noinspection PyCallingNonCallable
             return o.json_dict()
+        elif isinstance(o, array):
+            return o.tolist()
         else:
             return json.JSONEncoder.default(self, o)
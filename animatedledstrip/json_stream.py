@@ -0,0 +1,127 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator, Tuple
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _JsonStreamReader:
+    """Incrementally parses values out of a JSON document read from a binary stream
+
+    Only the part of the document that hasn't been consumed yet is kept in memory."""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = 65536):
+        self.stream: BinaryIO = stream
+        self.chunk_size: int = chunk_size
+        self.eof: bool = False
+
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buf: str = ''
+        self._pos: int = 0
+
+    def _fill(self, size: int) -> bool:
+        """Read at least `size` more bytes into the buffer; False if the stream is exhausted"""
+        if self.eof:
+            return False
+
+        # Drop the consumed part of the buffer before growing it
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+
+        data = self.stream.read(size)
+        if not data:
+            self.eof = True
+            self._buf += self._utf8.decode(b'', final=True)
+            return False
+        self._buf += self._utf8.decode(data)
+        return True
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next character without consuming it ('' at the end of the stream)"""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill(self.chunk_size):
+                return ''
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of `chars`"""
+        char = self.next_char()
+        if char == '' or char not in chars:
+            raise json.JSONDecodeError('Expecting one of {!r}'.format(chars), self._buf, self._pos)
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Consume and return the next complete JSON value"""
+        self.next_char()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self._buf) or self.eof:
+                    self._pos = end
+                    return value
+                self._fill(size)
+                continue
+
+            # Grow the read size so a large value isn't re-parsed once per chunk
+            size = max(size, len(self._buf) - self._pos)
+
+
+def iter_json_array(stream: BinaryIO, chunk_size: int = 65536) -> Iterator[Any]:
+    """Yield the elements of a JSON array read from `stream` one at a time"""
+    reader = _JsonStreamReader(stream, chunk_size)
+    reader.expect('[')
+    if reader.next_char() == ']':
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(',]') == ']':
+            return
+
+
+def iter_json_object(stream: BinaryIO, chunk_size: int = 65536) -> Iterator[Tuple[str, Any]]:
+    """Yield the (key, value) pairs of a JSON object read from `stream` one at a time"""
+    reader = _JsonStreamReader(stream, chunk_size)
+    reader.expect('{')
+    if reader.next_char() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        yield key, reader.value()
+        if reader.expect(',}') == '}':
+            return
@@ -24,6 +24,8 @@ from typing import Dict
 class Location(object):
     """A location in 3D space"""
 
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self,
                  x: float = 0.0,
                  y: float = 0.0,
@@ -32,6 +34,9 @@ class Location(object):
         self.y: float = y
         self.z: float = z
 
+    def __reduce__(self):
+        return Location, (self.x, self.y, self.z)
+
     def json_dict(self) -> Dict:
         return {
             'x': self.x,
@@ -0,0 +1,172 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from array import array
+from itertools import chain
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+from . import numpy_support
+from .location import Location
+
+_get_json_coordinates = itemgetter('x', 'y', 'z')
+_get_location_coordinates = attrgetter('x', 'y', 'z')
+
+
+class LocationView(Location):
+    """A Location whose coordinates are read from and written to a LocationBuffer"""
+
+    __slots__ = ('_coordinates', '_offset')
+
+    def __init__(self, coordinates: array, offset: int):
+        self._coordinates: array = coordinates
+        self._offset: int = offset
+
+    @property
+    def x(self) -> float:
+        return self._coordinates[self._offset]
+
+    @x.setter
+    def x(self, value: float):
+        self._coordinates[self._offset] = value
+
+    @property
+    def y(self) -> float:
+        return self._coordinates[self._offset + 1]
+
+    @y.setter
+    def y(self, value: float):
+        self._coordinates[self._offset + 1] = value
+
+    @property
+    def z(self) -> float:
+        return self._coordinates[self._offset + 2]
+
+    @z.setter
+    def z(self, value: float):
+        self._coordinates[self._offset + 2] = value
+
+    def __repr__(self) -> str:
+        return 'LocationView({}, {}, {})'.format(self.x, self.y, self.z)
+
+
+class LocationBuffer(Sequence[Location]):
+    """Stores many locations as a flat buffer of (x, y, z) float64 triples
+
+    Indexing and iterating give LocationViews, Locations that read and write
+    their coordinates in the buffer, so `buffer[i].x = 5.0` changes the buffer
+    just as it would change a Location in a list. Locations can also be
+    assigned with `buffer[i] = location`. `as_numpy` and `memoryview` give
+    zero-copy N x 3 access to the coordinates for vectorized math."""
+
+    def __init__(self, coordinates: Optional[Iterable[float]] = None):
+        if coordinates is None:
+            self.coordinates: array = array('d')
+        elif isinstance(coordinates, array) and coordinates.typecode == 'd':
+            self.coordinates: array = coordinates
+        else:
+            self.coordinates: array = array('d', coordinates)
+
+        if len(self.coordinates) % 3 != 0:
+            raise ValueError('Number of coordinates must be a multiple of 3, got {}'.format(len(self.coordinates)))
+
+    @classmethod
+    def from_locations(cls, locations: Iterable[Location]) -> 'LocationBuffer':
+        if isinstance(locations, LocationBuffer):
+            return cls(array('d', locations.coordinates))
+        return cls(array('d', chain.from_iterable(map(_get_location_coordinates, locations))))
+
+    @classmethod
+    def from_json(cls, locations: List[Dict[str, float]]) -> 'LocationBuffer':
+        """Fill a buffer straight from parsed `{"x": .., "y": .., "z": ..}` objects"""
+        return cls(array('d', chain.from_iterable(map(_get_json_coordinates, locations))))
+
+    def __len__(self) -> int:
+        return len(self.coordinates) // 3
+
+    @overload
+    def __getitem__(self, index: int) -> Location:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'LocationBuffer':
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Location, 'LocationBuffer']:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return LocationBuffer(self.coordinates[start * 3:stop * 3])
+            return LocationBuffer.from_locations(self[i] for i in range(start, stop, step))
+
+        return LocationView(self.coordinates, self._offset(index))
+
+    def __setitem__(self, index: Union[int, slice], value: Any):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError('LocationBuffer only supports slice assignment with a step of 1')
+            self.coordinates[start * 3:stop * 3] = LocationBuffer.from_locations(value).coordinates
+            return
+        i = self._offset(index)
+        self.coordinates[i:i + 3] = array('d', _get_location_coordinates(value))
+
+    def _offset(self, index: int) -> int:
+        """The position in `coordinates` of the location at `index`"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('LocationBuffer index out of range')
+        return index * 3
+
+    def __iter__(self) -> Iterator[Location]:
+        coordinates = self.coordinates
+        return (LocationView(coordinates, i) for i in range(0, len(coordinates), 3))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LocationBuffer):
+            return self.coordinates == other.coordinates
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(other) == len(self) and \
+                all(_get_location_coordinates(loc) == _get_location_coordinates(o) for loc, o in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return 'LocationBuffer({} locations)'.format(len(self))
+
+    def append(self, location: Location):
+        self.coordinates.extend(_get_location_coordinates(location))
+
+    def extend(self, locations: Iterable[Location]):
+        if isinstance(locations, LocationBuffer):
+            self.coordinates.extend(locations.coordinates)
+        else:
+            self.coordinates.extend(chain.from_iterable(map(_get_location_coordinates, locations)))
+
+    def memoryview(self) -> memoryview:
+        """An N x 3 view of the coordinates that shares memory with the buffer"""
+        return memoryview(self.coordinates).cast('B').cast('d', [len(self), 3])
+
+    def as_numpy(self):
+        """An N x 3 float64 NumPy array that shares memory with the buffer (requires NumPy)"""
+        numpy = numpy_support.numpy
+        if numpy is None:
+            raise ImportError('NumPy is required for LocationBuffer.as_numpy')
+        return numpy.frombuffer(self.coordinates, dtype=numpy.float64).reshape(-1, 3)
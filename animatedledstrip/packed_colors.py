@@ -0,0 +1,290 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import colorsys
+import json
+import sys
+from array import array
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple
+
+from . import numpy_support
+
+
+_BYTE_TO_FLOAT = tuple(i / 255 for i in range(256))
+
+
+def _to_uint32_array(colors: Any) -> array:
+    if isinstance(colors, array) and colors.typecode == 'I' and colors.itemsize == 4:
+        return colors
+    return array('I', colors)
+
+
+def _float_to_byte(value: float) -> int:
+    return min(255, max(0, int(value * 255 + 0.5)))
+
+
+def to_packed_array(colors: Any) -> array:
+    """Copy packed 0xRRGGBB colors into a new `array('I')`
+
+    NumPy arrays and other buffers of 32-bit ints are copied in bulk, without
+    creating an int object per color."""
+    result = array('I')
+    numpy = numpy_support.numpy
+    if numpy is not None and isinstance(colors, numpy.ndarray):
+        result.frombytes(numpy.ascontiguousarray(colors, dtype=numpy.uint32).tobytes())
+        return result
+    if isinstance(colors, (array, memoryview)):
+        view = memoryview(colors)
+        if view.format in ('I', 'i') and view.itemsize == 4 and view.c_contiguous:
+            result.frombytes(view.cast('B'))
+            return result
+    result.extend(colors)
+    return result
+
+
+def parse_packed_colors(data: bytes) -> Any:
+    """Parse a JSON list of packed 0xRRGGBB colors into a packed uint32 buffer
+
+    Returns a NumPy uint32 array if NumPy is available, otherwise an
+    `array('I')`. Either one supports the buffer protocol, so `memoryview`
+    can be used on the result without copying it."""
+    body = data.strip()
+    if body[:1] != b'[' or body[-1:] != b']':
+        raise ValueError('Expected a JSON list of colors')
+
+    # The input is parsed and validated the same way whether or not NumPy is available:
+    # the C JSON parser reads it, and array('I') checks every value is an int that fits in 32 bits
+    try:
+        colors = array('I', json.loads(body))
+    except (TypeError, OverflowError) as e:
+        raise ValueError('Invalid color: {}'.format(e)) from e
+
+    numpy = numpy_support.numpy
+    if numpy is not None:
+        # A view of the same buffer, not a copy
+        return numpy.frombuffer(colors, dtype=numpy.uint32)
+    return colors
+
+
+def split_channels(colors: Any) -> Tuple[Any, Any, Any]:
+    """Split packed 0xRRGGBB colors into separate red, green and blue channels
+
+    NumPy input gives uint8 NumPy arrays; anything else gives `array('B')`s."""
+    numpy = numpy_support.numpy
+    if numpy is not None and isinstance(colors, numpy.ndarray):
+        colors = colors.astype(numpy.uint32, copy=False)
+        return ((colors >> 16) & 0xFF).astype(numpy.uint8), \
+               ((colors >> 8) & 0xFF).astype(numpy.uint8), \
+               (colors & 0xFF).astype(numpy.uint8)
+
+    # Slice each channel's byte out of the raw little-endian words instead of shifting every color
+    colors = _to_uint32_array(colors)
+    if sys.byteorder != 'little':
+        colors = array('I', colors)
+        colors.byteswap()
+    raw = colors.tobytes()
+    return array('B', raw[2::4]), array('B', raw[1::4]), array('B', raw[0::4])
+
+
+def merge_channels(red: Any, green: Any, blue: Any) -> Any:
+    """Pack separate red, green and blue channels (0-255 each) into 0xRRGGBB colors
+
+    The inverse of `split_channels`. Returns a NumPy uint32 array if NumPy is
+    available, otherwise an `array('I')`."""
+    numpy = numpy_support.numpy
+    if numpy is not None:
+        return (numpy.asarray(red, dtype=numpy.uint32) << 16) | \
+               (numpy.asarray(green, dtype=numpy.uint32) << 8) | \
+               numpy.asarray(blue, dtype=numpy.uint32)
+
+    # Write each channel into its byte of the little-endian words instead of shifting every color
+    red, green, blue = bytes(red), bytes(green), bytes(blue)
+    if not len(red) == len(green) == len(blue):
+        raise ValueError('Channels must have the same length')
+    raw = bytearray(4 * len(red))
+    raw[2::4] = red
+    raw[1::4] = green
+    raw[0::4] = blue
+    result = array('I')
+    result.frombytes(raw)
+    if sys.byteorder != 'little':
+        result.byteswap()
+    return result
+
+
+def from_rgb_bytes(data: Any) -> Any:
+    """Pack interleaved RGB bytes (such as an 8-bit RGB image's raw pixels) into 0xRRGGBB colors"""
+    data = bytes(data)
+    if len(data) % 3:
+        raise ValueError('RGB data length must be a multiple of 3')
+
+    numpy = numpy_support.numpy
+    if numpy is not None:
+        channels = numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, 3)
+        return merge_channels(channels[:, 0], channels[:, 1], channels[:, 2])
+    return merge_channels(data[0::3], data[1::3], data[2::3])
+
+
+def to_rgb_bytes(colors: Any) -> bytes:
+    """Unpack 0xRRGGBB colors into interleaved RGB bytes"""
+    red, green, blue = split_channels(colors)
+    numpy = numpy_support.numpy
+    if numpy is not None and isinstance(red, numpy.ndarray):
+        return numpy.stack((red, green, blue), axis=1).tobytes()
+
+    raw = bytearray(3 * len(red))
+    raw[0::3] = red
+    raw[1::3] = green
+    raw[2::3] = blue
+    return bytes(raw)
+
+
+def to_float_channels(colors: Any) -> Tuple[Any, Any, Any]:
+    """Split 0xRRGGBB colors into red, green and blue channels scaled to 0.0-1.0
+
+    NumPy input gives float64 NumPy arrays; anything else gives `array('d')`s."""
+    numpy = numpy_support.numpy
+    channels = split_channels(colors)
+    if numpy is not None and isinstance(channels[0], numpy.ndarray):
+        return tuple(channel / 255.0 for channel in channels)
+    scale = _BYTE_TO_FLOAT.__getitem__
+    return tuple(array('d', map(scale, channel)) for channel in channels)
+
+
+def from_float_channels(red: Any, green: Any, blue: Any) -> Any:
+    """Pack red, green and blue channels of floats (0.0-1.0, clamped) into 0xRRGGBB colors"""
+    numpy = numpy_support.numpy
+    if numpy is not None:
+        return merge_channels(*(numpy.clip(numpy.floor(numpy.asarray(channel, dtype=numpy.float64) * 255 + 0.5), 0, 255)
+                                for channel in (red, green, blue)))
+    return merge_channels(*(bytes(map(_float_to_byte, channel)) for channel in (red, green, blue)))
+
+
+def to_hsv(colors: Any) -> Tuple[Any, Any, Any]:
+    """Convert 0xRRGGBB colors to hue, saturation and value channels, each 0.0-1.0 as in `colorsys`"""
+    red, green, blue = to_float_channels(colors)
+    numpy = numpy_support.numpy
+    if numpy is None or not isinstance(red, numpy.ndarray):
+        hsv = list(map(colorsys.rgb_to_hsv, red, green, blue))
+        return array('d', [c[0] for c in hsv]), array('d', [c[1] for c in hsv]), array('d', [c[2] for c in hsv])
+
+    maximum = numpy.maximum(numpy.maximum(red, green), blue)
+    minimum = numpy.minimum(numpy.minimum(red, green), blue)
+    delta = maximum - minimum
+    saturation = numpy.divide(delta, maximum, out=numpy.zeros_like(delta), where=maximum > 0)
+    safe_delta = numpy.where(delta > 0, delta, 1.0)
+    red_distance = (maximum - red) / safe_delta
+    green_distance = (maximum - green) / safe_delta
+    blue_distance = (maximum - blue) / safe_delta
+    hue = numpy.where(red == maximum, blue_distance - green_distance,
+                      numpy.where(green == maximum, 2.0 + red_distance - blue_distance,
+                                  4.0 + green_distance - red_distance))
+    hue = numpy.where(delta > 0, (hue / 6.0) % 1.0, 0.0)
+    return hue, saturation, maximum
+
+
+def from_hsv(hue: Any, saturation: Any, value: Any) -> Any:
+    """Pack hue, saturation and value channels (0.0-1.0, as in `colorsys`) into 0xRRGGBB colors"""
+    numpy = numpy_support.numpy
+    if numpy is None:
+        rgb = list(map(colorsys.hsv_to_rgb, hue, saturation, value))
+        return from_float_channels([c[0] for c in rgb], [c[1] for c in rgb], [c[2] for c in rgb])
+
+    hue = numpy.asarray(hue, dtype=numpy.float64)
+    saturation = numpy.asarray(saturation, dtype=numpy.float64)
+    value = numpy.asarray(value, dtype=numpy.float64)
+    sector = numpy.floor(hue * 6.0)
+    f = hue * 6.0 - sector
+    sector = sector.astype(numpy.int64) % 6
+    p = value * (1.0 - saturation)
+    q = value * (1.0 - saturation * f)
+    t = value * (1.0 - saturation * (1.0 - f))
+    choices = ((value, t, p), (q, value, p), (p, value, t), (p, q, value), (t, p, value), (value, p, q))
+    channels = [numpy.choose(sector, [choice[i] for choice in choices]) for i in range(3)]
+    return from_float_channels(*channels)
+
+
+def to_hex(colors: Any) -> List[str]:
+    """Format 0xRRGGBB colors as '#rrggbb' strings"""
+    numpy = numpy_support.numpy
+    if numpy is not None and isinstance(colors, numpy.ndarray):
+        colors = colors.tolist()
+    return list(map('#{:06x}'.format, colors))
+
+
+def from_hex(colors: Iterable[str]) -> Any:
+    """Parse 'rrggbb' or '#rrggbb' strings into 0xRRGGBB colors"""
+    packed = array('I', [int(c[1:] if c[:1] == '#' else c, 16) for c in colors])
+    numpy = numpy_support.numpy
+    if numpy is not None:
+        return numpy.frombuffer(packed, dtype=numpy.uint32).copy()
+    return packed
+
+
+@lru_cache(maxsize=64)
+def gamma_table(gamma: float) -> bytes:
+    """A 256-entry lookup table applying gamma correction to a channel, for `apply_table`"""
+    if gamma <= 0:
+        raise ValueError('gamma must be positive')
+    return bytes(int(255 * (i / 255) ** gamma + 0.5) for i in range(256))
+
+
+@lru_cache(maxsize=64)
+def brightness_table(brightness: float) -> bytes:
+    """A 256-entry lookup table scaling a channel by `brightness` (clamped to 255), for `apply_table`"""
+    if brightness < 0:
+        raise ValueError('brightness must not be negative')
+    return bytes(min(255, int(i * brightness + 0.5)) for i in range(256))
+
+
+def apply_table(colors: Any, table: bytes) -> Any:
+    """Map every channel of every 0xRRGGBB color through a 256-entry lookup table
+
+    Returns a NumPy uint32 array if NumPy is available, otherwise an `array('I')`."""
+    if len(table) != 256:
+        raise ValueError('Lookup tables must have 256 entries')
+
+    numpy = numpy_support.numpy
+    if numpy is not None:
+        packed = numpy.ascontiguousarray(colors, dtype=numpy.uint32)
+        lookup = numpy.frombuffer(bytes(table), dtype=numpy.uint8)
+        return lookup[packed.view(numpy.uint8)].view(numpy.uint32) & 0xFFFFFF
+
+    # bytes.translate runs the lookup over every byte in C; the unused high byte is cleared afterwards
+    packed = _to_uint32_array(colors)
+    raw = bytearray(packed.tobytes().translate(table))
+    if sys.byteorder == 'little':
+        raw[3::4] = bytes(len(packed))
+    else:
+        raw[0::4] = bytes(len(packed))
+    result = array('I')
+    result.frombytes(raw)
+    return result
+
+
+def gamma_correct(colors: Any, gamma: float = 2.2) -> Any:
+    """Apply gamma correction to every channel of 0xRRGGBB colors"""
+    return apply_table(colors, gamma_table(gamma))
+
+
+def scale_brightness(colors: Any, brightness: float) -> Any:
+    """Scale every channel of 0xRRGGBB colors by `brightness`"""
+    return apply_table(colors, brightness_table(brightness))
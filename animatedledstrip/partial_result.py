@@ -0,0 +1,45 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from typing import Dict, Generic, Hashable, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+
+class PartialResult(Generic[K, T]):
+    """Results of an operation run against several targets, some of which may have failed
+
+    Successful targets are in `results` and failed ones in `errors`, both keyed
+    by the target."""
+
+    def __init__(self):
+        self.results: Dict[K, T] = {}
+        self.errors: Dict[K, BaseException] = {}
+
+    @property
+    def ok(self) -> bool:
+        """True if no target failed"""
+        return not self.errors
+
+    def raise_first_error(self):
+        """Re-raise the error of the first failed target, if any target failed"""
+        for error in self.errors.values():
+            raise error
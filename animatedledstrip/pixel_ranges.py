@@ -0,0 +1,333 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from array import array
+from bisect import bisect_right
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, List, MutableSequence, Optional, Sequence, Tuple, Union, \
+    overload
+
+Run = Tuple[int, int]
+
+
+def _runs_of(bounds: array) -> List[Run]:
+    it = iter(bounds)
+    return list(zip(it, it))
+
+
+class PixelRanges(MutableSequence[int]):
+    """Stores a list of pixel indices as runs of consecutive pixels
+
+    Sections are almost always one or a few contiguous runs, so a section of
+    any size takes a few integers. It indexes, iterates and can be modified
+    like the list of pixels it replaces, in the original order; changes other
+    than appending rebuild the runs, so they take time proportional to the
+    number of pixels, like the same change to a list would. Set operations
+    (`|`, `&`, `-`, `overlaps`, `issubset`, `in`) work on the sorted runs in
+    time proportional to the number of runs and return sorted PixelRanges."""
+
+    __slots__ = ('_bounds', '_offsets', '_sorted')
+
+    def __init__(self, runs: Optional[Iterable[Run]] = None):
+        # Flat (start, end) pairs of half-open runs
+        self._bounds: array = array('q')
+        # Number of pixels before each run, built when first indexed
+        self._offsets: Optional[array] = None
+        # Sorted, merged copy of the runs if they aren't already in that form
+        self._sorted: Optional[PixelRanges] = None
+
+        if runs is not None:
+            for start, end in runs:
+                self._add_run(start, end)
+
+    @classmethod
+    def from_pixels(cls, pixels: Iterable[int]) -> 'PixelRanges':
+        if isinstance(pixels, PixelRanges):
+            return cls(pixels.runs)
+
+        if isinstance(pixels, list):
+            count = len(pixels)
+            if count == 0:
+                return cls()
+            # Fast path for the usual single contiguous run
+            first = pixels[0]
+            if pixels[-1] - first == count - 1 and pixels == list(range(first, first + count)):
+                return cls.from_range(first, first + count)
+
+        ranges = cls()
+        bounds = ranges._bounds
+        start = end = None
+        for pixel in pixels:
+            if pixel == end:
+                end += 1
+            else:
+                if start is not None:
+                    bounds.append(start)
+                    bounds.append(end)
+                start, end = pixel, pixel + 1
+        if start is not None:
+            bounds.append(start)
+            bounds.append(end)
+        return ranges
+
+    @classmethod
+    def from_range(cls, start: int, end: int) -> 'PixelRanges':
+        """The pixels from `start` up to, but not including, `end`"""
+        ranges = cls()
+        ranges._add_run(start, end)
+        return ranges
+
+    def _add_run(self, start: int, end: int):
+        if end <= start:
+            return
+        bounds = self._bounds
+        if bounds and bounds[-1] == start:
+            bounds[-1] = end
+        else:
+            bounds.append(start)
+            bounds.append(end)
+        self._offsets = None
+        self._sorted = None
+
+    @property
+    def runs(self) -> List[Run]:
+        """The (start, end) pairs of each run of consecutive pixels, with `end` excluded"""
+        return _runs_of(self._bounds)
+
+    def __len__(self) -> int:
+        bounds = self._bounds
+        return sum(bounds[i + 1] - bounds[i] for i in range(0, len(bounds), 2))
+
+    def _get_offsets(self) -> array:
+        if self._offsets is None:
+            offsets = array('q', [0])
+            total = 0
+            for start, end in self.runs:
+                total += end - start
+                offsets.append(total)
+            self._offsets = offsets
+        return self._offsets
+
+    @overload
+    def __getitem__(self, index: int) -> int:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'PixelRanges':
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, 'PixelRanges']:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._slice(start, stop)
+            return PixelRanges.from_pixels(list(self)[index])
+
+        offsets = self._get_offsets()
+        if index < 0:
+            index += offsets[-1]
+        if not 0 <= index < offsets[-1]:
+            raise IndexError('PixelRanges index out of range')
+        run = bisect_right(offsets, index) - 1
+        return self._bounds[run * 2] + index - offsets[run]
+
+    def _slice(self, start: int, stop: int) -> 'PixelRanges':
+        """The pixels at positions `start` up to `stop`, found by run rather than pixel by pixel"""
+        result = PixelRanges()
+        if start >= stop:
+            return result
+        offsets = self._get_offsets()
+        bounds = self._bounds
+        run = bisect_right(offsets, start) - 1
+        while run < len(offsets) - 1 and offsets[run] < stop:
+            run_start = bounds[run * 2]
+            first = max(start - offsets[run], 0)
+            last = min(stop, offsets[run + 1]) - offsets[run]
+            result._add_run(run_start + first, run_start + last)
+            run += 1
+        return result
+
+    def __iter__(self) -> Iterator[int]:
+        return chain.from_iterable(range(start, end) for start, end in self.runs)
+
+    def __contains__(self, pixel: Any) -> bool:
+        if not isinstance(pixel, int):
+            return False
+        # In the sorted bounds, a pixel inside a run lands after its start but not after its end
+        return bisect_right(self.sorted()._bounds, pixel) % 2 == 1
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PixelRanges):
+            return self._bounds == other._bounds
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return 'PixelRanges({})'.format(self.runs)
+
+    def __reduce__(self):
+        return PixelRanges, (self.runs,)
+
+    # List methods
+
+    def _replace(self, pixels: Iterable[int]):
+        """Replace the contents with `pixels`"""
+        self._bounds = PixelRanges.from_pixels(pixels)._bounds
+        self._offsets = None
+        self._sorted = None
+
+    def __setitem__(self, index: Union[int, slice], value: Any):
+        pixels = self.to_list()
+        pixels[index] = value
+        self._replace(pixels)
+
+    def __delitem__(self, index: Union[int, slice]):
+        pixels = self.to_list()
+        del pixels[index]
+        self._replace(pixels)
+
+    def insert(self, index: int, pixel: int):
+        pixels = self.to_list()
+        pixels.insert(index, pixel)
+        self._replace(pixels)
+
+    def append(self, pixel: int):
+        self._add_run(pixel, pixel + 1)
+
+    def extend(self, pixels: Iterable[int]):
+        for start, end in PixelRanges.from_pixels(pixels).runs:
+            self._add_run(start, end)
+
+    def clear(self):
+        self._replace(())
+
+    def reverse(self):
+        self._replace(reversed(self.to_list()))
+
+    def sort(self, key: Optional[Callable[[int], Any]] = None, reverse: bool = False):
+        self._replace(sorted(self, key=key, reverse=reverse))
+
+    def copy(self) -> 'PixelRanges':
+        return PixelRanges(self.runs)
+
+    def __add__(self, other: Iterable[int]) -> 'PixelRanges':
+        result = self.copy()
+        result.extend(other)
+        return result
+
+    def __radd__(self, other: Iterable[int]) -> 'PixelRanges':
+        result = PixelRanges.from_pixels(other)
+        result.extend(self)
+        return result
+
+    def to_list(self) -> List[int]:
+        return list(self)
+
+    def json_dict(self) -> List[int]:
+        """The pixels as a list, so the JSON encoders send them as the list they replace"""
+        return self.to_list()
+
+    def sorted(self) -> 'PixelRanges':
+        """The same pixels as sorted, merged runs, without duplicates"""
+        if self._sorted is not None:
+            return self._sorted
+        bounds = self._bounds
+        if all(bounds[i] < bounds[i + 1] for i in range(len(bounds) - 1)):
+            return self
+
+        result = PixelRanges()
+        for start, end in sorted(self.runs):
+            if result._bounds and start <= result._bounds[-1]:
+                result._bounds[-1] = max(result._bounds[-1], end)
+            else:
+                result._bounds.append(start)
+                result._bounds.append(end)
+        self._sorted = result
+        return result
+
+    # Set operations
+
+    def union(self, other: Iterable[int]) -> 'PixelRanges':
+        return PixelRanges(self.sorted().runs + _as_ranges(other).sorted().runs).sorted()
+
+    def intersection(self, other: Iterable[int]) -> 'PixelRanges':
+        a = self.sorted().runs
+        b = _as_ranges(other).sorted().runs
+        result = PixelRanges()
+        i = j = 0
+        while i < len(a) and j < len(b):
+            start = max(a[i][0], b[j][0])
+            end = min(a[i][1], b[j][1])
+            if start < end:
+                result._add_run(start, end)
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return result
+
+    def difference(self, other: Iterable[int]) -> 'PixelRanges':
+        b = _as_ranges(other).sorted().runs
+        result = PixelRanges()
+        j = 0
+        for start, end in self.sorted().runs:
+            while j < len(b) and b[j][1] <= start:
+                j += 1
+            k = j
+            while k < len(b) and b[k][0] < end:
+                result._add_run(start, b[k][0])
+                start = max(start, b[k][1])
+                k += 1
+            result._add_run(start, end)
+        return result
+
+    def overlaps(self, other: Iterable[int]) -> bool:
+        """Whether any pixel is in both"""
+        a = self.sorted().runs
+        b = _as_ranges(other).sorted().runs
+        i = j = 0
+        while i < len(a) and j < len(b):
+            if a[i][0] < b[j][1] and b[j][0] < a[i][1]:
+                return True
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return False
+
+    def issubset(self, other: Iterable[int]) -> bool:
+        """Whether every pixel is also in `other`"""
+        return not self.difference(other)
+
+    def __or__(self, other: Iterable[int]) -> 'PixelRanges':
+        return self.union(other)
+
+    def __and__(self, other: Iterable[int]) -> 'PixelRanges':
+        return self.intersection(other)
+
+    def __sub__(self, other: Iterable[int]) -> 'PixelRanges':
+        return self.difference(other)
+
+
+def _as_ranges(pixels: Iterable[int]) -> PixelRanges:
+    return pixels if isinstance(pixels, PixelRanges) else PixelRanges.from_pixels(pixels)
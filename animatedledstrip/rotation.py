@@ -18,12 +18,17 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 #  THE SOFTWARE.
 
+import math
 from typing import Optional, List, Dict
 
+from .rotation_matrix import RotationMatrix
+
 
 class DegreesRotation:
     """A rotation specified in degrees"""
 
+    __slots__ = ('x_rotation', 'y_rotation', 'z_rotation', 'rotation_order')
+
     def __init__(self,
                  x_rotation: float = 0.0,
                  y_rotation: float = 0.0,
@@ -38,6 +43,14 @@ class DegreesRotation:
         else:
             self.rotation_order = rotation_order
 
+    def __reduce__(self):
+        return DegreesRotation, (self.x_rotation, self.y_rotation, self.z_rotation, self.rotation_order)
+
+    def to_matrix(self) -> RotationMatrix:
+        """The rotation as a matrix, cached for each distinct rotation"""
+        return RotationMatrix.from_angles(math.radians(self.x_rotation), math.radians(self.y_rotation),
+                                          math.radians(self.z_rotation), tuple(self.rotation_order))
+
     def json_dict(self) -> Dict:
         return {
             'type': 'DegreesRotation',
@@ -51,6 +64,8 @@ class DegreesRotation:
 class RadiansRotation:
     """A rotation specified in radians"""
 
+    __slots__ = ('x_rotation', 'y_rotation', 'z_rotation', 'rotation_order')
+
     def __init__(self,
                  x_rotation: float = 0.0,
                  y_rotation: float = 0.0,
@@ -65,6 +80,14 @@ class RadiansRotation:
         else:
             self.rotation_order = rotation_order
 
+    def __reduce__(self):
+        return RadiansRotation, (self.x_rotation, self.y_rotation, self.z_rotation, self.rotation_order)
+
+    def to_matrix(self) -> RotationMatrix:
+        """The rotation as a matrix, cached for each distinct rotation"""
+        return RotationMatrix.from_angles(self.x_rotation, self.y_rotation, self.z_rotation,
+                                          tuple(self.rotation_order))
+
     def json_dict(self) -> Dict:
         return {
             'type': 'RadiansRotation',
@@ -0,0 +1,149 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import math
+from array import array
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, Optional, Sequence, Tuple
+
+from . import numpy_support
+from .location import Location
+from .location_buffer import LocationBuffer
+
+# Nine values, row by row
+Matrix = Tuple[float, ...]
+
+
+def _multiply(a: Matrix, b: Matrix) -> Matrix:
+    return tuple(sum(a[row * 3 + k] * b[k * 3 + col] for k in range(3))
+                 for row in range(3) for col in range(3))
+
+
+def _axis_matrix(axis: str, angle: float) -> Matrix:
+    c = math.cos(angle)
+    s = math.sin(angle)
+    if axis == 'ROTATE_X':
+        return 1.0, 0.0, 0.0, 0.0, c, -s, 0.0, s, c
+    if axis == 'ROTATE_Y':
+        return c, 0.0, s, 0.0, 1.0, 0.0, -s, 0.0, c
+    if axis == 'ROTATE_Z':
+        return c, -s, 0.0, s, c, 0.0, 0.0, 0.0, 1.0
+    raise ValueError('Unknown rotation axis {}'.format(axis))
+
+
+class RotationMatrix:
+    """A 3x3 rotation matrix, stored row by row
+
+    Built from a DegreesRotation or RadiansRotation with `to_matrix()`: the
+    rotation about each axis is applied in `rotation_order`, the first one
+    listed first. `a @ b` rotates by `b` and then by `a`."""
+
+    __slots__ = ('values',)
+
+    def __init__(self, values: Sequence[float] = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)):
+        if len(values) != 9:
+            raise ValueError('A rotation matrix has 9 values, got {}'.format(len(values)))
+        self.values: Matrix = tuple(float(v) for v in values)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def from_angles(x_rotation: float, y_rotation: float, z_rotation: float,
+                    rotation_order: Tuple[str, ...]) -> 'RotationMatrix':
+        """The matrix for rotations in radians about each axis, applied in `rotation_order` (cached)"""
+        angles = {'ROTATE_X': x_rotation, 'ROTATE_Y': y_rotation, 'ROTATE_Z': z_rotation}
+        matrix: Matrix = RotationMatrix().values
+        for axis in rotation_order:
+            matrix = _multiply(_axis_matrix(axis, angles.get(axis, 0.0)), matrix)
+        return RotationMatrix(matrix)
+
+    def __matmul__(self, other: 'RotationMatrix') -> 'RotationMatrix':
+        if not isinstance(other, RotationMatrix):
+            return NotImplemented
+        return RotationMatrix(_multiply(self.values, other.values))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RotationMatrix):
+            return NotImplemented
+        return self.values == other.values
+
+    def __hash__(self) -> int:
+        return hash(self.values)
+
+    def __repr__(self) -> str:
+        return 'RotationMatrix({})'.format(self.values)
+
+    def __reduce__(self):
+        return RotationMatrix, (self.values,)
+
+    def then(self, other: 'RotationMatrix') -> 'RotationMatrix':
+        """Rotate by this matrix and then by `other`"""
+        return other @ self
+
+    def inverse(self) -> 'RotationMatrix':
+        """The opposite rotation (the transpose, since rotation matrices are orthogonal)"""
+        m = self.values
+        return RotationMatrix((m[0], m[3], m[6], m[1], m[4], m[7], m[2], m[5], m[8]))
+
+    def is_close(self, other: 'RotationMatrix', tolerance: float = 1e-9) -> bool:
+        return all(abs(a - b) <= tolerance for a, b in zip(self.values, other.values))
+
+    def apply(self, location: Location, center: Optional[Location] = None) -> Location:
+        """Rotate a single location, about `center` if given and the origin otherwise"""
+        m = self.values
+        x, y, z = location.x, location.y, location.z
+        if center is not None:
+            x, y, z = x - center.x, y - center.y, z - center.z
+        rx = m[0] * x + m[1] * y + m[2] * z
+        ry = m[3] * x + m[4] * y + m[5] * z
+        rz = m[6] * x + m[7] * y + m[8] * z
+        if center is not None:
+            return Location(rx + center.x, ry + center.y, rz + center.z)
+        return Location(rx, ry, rz)
+
+    def apply_buffer(self, locations: Iterable[Location], center: Optional[Location] = None) -> LocationBuffer:
+        """Rotate every location at once, returning a new LocationBuffer
+
+        With NumPy this is a single matrix multiplication over the buffer."""
+        if not isinstance(locations, LocationBuffer):
+            locations = LocationBuffer.from_locations(locations)
+        offset = (center.x, center.y, center.z) if center is not None else (0.0, 0.0, 0.0)
+
+        numpy = numpy_support.numpy
+        if numpy is not None:
+            points = locations.as_numpy()
+            matrix = numpy.array(self.values).reshape(3, 3)
+            if center is not None:
+                points = points - offset
+            rotated = points @ matrix.T
+            if center is not None:
+                rotated += offset
+            coordinates = array('d')
+            coordinates.frombytes(numpy.ascontiguousarray(rotated, dtype=numpy.float64).tobytes())
+            return LocationBuffer(coordinates)
+
+        m0, m1, m2, m3, m4, m5, m6, m7, m8 = self.values
+        cx, cy, cz = offset
+        it = iter(locations.coordinates)
+        return LocationBuffer(array('d', chain.from_iterable(
+            (m0 * (x - cx) + m1 * (y - cy) + m2 * (z - cz) + cx,
+             m3 * (x - cx) + m4 * (y - cy) + m5 * (z - cz) + cy,
+             m6 * (x - cx) + m7 * (y - cy) + m8 * (z - cz) + cz)
+            for x, y, z in zip(it, it, it))))
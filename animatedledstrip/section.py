@@ -18,27 +18,48 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 #  THE SOFTWARE.
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Optional
+
+from .pixel_ranges import PixelRanges
 
 
 class Section(object):
     """Stores information about a section of the LED strip"""
 
+    __slots__ = ('name', '_pixels', 'parent_section_name')
+
     def __init__(self,
                  name: str = '',
-                 pixels: Optional[List[int]] = None,
+                 pixels: Optional[Iterable[int]] = None,
                  parent_section_name: str = ''):
         self.name: str = name
         self.parent_section_name: str = parent_section_name
+        self.pixels = pixels
+
+    @property
+    def pixels(self) -> PixelRanges:
+        """The section's pixels, stored as runs of consecutive pixels that index like a list of ints"""
+        return self._pixels
 
+    @pixels.setter
+    def pixels(self, pixels: Optional[Iterable[int]]):
         if pixels is None:
-            self.pixels: List[int] = []
+            self._pixels: PixelRanges = PixelRanges()
+        elif isinstance(pixels, PixelRanges):
+            self._pixels: PixelRanges = pixels
         else:
-            self.pixels: List[int] = pixels
+            self._pixels: PixelRanges = PixelRanges.from_pixels(pixels)
+
+    def __reduce__(self):
+        return Section, (self.name, self._pixels, self.parent_section_name)
+
+    def overlaps(self, other: 'Section') -> bool:
+        """Whether this section shares any pixels with `other`"""
+        return self._pixels.overlaps(other._pixels)
 
     def json_dict(self) -> Dict:
         return {
             'name': self.name,
-            'pixels': self.pixels,
+            'pixels': self._pixels.to_list(),
             'parentSectionName': self.parent_section_name,
         }
@@ -0,0 +1,228 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import threading
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+from .pixel_ranges import PixelRanges
+from .section import Section
+
+# (start, end, section name) of a run of physical pixels driven by a section
+_Interval = Tuple[int, int, str]
+
+
+class _IntervalNode:
+    """A node of a centered interval tree over half-open intervals"""
+
+    __slots__ = ['center', 'by_start', 'by_end', 'left', 'right']
+
+    def __init__(self, intervals: List[_Interval]):
+        endpoints = sorted(p for start, end, _ in intervals for p in (start, end - 1))
+        self.center: int = endpoints[len(endpoints) // 2]
+
+        here = [i for i in intervals if i[0] <= self.center < i[1]]
+        left = [i for i in intervals if i[1] <= self.center]
+        right = [i for i in intervals if i[0] > self.center]
+
+        self.by_start: List[_Interval] = sorted(here, key=lambda i: i[0])
+        self.by_end: List[_Interval] = sorted(here, key=lambda i: i[1], reverse=True)
+        self.left: Optional[_IntervalNode] = _IntervalNode(left) if left else None
+        self.right: Optional[_IntervalNode] = _IntervalNode(right) if right else None
+
+    def overlapping(self, start: int, end: int, out: Set[str]):
+        """Add the names of the intervals that share any pixel with [start, end) to `out`"""
+        node: Optional[_IntervalNode] = self
+        while node is not None:
+            if end <= node.center:
+                for i in node.by_start:
+                    if i[0] >= end:
+                        break
+                    out.add(i[2])
+                node = node.left
+            elif start > node.center:
+                for i in node.by_end:
+                    if i[1] <= start:
+                        break
+                    out.add(i[2])
+                node = node.right
+            else:
+                out.update(i[2] for i in node.by_start)
+                if node.left is not None:
+                    node.left.overlapping(start, end, out)
+                node = node.right
+
+
+class SectionTree:
+    """The hierarchy of a strip's sections, built from `ALSHttpClient.get_sections_map()`
+
+    A section's pixels are positions in its parent section, so the physical
+    LEDs it drives are found by mapping them through each ancestor in turn.
+    These physical pixels are computed once per section and kept, along with an
+    interval tree that finds the sections driving any given physical pixels."""
+
+    # Sections added after the interval tree was built are checked one by one
+    # until there are this many of them, then the tree is rebuilt
+    MAX_PENDING = 16
+
+    def __init__(self, sections: Union[Mapping[str, Section], Iterable[Section], None] = None):
+        self._sections: Dict[str, Section] = {}
+        self._children: Dict[str, List[str]] = {}
+        self._physical: Dict[str, PixelRanges] = {}
+
+        self._index: Optional[_IntervalNode] = None
+        self._pending: List[_Interval] = []
+        self._indexed: bool = False
+        self._lock = threading.RLock()
+
+        if sections is not None:
+            for section in (sections.values() if isinstance(sections, Mapping) else sections):
+                self._sections[section.name] = section
+            for section in self._sections.values():
+                self._children.setdefault(section.parent_section_name, []).append(section.name)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._sections
+
+    def __getitem__(self, name: str) -> Section:
+        return self._sections[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def add(self, section: Section):
+        """Add a newly created section, keeping the physical pixels already computed for the others"""
+        with self._lock:
+            if section.name in self._sections:
+                self._remove(section.name)
+            self._sections[section.name] = section
+            self._children.setdefault(section.parent_section_name, []).append(section.name)
+
+            # Sections that were waiting for this one as their parent were treated as roots until now
+            orphans = self.descendants(section.name)
+            if orphans:
+                for orphan in orphans:
+                    self._physical.pop(orphan, None)
+                self._indexed = False
+
+            if self._indexed:
+                self._pending.extend(self._intervals(section.name))
+                if len(self._pending) > SectionTree.MAX_PENDING:
+                    self._indexed = False
+
+    def _remove(self, name: str):
+        # Replacing a section changes the physical pixels of everything below it
+        for descendant in [name] + self.descendants(name):
+            self._physical.pop(descendant, None)
+        self._children[self._sections[name].parent_section_name].remove(name)
+        self._indexed = False
+
+    def parent(self, name: str) -> Optional[Section]:
+        return self._sections.get(self._sections[name].parent_section_name)
+
+    def children(self, name: str) -> List[Section]:
+        return [self._sections[child] for child in self._children.get(name, [])]
+
+    def ancestors(self, name: str) -> List[Section]:
+        """The section's parent, its parent's parent, and so on up to the root"""
+        ancestors = []
+        parent = self.parent(name)
+        while parent is not None:
+            if len(ancestors) > len(self._sections):
+                raise ValueError('Section {} is its own ancestor'.format(name))
+            ancestors.append(parent)
+            parent = self.parent(parent.name)
+        return ancestors
+
+    def descendants(self, name: str) -> List[str]:
+        """Names of every section below the section, breadth first"""
+        result = []
+        queue = list(self._children.get(name, []))
+        while queue:
+            child = queue.pop(0)
+            result.append(child)
+            queue.extend(self._children.get(child, []))
+        return result
+
+    @property
+    def roots(self) -> List[Section]:
+        """Sections without a parent in the tree (normally just fullStrip)"""
+        return [s for s in self._sections.values() if s.parent_section_name not in self._sections]
+
+    def physical_pixels(self, name: str) -> PixelRanges:
+        """The physical LEDs driven by the section, in the section's pixel order"""
+        physical = self._physical.get(name)
+        if physical is not None:
+            return physical
+
+        with self._lock:
+            # Resolve from the nearest ancestor that is already known down to this section
+            chain = [name]
+            parent = self._sections[name].parent_section_name
+            while parent in self._sections and parent not in self._physical:
+                if parent in chain:
+                    raise ValueError('Section {} is its own ancestor'.format(parent))
+                chain.append(parent)
+                parent = self._sections[parent].parent_section_name
+
+            for current in reversed(chain):
+                section = self._sections[current]
+                parent_pixels = self._physical.get(section.parent_section_name)
+                if parent_pixels is None:
+                    # Root sections index physical LEDs directly
+                    self._physical[current] = section.pixels
+                    continue
+                physical = PixelRanges()
+                for start, end in section.pixels.runs:
+                    if end > len(parent_pixels):
+                        raise ValueError('Section {} has pixel {} but its parent {} only has {} pixels'
+                                         .format(current, end - 1, section.parent_section_name, len(parent_pixels)))
+                    physical.extend(parent_pixels[start:end])
+                self._physical[current] = physical
+            return self._physical[name]
+
+    def _intervals(self, name: str) -> List[_Interval]:
+        return [(start, end, name) for start, end in self.physical_pixels(name).sorted().runs]
+
+    def _build_index(self) -> Optional[_IntervalNode]:
+        with self._lock:
+            if not self._indexed:
+                intervals = [i for name in self._sections for i in self._intervals(name)]
+                self._index = _IntervalNode(intervals) if intervals else None
+                self._pending = []
+                self._indexed = True
+            return self._index
+
+    def sections_at(self, pixel: int) -> List[str]:
+        """Names of the sections that drive the physical LED `pixel`"""
+        return self.sections_overlapping(PixelRanges.from_range(pixel, pixel + 1))
+
+    def sections_overlapping(self, pixels: Iterable[int]) -> List[str]:
+        """Names of the sections that drive any of the physical LEDs in `pixels`, in tree order"""
+        index = self._build_index()
+        ranges = pixels if isinstance(pixels, PixelRanges) else PixelRanges.from_pixels(pixels)
+        names: Set[str] = set()
+        for start, end in ranges.sorted().runs:
+            if index is not None:
+                index.overlapping(start, end, names)
+            names.update(i[2] for i in self._pending if i[0] < end and start < i[1])
+        return [name for name in self._sections if name in names]
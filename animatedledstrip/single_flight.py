@@ -0,0 +1,82 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import threading
+import time
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class _Call(Generic[T]):
+    __slots__ = ['done', 'value', 'error', 'followers']
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.followers: int = 0
+
+
+class SingleFlight:
+    """Runs concurrent calls with the same key only once, sharing the result between all the callers"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, load: Callable[[], T], deadline: Optional[float] = None) -> Tuple[T, bool]:
+        """Call `load`, or wait for the call already in flight for `key`
+
+        Returns the value and whether it was shared with any other caller.
+        If `load` raises, every waiting caller gets the same error. A caller
+        waiting on another's call gives up with a TimeoutError at `deadline`
+        (a `time.monotonic()` value), like its own request would."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if not leader:
+            if not call.done.wait(None if deadline is None else max(deadline - time.monotonic(), 0.0)):
+                with self._lock:
+                    # Unless the leader has already finished (and counted this caller), leave the call
+                    if self._calls.get(key) is call:
+                        call.followers -= 1
+                        raise TimeoutError('Deadline exceeded')
+                call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = load()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.followers > 0
+            call.done.set()
+        return call.value, shared
@@ -0,0 +1,170 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import heapq
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+from .location import Location
+from .location_buffer import LocationBuffer
+
+Point = Union[Location, Sequence[float]]
+
+# Nodes with this many LEDs or fewer are scanned instead of split further
+_LEAF_SIZE = 8
+
+
+def _coordinates(point: Point) -> Tuple[float, float, float]:
+    if isinstance(point, Location):
+        return point.x, point.y, point.z
+    x, y, z = point
+    return x, y, z
+
+
+class SpatialIndex:
+    """A k-d tree over LED locations for nearest-neighbour, radius and bounding box queries
+
+    Queries return pixel indices (positions in `StripInfo.led_locations`),
+    which can be used directly as a Section's pixels. The tree is stored
+    implicitly: each node is a slice of `order`, split at its middle element
+    along the axis with the largest spread."""
+
+    def __init__(self, locations: Iterable[Location]):
+        if not isinstance(locations, LocationBuffer):
+            locations = LocationBuffer.from_locations(locations)
+        coordinates = locations.coordinates
+        self._axes: Tuple[array, array, array] = (coordinates[0::3], coordinates[1::3], coordinates[2::3])
+
+        self.order: List[int] = list(range(len(locations)))
+        # Split axis of the node covering order[lo:hi], keyed by (lo, hi)
+        self._split_axis: Dict[Tuple[int, int], int] = {}
+        self._build(0, len(self.order))
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _build(self, lo: int, hi: int):
+        stack = [(lo, hi)]
+        order = self.order
+        axes = self._axes
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= _LEAF_SIZE:
+                continue
+            node = order[lo:hi]
+            spreads = [max(map(axis.__getitem__, node)) - min(map(axis.__getitem__, node)) for axis in axes]
+            axis = spreads.index(max(spreads))
+            node.sort(key=axes[axis].__getitem__)
+            order[lo:hi] = node
+            self._split_axis[(lo, hi)] = axis
+            mid = (lo + hi) // 2
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+
+    def nearest(self, point: Point, k: int = 1) -> List[int]:
+        """The `k` LEDs closest to `point`, closest first"""
+        if k <= 0 or not self.order:
+            return []
+        px, py, pz = _coordinates(point)
+        xs, ys, zs = self._axes
+        order = self.order
+        split_axis = self._split_axis
+
+        # Max-heap (by negated distance) of the best k found so far
+        best: List[Tuple[float, int]] = []
+        stack = [(0, len(order))]
+        while stack:
+            lo, hi = stack.pop()
+            axis = split_axis.get((lo, hi))
+            if axis is None:
+                for i in order[lo:hi]:
+                    d = (xs[i] - px) ** 2 + (ys[i] - py) ** 2 + (zs[i] - pz) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, i))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, i))
+                continue
+
+            mid = (lo + hi) // 2
+            i = order[mid]
+            d = (xs[i] - px) ** 2 + (ys[i] - py) ** 2 + (zs[i] - pz) ** 2
+            if len(best) < k:
+                heapq.heappush(best, (-d, i))
+            elif d < -best[0][0]:
+                heapq.heapreplace(best, (-d, i))
+
+            diff = (px, py, pz)[axis] - self._axes[axis][i]
+            near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+            # The far side is only searched if it could hold something closer than the current k-th best
+            if len(best) < k or diff * diff < -best[0][0]:
+                stack.append(far)
+            stack.append(near)
+
+        return [i for _, i in sorted((-d, i) for d, i in best)]
+
+    def within_radius(self, center: Point, radius: float) -> List[int]:
+        """LEDs at most `radius` away from `center`, in pixel order"""
+        cx, cy, cz = _coordinates(center)
+        return self._search((cx - radius, cy - radius, cz - radius), (cx + radius, cy + radius, cz + radius),
+                            (cx, cy, cz, radius * radius))
+
+    def within_box(self, min_corner: Point, max_corner: Point) -> List[int]:
+        """LEDs inside the axis-aligned box between the two corners (inclusive), in pixel order"""
+        return self._search(_coordinates(min_corner), _coordinates(max_corner), None)
+
+    def _search(self, low: Tuple[float, float, float], high: Tuple[float, float, float],
+                sphere: Union[Tuple[float, float, float, float], None]) -> List[int]:
+        xs, ys, zs = self._axes
+        order = self.order
+        split_axis = self._split_axis
+        lx, ly, lz = low
+        hx, hy, hz = high
+
+        def inside(i: int) -> bool:
+            x, y, z = xs[i], ys[i], zs[i]
+            if not (lx <= x <= hx and ly <= y <= hy and lz <= z <= hz):
+                return False
+            if sphere is None:
+                return True
+            cx, cy, cz, r2 = sphere
+            return (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2 <= r2
+
+        result = []
+        stack = [(0, len(order))]
+        while stack:
+            lo, hi = stack.pop()
+            axis = split_axis.get((lo, hi))
+            if axis is None:
+                result.extend(i for i in order[lo:hi] if inside(i))
+                continue
+
+            mid = (lo + hi) // 2
+            i = order[mid]
+            if inside(i):
+                result.append(i)
+            split = self._axes[axis][i]
+            # Equal coordinates can end up on either side of the split
+            if low[axis] <= split:
+                stack.append((lo, mid))
+            if high[axis] >= split:
+                stack.append((mid + 1, hi))
+
+        result.sort()
+        return result
@@ -0,0 +1,117 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import math
+import time
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from . import numpy_support
+
+
+class StripColorFrame:
+    """A snapshot of the strip's colors that differs from the previous one
+
+    `changed_ranges` holds (start, end) pixel index ranges, end exclusive,
+    covering every pixel that changed since the previous yielded frame."""
+
+    __slots__ = ('colors', 'changed_ranges', 'timestamp', 'dropped')
+
+    def __init__(self, colors: Any, changed_ranges: List[Tuple[int, int]], timestamp: float, dropped: int = 0):
+        self.colors = colors
+        self.changed_ranges: List[Tuple[int, int]] = changed_ranges
+        self.timestamp: float = timestamp
+        # Number of polls skipped since the previous frame because the server couldn't keep up
+        self.dropped: int = dropped
+
+
+def changed_ranges(previous: Optional[Any], current: Any) -> List[Tuple[int, int]]:
+    """Find the (start, end) index ranges where two packed color buffers differ"""
+    if previous is None or len(previous) != len(current):
+        return [(0, len(current))] if len(current) else []
+
+    numpy = numpy_support.numpy
+    if numpy is not None and isinstance(current, numpy.ndarray):
+        changed = numpy.flatnonzero(numpy.asarray(previous) != current)
+        if not len(changed):
+            return []
+        # Split the changed indices wherever they stop being consecutive
+        breaks = numpy.flatnonzero(numpy.diff(changed) != 1) + 1
+        starts = numpy.concatenate(([changed[0]], changed[breaks]))
+        ends = numpy.concatenate((changed[breaks - 1], [changed[-1]])) + 1
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    if previous == current:
+        return []
+    ranges = []
+    start = -1
+    for i, (old, new) in enumerate(zip(previous, current)):
+        if old != new:
+            if start < 0:
+                start = i
+        elif start >= 0:
+            ranges.append((start, i))
+            start = -1
+    if start >= 0:
+        ranges.append((start, len(current)))
+    return ranges
+
+
+def stream_strip_color(fetch: Callable[[], Any],
+                       fps: float = 30.0,
+                       max_frames: Optional[int] = None,
+                       clock: Callable[[], float] = time.monotonic,
+                       sleep: Callable[[float], None] = time.sleep) -> Iterator[StripColorFrame]:
+    """Call `fetch` at `fps` polls per second and yield a StripColorFrame whenever the colors change
+
+    Polls are scheduled against a fixed timeline so timing errors don't
+    accumulate. If a poll takes longer than the frame period, the polls that
+    were missed are skipped rather than run back to back. A strip with no
+    LEDs can never change, so the stream ends as soon as one is seen."""
+    period = 1.0 / fps
+    start = clock()
+    tick = 0
+    dropped = 0
+    frames = 0
+    previous = None
+
+    while max_frames is None or frames < max_frames:
+        colors = fetch()
+        if not len(colors):
+            return
+        now = clock()
+
+        ranges = changed_ranges(previous, colors)
+        if ranges:
+            yield StripColorFrame(colors, ranges, now, dropped)
+            previous = colors
+            frames += 1
+            dropped = 0
+            now = clock()
+
+        next_tick = tick + 1
+        behind = math.floor((now - start) / period) + 1
+        if behind > next_tick:
+            dropped += behind - next_tick
+            next_tick = behind
+        tick = next_tick
+
+        delay = start + tick * period - now
+        if delay > 0:
+            sleep(delay)
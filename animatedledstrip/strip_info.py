@@ -18,9 +18,10 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 #  THE SOFTWARE.
 
-from typing import Optional, List
+from typing import Iterable, Optional
 
 from .location import Location
+from .location_buffer import LocationBuffer
 
 
 class StripInfo(object):
@@ -36,7 +37,7 @@ class StripInfo(object):
                  is_1d_supported: bool = True,
                  is_2d_supported: bool = False,
                  is_3d_supported: bool = False,
-                 led_locations: Optional[List['Location']] = None):
+                 led_locations: Optional[Iterable['Location']] = None):
         self.num_leds: int = num_leds
         self.pin: Optional[int] = pin
         self.render_delay: int = render_delay
@@ -47,7 +48,18 @@ class StripInfo(object):
         self.is_2d_supported: bool = is_2d_supported
         self.is_3d_supported: bool = is_3d_supported
 
+        self.led_locations = led_locations
+
+    @property
+    def led_locations(self) -> LocationBuffer:
+        """The location of each LED, stored in a compact buffer that indexes like a list of Locations"""
+        return self._led_locations
+
+    @led_locations.setter
+    def led_locations(self, led_locations: Optional[Iterable['Location']]):
         if led_locations is None:
-            self.led_locations: List['Location'] = []
+            self._led_locations: LocationBuffer = LocationBuffer()
+        elif isinstance(led_locations, LocationBuffer):
+            self._led_locations: LocationBuffer = led_locations
         else:
-            self.led_locations: List['Location'] = led_locations
+            self._led_locations: LocationBuffer = LocationBuffer.from_locations(led_locations)
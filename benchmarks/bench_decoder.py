@@ -0,0 +1,51 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+"""Time ALSJsonDecoder on large StripInfo and /animations/map payloads
+
+Run with `python -m benchmarks.bench_decoder` from the repository root."""
+
+import timeit
+
+from animatedledstrip.json_decoder import ALSJsonDecoder
+from animatedledstrip import fake_data
+
+
+def _report(name: str, func, repeat: int = 5):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print('{:40s} {:10.2f} ms'.format(name, best * 1e3))
+
+
+def main():
+    decoder = ALSJsonDecoder()
+
+    for num_leds in (1000, 10000, 50000):
+        body = fake_data.strip_info_json(num_leds)
+        _report('StripInfo ({} LEDs)'.format(num_leds),
+                lambda: decoder.decode_object_with_type(body, 'StripInfo'))
+
+    for num_animations in (50, 500):
+        body = fake_data.animation_map_json(num_animations)
+        _report('/animations/map ({} animations)'.format(num_animations),
+                lambda: decoder.decode_map_with_type(body, 'AnimationInfo'))
+
+
+if __name__ == '__main__':
+    main()
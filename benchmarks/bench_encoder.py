@@ -0,0 +1,73 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+"""Compare ALSJsonEncoder (plus the str -> bytes copy) with ALSFastJsonEncoder on large request payloads
+
+Run with `python -m benchmarks.bench_encoder` from the repository root."""
+
+import timeit
+
+from animatedledstrip import AbsoluteDistance, AnimationToRunParams, ColorContainer, Equation, Location, \
+    RadiansRotation, Section
+from animatedledstrip.fast_json_encoder import ALSFastJsonEncoder
+from animatedledstrip.json_encoder import ALSJsonEncoder
+
+
+def animation_to_run_params(num_params: int, num_colors: int) -> AnimationToRunParams:
+    return AnimationToRunParams(
+        animation='Ripple',
+        colors=[ColorContainer([(i * 0x010203) & 0xFFFFFF for i in range(num_colors)]) for _ in range(4)],
+        anim_id='bench',
+        section='fullStrip',
+        run_count=-1,
+        int_params={'int{}'.format(i): i for i in range(num_params)},
+        double_params={'double{}'.format(i): i * 0.5 for i in range(num_params)},
+        string_params={'string{}'.format(i): 'value{}'.format(i) for i in range(num_params)},
+        location_params={'location{}'.format(i): Location(1.0, 2.0, float(i % 4)) for i in range(num_params)},
+        distance_params={'distance{}'.format(i): AbsoluteDistance(1.0, 2.0, 3.0) for i in range(num_params)},
+        rotation_params={'rotation{}'.format(i): RadiansRotation(0.0, 0.0, 1.0) for i in range(num_params)},
+        equation_params={'equation{}'.format(i): Equation([0.0, 1.0, 0.5]) for i in range(num_params)},
+    )
+
+
+def _best(func, number: int = 20) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def _report(name: str, payload):
+    encoder = ALSJsonEncoder()
+    fast_encoder = ALSFastJsonEncoder()
+
+    standard = _best(lambda: bytes(encoder.encode(payload), 'utf-8'))
+    fast = _best(lambda: fast_encoder.encode(payload))
+    print('{:45s} {:9.1f} us {:9.1f} us {:6.2f}x'.format(name, standard * 1e6, fast * 1e6, standard / fast))
+
+
+def main():
+    print('{:45s} {:>12s} {:>12s}'.format('payload', 'ALSJsonEncoder', 'fast'))
+    for num_params, num_colors in ((5, 10), (50, 240), (500, 1000)):
+        _report('AnimationToRunParams ({} params, {} colors)'.format(num_params, num_colors),
+                animation_to_run_params(num_params, num_colors))
+    for num_pixels in (100, 10000):
+        _report('Section ({} pixels)'.format(num_pixels), Section('bench', list(range(num_pixels)), 'fullStrip'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+"""Compare per-call latency of a fresh urlopen per request against the pooled ALSHttpClient transport
+
+Run with `python -m benchmarks.bench_transport` from the repository root."""
+
+import time
+from urllib.request import Request, urlopen
+
+from animatedledstrip import ALSHttpClient
+from animatedledstrip.fake_server import FakeALSServer
+
+CALLS = 2000
+
+
+def _time_per_call(func) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        func()
+    return (time.perf_counter() - start) / CALLS
+
+
+def main():
+    with FakeALSServer(num_leds=4) as server:
+        url = 'http://{}:{}/strip/color'.format(server.host, server.port)
+        fresh = _time_per_call(lambda: urlopen(Request(url)).read())
+
+        with ALSHttpClient(server.host, port=server.port) as client:
+            pooled = _time_per_call(client.get_current_strip_color)
+
+    print('urlopen per call: {:8.1f} us'.format(fresh * 1e6))
+    print('pooled client:    {:8.1f} us'.format(pooled * 1e6))
+    print('speedup:          {:8.2f}x'.format(fresh / pooled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+"""Benchmark suite for the transport, encoding and decoding hot paths
+
+Run with `python -m benchmarks.suite` from the repository root. Results are printed as a table, or as JSON with
+`--json`. To check a change for regressions, save a baseline before it and compare against it after:
+
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.2
+
+`--compare` exits with status 1 if any benchmark got slower than the baseline by more than the threshold."""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from animatedledstrip import ALSHttpClient, Section
+from animatedledstrip.fake_data import animation_map_json, running_map_json, sections_json, strip_info_json
+from animatedledstrip.fake_server import FakeALSServer
+from animatedledstrip.fast_json_encoder import ALSFastJsonEncoder
+from animatedledstrip.json_decoder import ALSJsonDecoder
+from animatedledstrip.json_encoder import ALSJsonEncoder
+
+from .bench_encoder import animation_to_run_params
+
+# Payload sizes for each size preset: number of LEDs, animations, running animations and sections
+SIZES: Dict[str, Dict[str, List[int]]] = {
+    'quick': {'leds': [240], 'animations': [20], 'running': [5], 'sections': [10]},
+    'default': {'leds': [240, 10000], 'animations': [20, 200], 'running': [5, 50], 'sections': [10, 500]},
+    'large': {'leds': [240, 10000, 50000], 'animations': [20, 200, 1000], 'running': [5, 50, 200],
+              'sections': [10, 500, 5000]},
+}
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable[[], object]
+
+
+class Result(NamedTuple):
+    name: str
+    best: float
+    mean: float
+    number: int
+
+
+def decoder_benchmarks(sizes: Dict[str, List[int]]) -> Iterator[Benchmark]:
+    decoder = ALSJsonDecoder()
+
+    for num_leds in sizes['leds']:
+        body = strip_info_json(num_leds)
+        yield Benchmark('decode/StripInfo[leds={}]'.format(num_leds),
+                        lambda body=body: decoder.decode_object_with_type(body, 'StripInfo'))
+
+    for num_animations in sizes['animations']:
+        body = animation_map_json(num_animations)
+        list_body = json.dumps(list(json.loads(body).values())).encode()
+        yield Benchmark('decode/AnimationInfo map[animations={}]'.format(num_animations),
+                        lambda body=body: decoder.decode_map_with_type(body, 'AnimationInfo'))
+        yield Benchmark('decode/AnimationInfo list[animations={}]'.format(num_animations),
+                        lambda body=list_body: decoder.decode_list_with_type(body, 'AnimationInfo'))
+
+    for num_running in sizes['running']:
+        body = running_map_json(num_running)
+        yield Benchmark('decode/RunningAnimationParams map[running={}]'.format(num_running),
+                        lambda body=body: decoder.decode_map_with_type(body, 'RunningAnimationParams'))
+
+    for num_sections in sizes['sections']:
+        body = sections_json(num_sections)
+        yield Benchmark('decode/Section list[sections={}]'.format(num_sections),
+                        lambda body=body: decoder.decode_list_with_type(body, 'Section'))
+
+
+def encoder_benchmarks(sizes: Dict[str, List[int]]) -> Iterator[Benchmark]:
+    encoder = ALSJsonEncoder()
+    fast_encoder = ALSFastJsonEncoder()
+
+    for num_leds in sizes['leds']:
+        params = animation_to_run_params(10, num_leds)
+        section = Section('bench', list(range(num_leds)), 'fullStrip')
+        yield Benchmark('encode/AnimationToRunParams[leds={}]'.format(num_leds),
+                        lambda params=params: encoder.encode(params))
+        yield Benchmark('encode-fast/AnimationToRunParams[leds={}]'.format(num_leds),
+                        lambda params=params: fast_encoder.encode(params))
+        yield Benchmark('encode/Section[leds={}]'.format(num_leds),
+                        lambda section=section: encoder.encode(section))
+        yield Benchmark('encode-fast/Section[leds={}]'.format(num_leds),
+                        lambda section=section: fast_encoder.encode(section))
+
+
+def client_benchmarks(client: ALSHttpClient, server: FakeALSServer) -> Iterator[Benchmark]:
+    num_leds = server.num_leds
+    num_animations = len(server.animations)
+    num_running = len(server.running)
+    num_sections = len(server.sections)
+
+    yield Benchmark('client/get_strip_info[leds={}]'.format(num_leds), client.get_strip_info)
+    yield Benchmark('client/get_current_strip_color[leds={}]'.format(num_leds), client.get_current_strip_color)
+    yield Benchmark('client/get_supported_animations_map[animations={}]'.format(num_animations),
+                    client.get_supported_animations_map)
+    yield Benchmark('client/get_running_animations[running={}]'.format(num_running), client.get_running_animations)
+    yield Benchmark('client/get_sections[sections={}]'.format(num_sections), client.get_sections)
+
+
+def time_benchmark(benchmark: Benchmark, repeat: int = 5, min_time: float = 0.05) -> Result:
+    timer = timeit.Timer(benchmark.func)
+    number = 1
+    while timer.timeit(number) < min_time and number < 1000000:
+        number *= 2
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return Result(benchmark.name, min(times), sum(times) / len(times), number)
+
+
+def run(size: str = 'default', repeat: int = 5, min_time: float = 0.05, select: Optional[str] = None,
+        progress: Callable[[Result], None] = lambda result: None) -> List[Result]:
+    """Run every benchmark whose name contains `select` and return the results"""
+    sizes = SIZES[size]
+    results = []
+
+    def run_all(benchmarks: Iterator[Benchmark]):
+        for benchmark in benchmarks:
+            if select is None or select in benchmark.name:
+                results.append(time_benchmark(benchmark, repeat, min_time))
+                progress(results[-1])
+
+    run_all(decoder_benchmarks(sizes))
+    run_all(encoder_benchmarks(sizes))
+
+    # End-to-end calls run against a fake server, once per preset size
+    for i in range(len(sizes['leds'])):
+        with FakeALSServer(num_leds=sizes['leds'][i], num_animations=sizes['animations'][i],
+                           num_sections=sizes['sections'][i], num_running=sizes['running'][i], seed=0) as server, \
+                ALSHttpClient(server.host, server.port) as client:
+            run_all(client_benchmarks(client, server))
+
+    return results
+
+
+def to_json(results: List[Result], size: str) -> Dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': size,
+        'results': {r.name: {'best': r.best, 'mean': r.mean, 'number': r.number} for r in results},
+    }
+
+
+def compare(results: List[Result], baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every benchmark that is slower than in `baseline` by more than `threshold`
+
+    Per-benchmark thresholds can be set in the baseline's `thresholds` object, keyed by benchmark name."""
+    regressions = []
+    thresholds = baseline.get('thresholds', {})
+    for result in results:
+        previous = baseline['results'].get(result.name)
+        if previous is None:
+            continue
+        allowed = thresholds.get(result.name, threshold)
+        change = result.best / previous['best'] - 1
+        if change > allowed:
+            regressions.append('{}: {:.1f} us -> {:.1f} us ({:+.0%}, allowed {:+.0%})'
+                               .format(result.name, previous['best'] * 1e6, result.best * 1e6, change, allowed))
+    return regressions
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Run the animatedledstrip benchmark suite')
+    parser.add_argument('--size', choices=sorted(SIZES), default='default', help='payload size preset')
+    parser.add_argument('--select', help='only run benchmarks whose name contains this string')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimum seconds per repeat')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    parser.add_argument('--save', metavar='FILE', help='write the results as JSON to FILE')
+    parser.add_argument('--compare', metavar='FILE', help='compare the results against a baseline saved with --save')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown relative to the baseline, as a fraction (default: 0.25)')
+    options = parser.parse_args(args)
+
+    def print_result(result: Result):
+        print('{:55s} {:12.1f} us {:12.1f} us'.format(result.name, result.best * 1e6, result.mean * 1e6))
+
+    if not options.json:
+        print('{:55s} {:>15s} {:>15s}'.format('benchmark', 'best', 'mean'))
+    results = run(options.size, options.repeat, options.min_time, options.select,
+                  progress=print_result if not options.json else lambda result: None)
+
+    output = to_json(results, options.size)
+    if options.json:
+        print(json.dumps(output, indent=2))
+    if options.save:
+        with open(options.save, 'w') as f:
+            json.dump(output, f, indent=2)
+
+    if options.compare:
+        with open(options.compare) as f:
+            regressions = compare(results, json.load(f), options.threshold)
+        for regression in regressions:
+            print('REGRESSION ' + regression, file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
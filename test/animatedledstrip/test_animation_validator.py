@@ -0,0 +1,94 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from unittest import mock
+
+import pytest
+
+from animatedledstrip import ALSHttpClient, AnimationInfo, AnimationToRunParams, AnimationValidationError, \
+    AnimationValidator, ColorContainer, Location, StripInfo
+from animatedledstrip.animation_info import AnimationParameter
+
+
+def _info() -> AnimationInfo:
+    return AnimationInfo(name='Ripple', abbr='RPL', minimum_colors=2,
+                         dimensionality=['TWO_DIMENSIONAL', 'THREE_DIMENSIONAL'],
+                         int_params=[AnimationParameter('interMovementDelay', '', 30, 'int')],
+                         double_params=[AnimationParameter('speed', '', 1.0, 'float')],
+                         location_params=[AnimationParameter('center', '', Location(1.0, 2.0, 3.0), 'Location')])
+
+
+def _params(**kwargs) -> AnimationToRunParams:
+    kwargs.setdefault('colors', [ColorContainer([0xFF0000]), ColorContainer([0x0000FF])])
+    return AnimationToRunParams(animation='Ripple', **kwargs)
+
+
+def test_valid_params_filled_with_defaults():
+    params = AnimationValidator(_info()).validate(_params(double_params={'speed': 2}))
+
+    assert params.int_params == {'interMovementDelay': 30}
+    assert params.double_params == {'speed': 2}
+    assert params.location_params['center'].z == 3.0
+    assert params.location_params['center'] is not _info().location_params[0].default
+
+
+def test_abbreviation_accepted():
+    params = _params()
+    params.animation = 'rpl'
+
+    AnimationValidator(_info()).validate(params)
+
+
+def test_problems_reported():
+    params = _params(colors=[ColorContainer([0xFF0000])],
+                     int_params={'interMovmentDelay': 10},
+                     double_params={'speed': 'fast'},
+                     location_params={'center': (0, 0, 0)})
+
+    with pytest.raises(AnimationValidationError) as err:
+        AnimationValidator(_info()).validate(params, supported_dimensionality=frozenset({'ONE_DIMENSIONAL'}))
+
+    assert err.value.problems == [
+        'needs at least 2 colors, got 1',
+        "needs one of ['THREE_DIMENSIONAL', 'TWO_DIMENSIONAL'], but the strip supports ['ONE_DIMENSIONAL']",
+        "unknown int parameter 'interMovmentDelay'",
+        "double parameter 'speed' is a str",
+        "location parameter 'center' is a tuple",
+    ]
+
+
+def test_bool_is_not_int():
+    with pytest.raises(AnimationValidationError):
+        AnimationValidator(_info()).validate(_params(int_params={'interMovementDelay': True}))
+
+
+def test_client_caches_validators():
+    client = ALSHttpClient('10.0.0.254')
+
+    with mock.patch.object(client, 'get_animation_info', return_value=_info()) as get_info, \
+            mock.patch.object(client, 'get_strip_info', return_value=StripInfo(is_2d_supported=True)), \
+            mock.patch.object(client, '_post_data') as post_data:
+        client.validate_animation(_params())
+        client.validate_animation(_params())
+        assert get_info.call_count == 1
+
+        with pytest.raises(AnimationValidationError):
+            client.start_animation(_params(colors=[]), validate=True)
+        post_data.assert_not_called()
@@ -0,0 +1,165 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+import pytest
+
+from animatedledstrip import AsyncALSHttpClient, Section
+from animatedledstrip.async_connection_pool import _STALE_CONNECTION_ERRORS, AsyncHTTPConnectionPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _respond(self, status: int, body: bytes, chunked: bool = False):
+        self.server.client_ports.add(self.client_address[1])
+        self.send_response(status)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(0, len(body), 4):
+                part = body[i:i + 4]
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(part), part))
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/running/ids':
+            self._respond(200, b'["a","b"]')
+        elif self.path == '/sections':
+            self._respond(200, b'[{"name":"fullStrip","pixels":[0,1,2],"parentSectionName":""}]', chunked=True)
+        else:
+            self._respond(404, b'')
+
+    def do_HEAD(self):
+        # Content-Length describes the body a GET would have; none is sent
+        self.send_response(200)
+        self.send_header('Content-Length', '9')
+        self.end_headers()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.posts.append(self.path)
+        if self.path == '/drop':
+            # Act on the request but close the connection without responding
+            self.close_connection = True
+            return
+        self._respond(200, body)
+        if self.path == '/close':
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.client_ports = set()
+    httpd.posts = []
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_get(server):
+    async def run():
+        async with AsyncALSHttpClient('127.0.0.1', port=server.server_address[1]) as client:
+            assert await client.get_running_animations_ids() == ['a', 'b']
+            sections = await client.get_sections()
+            assert sections[0].name == 'fullStrip'
+            assert sections[0].pixels == [0, 1, 2]
+
+    asyncio.run(run())
+    assert len(server.client_ports) == 1
+
+
+def test_post(server):
+    async def run():
+        async with AsyncALSHttpClient('127.0.0.1', port=server.server_address[1]) as client:
+            section = await client.create_new_section(Section('sect', [3, 4]))
+            assert section.name == 'sect'
+            assert section.pixels == [3, 4]
+
+    asyncio.run(run())
+
+
+def test_error_status(server):
+    async def run():
+        async with AsyncALSHttpClient('127.0.0.1', port=server.server_address[1]) as client:
+            with pytest.raises(HTTPError):
+                await client.get_strip_info()
+
+    asyncio.run(run())
+
+
+def test_concurrent_requests(server):
+    async def run():
+        async with AsyncALSHttpClient('127.0.0.1', port=server.server_address[1],
+                                      pool_size=8, max_connections=8) as client:
+            results = await asyncio.gather(*(client.get_running_animations_ids() for _ in range(300)))
+            assert results == [['a', 'b']] * 300
+
+    asyncio.run(run())
+    assert len(server.client_ports) <= 8
+
+
+def test_head_ignores_content_length(server):
+    async def run():
+        pool = AsyncHTTPConnectionPool('127.0.0.1', server.server_address[1])
+        assert await asyncio.wait_for(pool.request('HEAD', '/running/ids'), 2) == b''
+        assert await pool.request('GET', '/running/ids') == b'["a","b"]'
+        await pool.clear()
+
+    asyncio.run(run())
+
+
+def test_post_not_resent_after_disconnect(server):
+    async def run():
+        pool = AsyncHTTPConnectionPool('127.0.0.1', server.server_address[1])
+        await pool.request('GET', '/running/ids')
+        with pytest.raises(_STALE_CONNECTION_ERRORS):
+            await pool.request('POST', '/drop', b'{}')
+        await pool.clear()
+
+    asyncio.run(run())
+    assert server.posts == ['/drop']
+
+
+def test_post_on_closed_connection_uses_new_connection(server):
+    async def run():
+        pool = AsyncHTTPConnectionPool('127.0.0.1', server.server_address[1])
+        await pool.request('POST', '/close', b'{}')
+        await asyncio.sleep(0.05)
+        assert await pool.request('POST', '/start', b'{}') == b'{}'
+        await pool.clear()
+
+    asyncio.run(run())
+    assert server.posts == ['/close', '/start']
@@ -0,0 +1,70 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import threading
+import time
+from unittest import mock
+from urllib.error import HTTPError
+
+from animatedledstrip import ALSHttpClient, AnimationToRunParams, RunningAnimationParams
+
+
+def _start(params: AnimationToRunParams) -> RunningAnimationParams:
+    time.sleep(0.05)
+    if params.animation == 'Bad':
+        raise HTTPError('/start', 400, 'Bad Request', None, None)
+    return RunningAnimationParams(animation_name=params.animation, anim_id=params.anim_id)
+
+
+def test_start_animations():
+    params = [AnimationToRunParams(animation='Anim{}'.format(i), anim_id=str(i)) for i in range(8)]
+    params[3].animation = 'Bad'
+
+    with ALSHttpClient('10.0.0.254', pool_size=8) as client, \
+            mock.patch.object(client, 'start_animation', side_effect=_start):
+        start = time.monotonic()
+        result = client.start_animations(params)
+        elapsed = time.monotonic() - start
+
+    # All eight run at once rather than one after another
+    assert elapsed < 0.3
+    assert list(result.results) == [0, 1, 2, 4, 5, 6, 7]
+    assert [r.animation_name for r in result.results.values()] == ['Anim{}'.format(i) for i in [0, 1, 2, 4, 5, 6, 7]]
+    assert list(result.errors) == [3]
+    assert result.errors[3].code == 400
+
+
+def test_end_all_running():
+    ended = []
+    lock = threading.Lock()
+
+    def end(anim_id: str) -> RunningAnimationParams:
+        with lock:
+            ended.append(anim_id)
+        return RunningAnimationParams(anim_id=anim_id)
+
+    with ALSHttpClient('10.0.0.254') as client, \
+            mock.patch.object(client, 'get_running_animations_ids', return_value=['a', 'b', 'c']), \
+            mock.patch.object(client, 'end_animation', side_effect=end):
+        result = client.end_all_running()
+
+    assert result.ok
+    assert list(result.results) == ['a', 'b', 'c']
+    assert sorted(ended) == ['a', 'b', 'c']
@@ -0,0 +1,192 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import time
+from unittest import mock
+from urllib.error import HTTPError
+
+import pytest
+
+from animatedledstrip import ALSHttpClient, AnimationToRunParams, CircuitBreaker, CircuitOpenError
+from animatedledstrip.fake_server import FakeALSServer
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_breaker_states():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=clock)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 4.0
+    with pytest.raises(CircuitOpenError) as e:
+        breaker.before_call()
+    assert e.value.retry_after == pytest.approx(6.0)
+
+    # One trial call is let through after the reset timeout; it fails, so the breaker opens again
+    clock.now = 10.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 20.0
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_stuck_trial_expires():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10.0
+    breaker.before_call()
+    clock.now = 15.0
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # The first trial never reported back, so another one is let through
+    clock.now = 20.0
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_interrupted_trial_releases_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    clock.now = 10.0
+
+    with FakeALSServer() as server, ALSHttpClient(server.host, server.port, circuit_breaker=breaker) as client:
+        with mock.patch.object(client.pool, 'request', side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                client.get_strip_info()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        client.get_strip_info()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_call_timeout():
+    with FakeALSServer(latency=2.0) as server, ALSHttpClient(server.host, server.port, call_timeout=0.2) as client:
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            client.get_strip_info()
+        assert time.monotonic() - start < 1.0
+
+
+def test_deadline():
+    with FakeALSServer() as server, ALSHttpClient(server.host, server.port) as client:
+        client.get_strip_info()
+
+        server.latency = 0.15
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            with client.deadline(0.4):
+                # The first two calls fit in the deadline, the third doesn't
+                client.get_running_animations_ids()
+                client.get_running_animations_ids()
+                client.get_running_animations_ids()
+        assert time.monotonic() - start < 1.0
+
+        # The connection that timed out was dropped, and later calls work normally
+        server.latency = 0.0
+        assert client.get_strip_info().num_leds == 240
+
+
+def test_retries():
+    with FakeALSServer(error_rate=1.0, seed=0) as server, \
+            ALSHttpClient(server.host, server.port, retries=3, backoff=0.001) as client:
+        with pytest.raises(HTTPError):
+            client.get_running_animations_ids()
+        assert server.request_count == 4
+
+        # Only GETs are retried
+        with pytest.raises(HTTPError):
+            client.start_animation(AnimationToRunParams(animation='Animation0'))
+        assert server.request_count == 5
+
+        server.error_rate = 0.5
+        for _ in range(10):
+            client.get_running_animations_ids()
+
+
+def test_retries_stop_at_deadline():
+    with FakeALSServer(error_rate=1.0) as server, \
+            ALSHttpClient(server.host, server.port, retries=100, backoff=0.05, call_timeout=0.3) as client:
+        start = time.monotonic()
+        with pytest.raises(HTTPError):
+            client.get_running_animations_ids()
+        assert time.monotonic() - start < 0.5
+        assert 1 < server.request_count < 100
+
+
+def test_client_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    with FakeALSServer(error_rate=1.0) as server, \
+            ALSHttpClient(server.host, server.port, circuit_breaker=breaker) as client:
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                client.get_running_animations_ids()
+
+        with pytest.raises(CircuitOpenError):
+            client.get_running_animations_ids()
+        assert server.request_count == 2
+
+        server.error_rate = 0.0
+        time.sleep(0.25)
+        assert client.get_running_animations_ids() == []
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        # Errors caused by the request rather than the server don't count as failures
+        for _ in range(3):
+            with pytest.raises(HTTPError):
+                client.get_section('missing')
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_when_server_is_down():
+    with FakeALSServer() as server:
+        port = server.port
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    with ALSHttpClient('127.0.0.1', port, circuit_breaker=breaker) as client:
+        with pytest.raises(ConnectionRefusedError):
+            client.get_strip_info()
+        with pytest.raises(CircuitOpenError):
+            client.get_strip_info()
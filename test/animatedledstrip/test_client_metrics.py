@@ -0,0 +1,124 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from urllib.error import HTTPError
+
+import pytest
+
+from animatedledstrip import ALSHttpClient, ClientMetrics
+from animatedledstrip.client_metrics import Histogram, endpoint_name
+from animatedledstrip.fake_server import FakeALSServer
+
+
+def test_endpoint_name():
+    assert endpoint_name('/animation/Ripple') == '/animation/{name}'
+    assert endpoint_name('/running/1234') == '/running/{id}'
+    assert endpoint_name('/running/ids') == '/running/ids'
+    assert endpoint_name('/sections/section1') == '/sections/{name}'
+    assert endpoint_name('/sections/map') == '/sections/map'
+    assert endpoint_name('/strip/info') == '/strip/info'
+
+
+def test_histogram():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(2.65)
+    assert histogram.cumulative_counts() == [(0.1, 2), (1.0, 3), (float('inf'), 4)]
+
+
+def test_client_metrics():
+    metrics = ClientMetrics()
+    events = []
+    metrics.add_listener(events.append)
+
+    with FakeALSServer(num_leds=50, num_sections=2) as server, \
+            ALSHttpClient(server.host, server.port, metrics=metrics) as client:
+        client.get_strip_info()
+        client.get_section('section0')
+        client.get_section('section1')
+        list(client.iter_sections())
+        with pytest.raises(HTTPError):
+            client.get_section('missing')
+
+    data = metrics.to_dict()
+    assert data['in_flight'] == 0
+    assert data['connections_opened'] == 1
+    assert data['connect']['count'] == 1
+
+    strip_info = data['endpoints']['GET /strip/info']
+    assert strip_info['requests'] == 1
+    assert strip_info['bytes_received'] > 1000
+    assert strip_info['wait']['count'] == 1
+
+    sections = data['endpoints']['GET /sections/{name}']
+    assert sections['requests'] == 3
+    assert sections['errors'] == {'404': 1}
+    assert data['endpoints']['GET /sections']['bytes_received'] > 0
+
+    assert data['decode']['StripInfo']['parse']['count'] == 1
+    assert data['decode']['StripInfo']['build']['count'] == 1
+    assert data['decode']['Section']['parse']['count'] == 3
+
+    assert [e.endpoint for e in events] == \
+        ['/strip/info', '/sections/{name}', '/sections/{name}', '/sections', '/sections/{name}']
+    assert events[-1].status == 404
+    assert isinstance(events[-1].error, HTTPError)
+
+
+def test_listener_errors_do_not_affect_requests(caplog):
+    metrics = ClientMetrics()
+    events = []
+
+    def broken(event):
+        raise RuntimeError('listener failed')
+
+    metrics.add_listener(broken)
+    metrics.add_listener(events.append)
+
+    with FakeALSServer(num_leds=10) as server, ALSHttpClient(server.host, server.port, metrics=metrics) as client:
+        assert client.get_strip_info().num_leds == 10
+        with pytest.raises(HTTPError):
+            client.get_section('missing')
+
+    assert [e.status for e in events] == [200, 404]
+    assert metrics.to_dict()['in_flight'] == 0
+    assert [str(r.exc_info[1]) for r in caplog.records] == ['listener failed', 'listener failed']
+
+
+def test_prometheus_export():
+    metrics = ClientMetrics()
+    with FakeALSServer(num_leds=10) as server, ALSHttpClient(server.host, server.port, metrics=metrics) as client:
+        client.get_strip_info()
+
+    text = metrics.to_prometheus()
+    assert '# TYPE als_client_wait_seconds histogram' in text
+    assert 'als_client_requests_total{method="GET",endpoint="/strip/info"} 1' in text
+    assert 'als_client_wait_seconds_bucket{method="GET",endpoint="/strip/info",le="+Inf"} 1' in text
+    assert 'als_client_parse_seconds_count{type="StripInfo"} 1' in text
+    assert text.endswith('\n')
+
+
+def test_disabled_by_default():
+    with FakeALSServer(num_leds=10) as server, ALSHttpClient(server.host, server.port) as client:
+        assert client.metrics is None
+        assert client.pool.metrics is None
+        assert client.get_strip_info().num_leds == 10
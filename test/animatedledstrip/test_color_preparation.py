@@ -0,0 +1,77 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from array import array
+from unittest import mock
+
+import pytest
+
+from animatedledstrip import ColorContainer, PreparedColorContainer
+from animatedledstrip.color_preparation import _prepare, prepare_colors
+
+
+backend_caches = [_prepare]
+
+
+def test_prepare_blends_to_next_color(backend):
+    assert prepare_colors([0xFF0000, 0x0000FF], 8) == [
+        0xFF0000, 0xC0003F, 0x80007F, 0x4000BF, 0x0000FF, 0x3F00C0, 0x7F0080, 0xBF0040,
+    ]
+
+
+def test_prepare_edge_cases(backend):
+    assert prepare_colors([], 5) == []
+    assert prepare_colors([0x123456], 3) == [0x123456] * 3
+    assert prepare_colors([0x1, 0x2], 0) == []
+    assert prepare_colors([0xFF0000, 0x00FF00, 0x0000FF], 2) == [0x00FF00, 0x0000FF]
+
+
+def test_backends_agree():
+    pytest.importorskip('numpy')
+    colors = [0xFF0000, 0x00FF00, 0x0000FF, 0x123456, 0xFEDCBA]
+    for length in (1, 4, 5, 7, 100, 333):
+        _prepare.cache_clear()
+        expected = prepare_colors(colors, length)
+        _prepare.cache_clear()
+        with mock.patch('animatedledstrip.numpy_support.numpy', None):
+            assert prepare_colors(colors, length) == expected
+
+
+def test_prepare_is_cached(backend):
+    first = prepare_colors([0xFF0000, 0x00FF00], 50)
+    first[0] = 0
+    assert prepare_colors([0xFF0000, 0x00FF00], 50)[0] == 0xFF0000
+    assert _prepare.cache_info().hits == 1
+
+
+def test_cache_holds_packed_buffers(backend):
+    cached = _prepare((0xFF0000, 0x00FF00), 50)
+
+    assert isinstance(cached, array) and cached.typecode == 'I'
+    assert cached.tolist() == prepare_colors([0xFF0000, 0x00FF00], 50)
+
+
+def test_container_prepare(backend):
+    container = ColorContainer([0xFF0000, 0x0000FF])
+    prepared = container.prepare(4)
+    assert isinstance(prepared, PreparedColorContainer)
+    assert prepared.colors == [0xFF0000, 0x80007F, 0x0000FF, 0x7F0080]
+    assert prepared.original_colors == [0xFF0000, 0x0000FF]
+    assert prepared.original_colors is not container.colors
@@ -0,0 +1,152 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+import pytest
+
+from animatedledstrip import ALSHttpClient
+from animatedledstrip.connection_pool import HTTPConnectionPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.client_ports.append(self.client_address[1])
+        if self.path == '/missing':
+            body = b'not found'
+            self.send_response(404)
+        else:
+            body = b'["a","b"]'
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.close_after_response:
+            self.close_connection = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.posts.append(self.path)
+        if self.path == '/drop':
+            # Act on the request but close the connection without responding
+            self.close_connection = True
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        if self.server.close_after_response:
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.client_ports = []
+    httpd.close_after_response = False
+    httpd.posts = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_connection_reused(server):
+    pool = HTTPConnectionPool('127.0.0.1', server.server_address[1])
+
+    for _ in range(5):
+        assert pool.request('GET', '/running/ids') == b'["a","b"]'
+
+    assert len(set(server.client_ports)) == 1
+    pool.clear()
+
+
+def test_idle_eviction(server):
+    pool = HTTPConnectionPool('127.0.0.1', server.server_address[1], idle_timeout=0.01)
+
+    pool.request('GET', '/running/ids')
+    time.sleep(0.05)
+    pool.request('GET', '/running/ids')
+
+    assert len(set(server.client_ports)) == 2
+    pool.clear()
+
+
+def test_reconnect_after_server_close(server):
+    pool = HTTPConnectionPool('127.0.0.1', server.server_address[1])
+
+    # The server closes the socket after responding without telling the client
+    server.close_after_response = True
+    pool.request('GET', '/running/ids')
+    time.sleep(0.05)
+    assert pool.request('GET', '/running/ids') == b'["a","b"]'
+    pool.clear()
+
+
+def test_post_on_closed_connection_uses_new_connection(server):
+    pool = HTTPConnectionPool('127.0.0.1', server.server_address[1])
+
+    server.close_after_response = True
+    pool.request('GET', '/running/ids')
+    time.sleep(0.05)
+    assert pool.request('POST', '/start', b'{}') == b''
+    assert server.posts == ['/start']
+    pool.clear()
+
+
+def test_post_not_resent_after_disconnect(server):
+    pool = HTTPConnectionPool('127.0.0.1', server.server_address[1])
+
+    pool.request('GET', '/running/ids')
+    with pytest.raises(ConnectionError):
+        pool.request('POST', '/drop', b'{}')
+    assert server.posts == ['/drop']
+    pool.clear()
+
+
+def test_error_status(server):
+    pool = HTTPConnectionPool('127.0.0.1', server.server_address[1])
+
+    with pytest.raises(HTTPError) as err:
+        pool.request('GET', '/missing')
+    assert err.value.code == 404
+
+    # The connection is still usable after an error response
+    assert pool.request('GET', '/running/ids') == b'["a","b"]'
+    assert len(set(server.client_ports)) == 1
+    pool.clear()
+
+
+def test_client_uses_pool(server):
+    with ALSHttpClient('127.0.0.1', port=server.server_address[1]) as client:
+        assert client.get_running_animations_ids() == ['a', 'b']
+        assert client.get_running_animations_ids() == ['a', 'b']
+
+    assert len(set(server.client_ports)) == 1
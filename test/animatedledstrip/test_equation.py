@@ -0,0 +1,89 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import math
+import random
+from array import array
+from unittest import mock
+
+import pytest
+
+from animatedledstrip import Equation
+
+
+def test_call():
+    equation = Equation([1.0, 2.0, 3.0])
+    assert equation(0.0) == 1.0
+    assert equation(2.0) == 1.0 + 2.0 * 2.0 + 3.0 * 4.0
+    assert Equation([5.0])(10.0) == 5.0
+    assert Equation()(3.0) == 0.0
+    assert Equation([1.0, float('inf')])(1.0) == float('inf')
+
+
+def test_compile_is_cached():
+    assert Equation([0.0, 1.0, 0.5]).compile() is Equation([0.0, 1.0, 0.5]).compile()
+    assert Equation([1.0, 2.0]).compile() is not Equation([1, 2]).compile()
+    assert type(Equation([1, 2])(3)) is int
+
+
+def test_long_equation():
+    assert Equation([1.0] * 1000)(0.5) == pytest.approx(2.0)
+
+
+def test_evaluate_many(backend):
+    equation = Equation([0.5, -1.0, 0.25, 0.125])
+    xs = [i / 10 for i in range(-50, 50)]
+    result = equation.evaluate_many(xs)
+
+    assert len(result) == len(xs)
+    assert list(result) == pytest.approx([equation(x) for x in xs])
+    assert list(equation.evaluate_many(array('d', xs))) == pytest.approx(list(result))
+    assert list(equation.evaluate_many(x for x in xs)) == pytest.approx(list(result))
+    assert list(Equation([2.0]).evaluate_many([1.0, 2.0])) == [2.0, 2.0]
+
+
+def test_fit(backend):
+    rng = random.Random(0)
+    xs = [rng.uniform(-3, 3) for _ in range(200)]
+    ys = [1.0 - 2.0 * x + 0.5 * x ** 2 + rng.gauss(0, 0.01) for x in xs]
+
+    equation = Equation.fit(xs, ys, 2)
+    assert equation.coefficients == pytest.approx([1.0, -2.0, 0.5], abs=0.01)
+
+    exact = Equation.fit([0.0, 1.0, 2.0, 3.0], [math.sin(x) for x in (0.0, 1.0, 2.0, 3.0)], 3)
+    assert [exact(x) for x in (0.0, 1.0, 2.0, 3.0)] == pytest.approx([math.sin(x) for x in (0.0, 1.0, 2.0, 3.0)])
+
+
+def test_fit_wide_x_range(backend):
+    xs = [float(x) for x in range(500, 1001)]
+    ys = [1.0 + 0.5 * x - 2e-3 * x ** 2 + 3e-6 * x ** 3 for x in xs]
+
+    equation = Equation.fit(xs, ys, 3)
+    assert equation.coefficients == pytest.approx([1.0, 0.5, -2e-3, 3e-6], rel=1e-9)
+
+
+def test_fit_errors():
+    with pytest.raises(ValueError):
+        Equation.fit([1.0, 2.0], [1.0], 1)
+    with pytest.raises(ValueError):
+        Equation.fit([1.0, 2.0], [1.0, 2.0], 2)
+    with mock.patch('animatedledstrip.numpy_support.numpy', None):
+        with pytest.raises(ValueError):
+            Equation.fit([1.0, 1.0, 1.0], [1.0, 2.0, 3.0], 2)
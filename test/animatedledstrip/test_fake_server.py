@@ -0,0 +1,109 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import subprocess
+import sys
+import threading
+from urllib.error import HTTPError
+
+import pytest
+
+from animatedledstrip import ALSHttpClient, AnimationToRunParams, ColorContainer, Section
+from animatedledstrip.fake_server import FakeALSServer
+
+
+@pytest.fixture
+def server():
+    with FakeALSServer(num_leds=100, num_animations=5, num_sections=2, num_running=3, seed=1) as s:
+        yield s
+
+
+def test_catalog(server):
+    with ALSHttpClient(server.host, server.port) as client:
+        assert len(client.get_supported_animations()) == 5
+        assert sorted(client.get_supported_animations_map()) == ['Animation{}'.format(i) for i in range(5)]
+        assert client.get_animation_info('Animation2').name == 'Animation2'
+        assert client.get_strip_info().num_leds == 100
+        assert len(client.get_strip_info().led_locations) == 100
+        assert sorted(client.get_sections_map()) == ['fullStrip', 'section0', 'section1']
+        assert client.get_section('section1').pixels == list(range(50, 100))
+
+
+def test_running_animations(server):
+    with ALSHttpClient(server.host, server.port) as client:
+        assert sorted(client.get_running_animations_ids()) == ['0', '1', '2']
+
+        params = AnimationToRunParams(animation='Animation1', anim_id='new', section='section0')
+        params.colors.append(ColorContainer([0x00FF00]))
+        running = client.start_animation(params)
+        assert running.anim_id == 'new'
+        assert len(running.colors[0].colors) == 50
+        assert client.get_current_strip_color()[:50] == [0x00FF00] * 50
+
+        assert client.end_animation('new').anim_id == 'new'
+        assert 'new' not in client.get_running_animations_ids()
+
+        client.clear_strip()
+        assert client.get_running_animations_ids() == []
+        assert client.get_current_strip_color() == [0] * 100
+
+
+def test_create_section(server):
+    with ALSHttpClient(server.host, server.port) as client:
+        client.create_new_section(Section('mine', [1, 2, 3], 'fullStrip'))
+        assert client.get_section('mine').pixels == [1, 2, 3]
+
+
+def test_fault_injection(server):
+    with ALSHttpClient(server.host, server.port) as client:
+        with pytest.raises(HTTPError) as e:
+            client.get_section('missing')
+        assert e.value.code == 404
+
+        server.error_rate = 1.0
+        with pytest.raises(HTTPError) as e:
+            client.get_running_animations_ids()
+        assert e.value.code == 500
+
+        server.error_rate = 0.0
+        server.latency = 0.05
+        assert len(client.get_running_animations_ids()) == 3
+
+
+def test_run_as_subprocess():
+    process = subprocess.Popen([sys.executable, '-m', 'animatedledstrip.fake_server', '--port', '0', '--leds', '10'],
+                               stdout=subprocess.PIPE, universal_newlines=True)
+    try:
+        port = int(process.stdout.readline().rsplit(':', 1)[1])
+        with ALSHttpClient('127.0.0.1', port) as client:
+            assert client.get_strip_info().num_leds == 10
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def test_stop_without_start():
+    server = FakeALSServer()
+    thread = threading.Thread(target=server.stop, daemon=True)
+    thread.start()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert server._httpd.socket.fileno() == -1
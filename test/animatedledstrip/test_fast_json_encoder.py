@@ -0,0 +1,129 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import json
+from collections import OrderedDict, defaultdict
+from enum import IntEnum
+
+import pytest
+
+from animatedledstrip import AbsoluteDistance, AnimationInfo, AnimationToRunParams, ColorContainer, \
+    DegreesRotation, Equation, Location, PercentDistance, PreparedColorContainer, RadiansRotation, \
+    RunningAnimationParams, Section
+from animatedledstrip.animation_info import AnimationParameter
+from animatedledstrip.fast_json_encoder import ALSFastJsonEncoder
+from animatedledstrip.json_encoder import ALSJsonEncoder
+from animatedledstrip.new_animation_group_info import NewAnimationGroupInfo
+
+
+def _params() -> AnimationToRunParams:
+    return AnimationToRunParams(
+        animation='Wipé',
+        colors=[ColorContainer([0xFF0000, 0x00FF00]), PreparedColorContainer([1, 1, 1], [1])],
+        anim_id='id',
+        section='fullStrip',
+        run_count=2,
+        int_params={'delay': 10},
+        double_params={'speed': 1.5, 'limit': float('inf')},
+        string_params={'mode': 'q"uote'},
+        location_params={'center': Location(1.0, 2.5, 3.0)},
+        distance_params={'a': AbsoluteDistance(1.0, 2.0, 3.0), 'p': PercentDistance()},
+        rotation_params={'d': DegreesRotation(), 'r': RadiansRotation(1.0, 2.0, 3.0, ['ROTATE_X'])},
+        equation_params={'eq': Equation([1.0, 2.0])},
+    )
+
+
+MODELS = [
+    _params(),
+    RunningAnimationParams(animation_name='Wipe', source_params=_params(),
+                           location_params={'center': Location(1.0, 2.0, 3.0)}),
+    Section('section', list(range(100)), 'fullStrip'),
+    AnimationInfo(name='Wipe', int_params=[AnimationParameter('delay', 'Delay', 10, 'int')],
+                  location_params=[AnimationParameter('center', '', Location(), 'Location')]),
+    NewAnimationGroupInfo('sequential', AnimationInfo(name='Group'), ['Wipe', 'Ripple']),
+    [True, False, None, [], {}, 'text', 1, 1.5, [1, 2.5]],
+]
+
+
+@pytest.mark.parametrize('model', MODELS)
+def test_matches_json_encoder(model):
+    assert json.loads(ALSFastJsonEncoder().encode(model)) == json.loads(ALSJsonEncoder().encode(model))
+
+
+def test_compact_bytes():
+    assert ALSFastJsonEncoder().encode(Location(1.0, 2.0, 3.0)) == b'{"x":1.0,"y":2.0,"z":3.0}'
+
+
+def test_cached_values_follow_mutation():
+    encoder = ALSFastJsonEncoder()
+    location = Location(1.0, 2.0, 3.0)
+    colors = ColorContainer([1, 2, 3])
+
+    encoder.encode([location, colors])
+    location.x = 5.0
+    colors.add_color(4)
+
+    assert json.loads(encoder.encode([location, colors])) == [{'x': 5.0, 'y': 2.0, 'z': 3.0},
+                                                              {'type': 'ColorContainer', 'colors': [1, 2, 3, 4]}]
+
+
+def test_json_dict_fallback():
+    class Custom:
+        def json_dict(self):
+            return {'value': Location()}
+
+    assert json.loads(ALSFastJsonEncoder().encode(Custom())) == {'value': {'x': 0.0, 'y': 0.0, 'z': 0.0}}
+
+
+def test_not_serializable():
+    with pytest.raises(TypeError):
+        ALSFastJsonEncoder().encode(object())
+
+
+def test_equal_values_of_different_types_are_cached_separately():
+    encoder = ALSFastJsonEncoder()
+
+    assert encoder.encode([255.0, 65280.0]) == b'[255.0,65280.0]'
+    assert encoder.encode(ColorContainer([255, 65280])) == b'{"type":"ColorContainer","colors":[255,65280]}'
+    assert encoder.encode(Location(1.0, 2.0, 3.0)) == b'{"x":1.0,"y":2.0,"z":3.0}'
+    assert encoder.encode(Location(1, 2, 3)) == b'{"x":1,"y":2,"z":3}'
+    assert encoder.encode(Location(0.0, 0.0, 0.0)) == b'{"x":0.0,"y":0.0,"z":0.0}'
+    assert encoder.encode(Location(-0.0, 0.0, 0.0)) == b'{"x":-0.0,"y":0.0,"z":0.0}'
+    assert encoder.encode(Equation([1.0, 2.0])) == b'{"type":"Equation","coefficients":[1.0,2.0]}'
+    assert encoder.encode(Equation([1, 2])) == b'{"type":"Equation","coefficients":[1,2]}'
+    assert encoder.encode([0.0]) == b'[0.0]'
+    assert encoder.encode([-0.0]) == b'[-0.0]'
+
+
+def test_subclasses_of_json_types():
+    class Level(IntEnum):
+        HIGH = 2
+
+    values = defaultdict(list, {'b': [Level.HIGH]})
+    payload = OrderedDict([('a', values), ('c', Location(1.0, 2.0, 3.0))])
+
+    assert ALSFastJsonEncoder().encode(payload) == b'{"a":{"b":[2]},"c":{"x":1.0,"y":2.0,"z":3.0}}'
+    assert json.loads(ALSFastJsonEncoder().encode(payload)) == json.loads(ALSJsonEncoder().encode(payload))
+
+
+def test_long_number_lists_match_json():
+    colors = list(range(1000))
+
+    assert ALSFastJsonEncoder().encode(colors) == json.dumps(colors, separators=(',', ':')).encode()
@@ -0,0 +1,106 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import time
+
+from animatedledstrip import ALSFleetClient, ALSHttpClient
+from animatedledstrip.fake_server import FakeALSServer
+
+
+class _StubClient:
+
+    def __init__(self, name: str, delay: float = 0.0, error: Exception = None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+
+    def get_running_animations_ids(self):
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [self.name]
+
+    def close(self):
+        pass
+
+
+def test_call():
+    stubs = {'strip{}'.format(i): _StubClient('strip{}'.format(i), delay=0.1) for i in range(20)}
+
+    with ALSFleetClient(stubs) as fleet:
+        start = time.monotonic()
+        result = fleet.call('get_running_animations_ids')
+        assert time.monotonic() - start < 1.0
+
+    assert result.ok
+    assert result.results == {name: [name] for name in stubs}
+
+
+def test_partial_results():
+    stubs = {
+        'good': _StubClient('good'),
+        'bad': _StubClient('bad', error=ConnectionRefusedError()),
+        'slow': _StubClient('slow', delay=1.0),
+    }
+
+    with ALSFleetClient(stubs, timeout=0.2) as fleet:
+        result = fleet.map(lambda client: client.get_running_animations_ids())
+
+    assert not result.ok
+    assert result.results == {'good': ['good']}
+    assert isinstance(result.errors['bad'], ConnectionRefusedError)
+    assert isinstance(result.errors['slow'], TimeoutError)
+
+
+def test_clients_from_addresses():
+    with ALSFleetClient(['10.0.0.1', ALSHttpClient('10.0.0.2')], timeout=1.0) as fleet:
+        assert set(fleet.clients) == {('10.0.0.1', 8080), ('10.0.0.2', 8080)}
+        assert fleet.clients[('10.0.0.1', 8080)].pool.timeout == 1.0
+
+
+def test_clients_on_one_host():
+    with ALSFleetClient([ALSHttpClient('10.0.0.1', 8080), ALSHttpClient('10.0.0.1', 8081)]) as fleet:
+        assert set(fleet.clients) == {('10.0.0.1', 8080), ('10.0.0.1', 8081)}
+
+
+def test_timeout_counts_from_call_start():
+    stubs = {'strip{}'.format(i): _StubClient('strip{}'.format(i), delay=0.15) for i in range(4)}
+
+    # Only one worker, so the hosts run one after another and take longer than the timeout overall
+    with ALSFleetClient(stubs, max_workers=1, timeout=0.5) as fleet:
+        result = fleet.call('get_running_animations_ids')
+
+    assert result.ok
+    assert len(result.results) == 4
+
+
+def test_timeout_applies_client_deadline():
+    with FakeALSServer(latency=1.0) as server:
+        with ALSFleetClient([ALSHttpClient(server.host, server.port)], timeout=0.2) as fleet:
+            start = time.monotonic()
+            result = fleet.call('get_running_animations_ids')
+            assert time.monotonic() - start < 0.9
+
+    assert isinstance(result.errors[(server.host, server.port)], TimeoutError)
+
+
+def test_one_worker_per_client_by_default():
+    with ALSFleetClient({'a': _StubClient('a'), 'b': _StubClient('b')}) as fleet:
+        assert fleet._executor._max_workers == 2
@@ -0,0 +1,116 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import json
+
+from animatedledstrip import AbsoluteDistance, AnimationToRunParams, ColorContainer, DegreesRotation, Equation, \
+    Location, PercentDistance, RadiansRotation, StripInfo
+from animatedledstrip.json_decoder import ALSJsonDecoder
+
+SOURCE_PARAMS = {
+    'animation': 'Wipe',
+    'colors': [{'type': 'ColorContainer', 'colors': [0xFF0000, 0x00FF00]}],
+    'id': '12',
+    'section': 'fullStrip',
+    'runCount': 1,
+    'intParams': {'delay': 10},
+    'doubleParams': {'speed': 1.5},
+    'stringParams': {'mode': 'fast'},
+    'locationParams': {'center': {'x': 1.0, 'y': 2.0, 'z': 3.0}},
+    'distanceParams': {'dist': {'type': 'PercentDistance', 'x': 50.0, 'y': 50.0, 'z': 0.0}},
+    'rotationParams': {'rot': {'type': 'DegreesRotation', 'xRotation': 0.0, 'yRotation': 0.0, 'zRotation': 90.0,
+                               'rotationOrder': ['ROTATE_Z']}},
+    'equationParams': {'eq': {'coefficients': [0.0, 1.0]}},
+}
+
+
+def test_decode_strip_info():
+    body = json.dumps({
+        'numLEDs': 2, 'pin': 12, 'renderDelay': 10, 'isRenderLoggingEnabled': False, 'renderLogFile': '',
+        'rendersBetweenLogSaves': 1000, 'is1DSupported': True, 'is2DSupported': False, 'is3DSupported': True,
+        'ledLocations': [{'x': 0.0, 'y': 0.0, 'z': 0.0}, {'x': 1.0, 'y': 2.0, 'z': 3.0}],
+    })
+
+    info = ALSJsonDecoder().decode_object_with_type(body, 'StripInfo')
+
+    assert isinstance(info, StripInfo)
+    assert info.num_leds == 2
+    assert info.is_3d_supported is True
+    assert [(loc.x, loc.y, loc.z) for loc in info.led_locations] == [(0.0, 0.0, 0.0), (1.0, 2.0, 3.0)]
+
+
+def test_decode_animation_info_map():
+    body = json.dumps({'Wipe': {
+        'name': 'Wipe', 'abbr': 'WIP', 'description': '', 'runCountDefault': 1, 'minimumColors': 1,
+        'unlimitedColors': False, 'dimensionality': ['ONE_DIMENSIONAL'],
+        'intParams': [{'name': 'delay', 'description': '', 'default': 10}],
+        'doubleParams': [], 'stringParams': [],
+        'locationParams': [{'name': 'center', 'description': '', 'default': {'x': 1.0, 'y': 2.0, 'z': 3.0}}],
+        'distanceParams': [{'name': 'dist', 'description': '',
+                            'default': {'type': 'AbsoluteDistance', 'x': 1.0, 'y': 0.0, 'z': 0.0}}],
+        'rotationParams': [],
+        'equationParams': [{'name': 'eq', 'description': '', 'default': {'coefficients': [1.0, 2.0]}}],
+    }})
+
+    info = ALSJsonDecoder().decode_map_with_type(body, 'AnimationInfo')['Wipe']
+
+    assert info.name == 'Wipe'
+    assert info.int_params[0].data_type == 'int'
+    assert info.int_params[0].default == 10
+    assert isinstance(info.location_params[0].default, Location)
+    assert isinstance(info.distance_params[0].default, AbsoluteDistance)
+    assert info.equation_params[0].default.coefficients == [1.0, 2.0]
+
+
+def test_decode_running_animation_params():
+    running = {
+        'animationName': 'Wipe',
+        'colors': [{'type': 'PreparedColorContainer', 'colors': [0xFF0000] * 3, 'originalColors': [0xFF0000]}],
+        'id': '12', 'section': 'fullStrip', 'runCount': 1,
+        'intParams': {'delay': 10}, 'doubleParams': {}, 'stringParams': {},
+        'locationParams': {'center': {'x': 1.0, 'y': 2.0, 'z': 3.0}},
+        'distanceParams': {'dist': {'x': 1.0, 'y': 2.0, 'z': 3.0}},
+        'rotationParams': {'rot': {'xRotation': 0.0, 'yRotation': 0.0, 'zRotation': 1.0,
+                                   'rotationOrder': ['ROTATE_Z']}},
+        'equationParams': {'eq': {'coefficients': [0.0, 1.0]}},
+        'sourceParams': SOURCE_PARAMS,
+    }
+
+    params = ALSJsonDecoder().decode_list_with_type(json.dumps([running]), 'RunningAnimationParams')[0]
+
+    assert params.anim_id == '12'
+    assert params.section == 'fullStrip'
+    assert params.colors[0].original_colors == [0xFF0000]
+    assert isinstance(params.distance_params['dist'], AbsoluteDistance)
+    assert isinstance(params.rotation_params['rot'], RadiansRotation)
+    assert isinstance(params.equation_params['eq'], Equation)
+    assert isinstance(params.source_params, AnimationToRunParams)
+    assert params.source_params.colors == [ColorContainer([0xFF0000, 0x00FF00])]
+    assert isinstance(params.source_params.distance_params['dist'], PercentDistance)
+    assert isinstance(params.source_params.rotation_params['rot'], DegreesRotation)
+    assert params.source_params.location_params['center'].z == 3.0
+
+
+def test_object_hook():
+    decoded = ALSJsonDecoder().decode(json.dumps({'type': 'AnimationToRunParams', **SOURCE_PARAMS}))
+
+    assert isinstance(decoded, AnimationToRunParams)
+    assert decoded.colors == [ColorContainer([0xFF0000, 0x00FF00])]
+    assert isinstance(decoded.rotation_params['rot'], DegreesRotation)
@@ -0,0 +1,97 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from animatedledstrip import ALSHttpClient
+from animatedledstrip.json_stream import iter_json_array, iter_json_object
+
+SECTIONS = [{'name': 'section{}'.format(i), 'pixels': list(range(i, i + 10)), 'parentSectionName': 'fullStrip'}
+            for i in range(2000)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.client_ports.add(self.client_address[1])
+        body = json.dumps(SECTIONS).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.client_ports = set()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 16, 65536])
+def test_iter_json_array(chunk_size):
+    data = [1, 23456, -1.5e10, 'héllo ünï', {'a': [1, 2, {'b': None}]}, [], True, None, 123456789]
+
+    assert list(iter_json_array(io.BytesIO(json.dumps(data, indent=2).encode()), chunk_size)) == data
+    assert list(iter_json_array(io.BytesIO(b' [ ] '), chunk_size)) == []
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 16, 65536])
+def test_iter_json_object(chunk_size):
+    data = {'x': 1, 'ÿ': [1, 2], 'z': {'k': 'v'}, 'n': 12345}
+
+    assert dict(iter_json_object(io.BytesIO(json.dumps(data).encode()), chunk_size)) == data
+    assert list(iter_json_object(io.BytesIO(b'{}'), chunk_size)) == []
+
+
+def test_truncated_document():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.BytesIO(b'[1, 2'), 1))
+
+
+def test_iter_sections(server):
+    with ALSHttpClient('127.0.0.1', port=server.server_address[1]) as client:
+        sections = list(client.iter_sections())
+        assert [s.name for s in sections] == [s['name'] for s in SECTIONS]
+        assert sections[5].pixels == list(range(5, 15))
+
+        # The connection is reused after a fully read response
+        list(client.iter_sections())
+        assert len(server.client_ports) == 1
+
+        # but not after stopping part way through
+        for _ in client.iter_sections():
+            break
+        list(client.iter_sections())
+        assert len(server.client_ports) == 2
@@ -0,0 +1,129 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import pickle
+import sys
+import tracemalloc
+
+import pytest
+
+from animatedledstrip import Location, LocationBuffer, StripInfo
+
+
+def _coordinates(locations):
+    return [(loc.x, loc.y, loc.z) for loc in locations]
+
+
+def test_from_locations():
+    buffer = LocationBuffer.from_locations([Location(1.0, 2.0, 3.0), Location(4.0, 5.0, 6.0)])
+
+    assert len(buffer) == 2
+    assert _coordinates(buffer) == [(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)]
+    assert _coordinates([buffer[-1]]) == [(4.0, 5.0, 6.0)]
+    assert _coordinates(buffer[1:]) == [(4.0, 5.0, 6.0)]
+    assert buffer == [Location(1.0, 2.0, 3.0), Location(4.0, 5.0, 6.0)]
+
+    with pytest.raises(IndexError):
+        buffer[2]
+
+
+def test_from_json():
+    buffer = LocationBuffer.from_json([{'x': 1, 'y': 2, 'z': 3}])
+
+    assert list(buffer.coordinates) == [1.0, 2.0, 3.0]
+
+
+def test_append():
+    buffer = LocationBuffer()
+    buffer.append(Location(1.0, 2.0, 3.0))
+    buffer.extend([Location(4.0, 5.0, 6.0)])
+
+    assert buffer == LocationBuffer([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+
+
+def test_bad_length():
+    with pytest.raises(ValueError):
+        LocationBuffer([1.0, 2.0])
+
+
+def test_memoryview():
+    buffer = LocationBuffer([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    view = buffer.memoryview()
+
+    assert view.shape == (2, 3)
+    assert view[1, 2] == 6.0
+
+
+def test_as_numpy_shares_memory():
+    pytest.importorskip('numpy')
+    buffer = LocationBuffer([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+
+    coordinates = buffer.as_numpy()
+    assert coordinates.shape == (2, 3)
+
+    coordinates[0, 0] = 10.0
+    assert buffer[0].x == 10.0
+
+
+def test_strip_info_led_locations():
+    info = StripInfo(led_locations=[Location(1.0, 2.0, 3.0)])
+
+    assert isinstance(info.led_locations, LocationBuffer)
+    assert _coordinates(info.led_locations) == [(1.0, 2.0, 3.0)]
+    assert len(StripInfo().led_locations) == 0
+
+
+def test_memory_per_location():
+    locations = [{'x': float(i), 'y': float(i), 'z': float(i)} for i in range(10000)]
+
+    tracemalloc.start()
+    buffer = LocationBuffer.from_json(locations)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert sys.getsizeof(buffer.coordinates) < 10000 * 3 * 8 * 1.2
+    assert size < 10000 * 3 * 8 * 1.5
+
+
+def test_items_write_through():
+    buffer = LocationBuffer.from_locations([Location(1.0, 2.0, 3.0), Location(4.0, 5.0, 6.0)])
+
+    buffer[0].x = 10.0
+    buffer[-1].z += 1.0
+    for location in buffer:
+        location.y = 0.0
+
+    assert list(buffer.coordinates) == [10.0, 0.0, 3.0, 4.0, 0.0, 7.0]
+    assert isinstance(buffer[0], Location)
+    assert pickle.loads(pickle.dumps(buffer[0])).x == 10.0
+
+
+def test_setitem():
+    buffer = LocationBuffer.from_locations([Location(1.0, 2.0, 3.0), Location(4.0, 5.0, 6.0)])
+
+    buffer[1] = Location(7.0, 8.0, 9.0)
+    assert list(buffer.coordinates) == [1.0, 2.0, 3.0, 7.0, 8.0, 9.0]
+
+    buffer[:1] = [Location(), Location(1.0, 1.0, 1.0)]
+    assert len(buffer) == 3
+    assert list(buffer.coordinates[:6]) == [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+
+    with pytest.raises(IndexError):
+        buffer[3] = Location()
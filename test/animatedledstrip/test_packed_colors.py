@@ -0,0 +1,172 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from array import array
+from unittest import mock
+
+import pytest
+
+from animatedledstrip import ColorContainer, PreparedColorContainer
+from animatedledstrip.fast_json_encoder import ALSFastJsonEncoder
+from animatedledstrip.json_encoder import ALSJsonEncoder
+from animatedledstrip.packed_colors import apply_table, brightness_table, from_float_channels, from_hex, from_hsv, \
+    from_rgb_bytes, gamma_correct, gamma_table, merge_channels, parse_packed_colors, scale_brightness, \
+    split_channels, to_float_channels, to_hex, to_hsv, to_packed_array, to_rgb_bytes
+
+
+def test_parse_packed_colors(backend):
+    colors = parse_packed_colors(b'[16711680, 65280,255,0, 16777215]')
+
+    assert list(colors) == [0xFF0000, 0x00FF00, 0x0000FF, 0, 0xFFFFFF]
+    assert memoryview(colors).itemsize == 4
+    assert len(parse_packed_colors(b'[]')) == 0
+
+
+def test_parse_packed_colors_array_backend():
+    with mock.patch('animatedledstrip.numpy_support.numpy', None):
+        colors = parse_packed_colors(b'[1,2]')
+
+    assert isinstance(colors, array)
+    assert colors.typecode == 'I'
+
+
+def test_parse_invalid():
+    with pytest.raises(ValueError):
+        parse_packed_colors(b'{"colors": []}')
+
+
+def test_parse_empty(backend):
+    assert len(parse_packed_colors(b'[ ]')) == 0
+    assert len(parse_packed_colors(b' [] ')) == 0
+
+
+def test_parse_out_of_range(backend):
+    assert list(parse_packed_colors(b'[4294967295]')) == [0xFFFFFFFF]
+    with pytest.raises(ValueError):
+        parse_packed_colors(b'[1, 4294967296]')
+    with pytest.raises(ValueError):
+        parse_packed_colors(b'[-1]')
+    with pytest.raises(ValueError):
+        parse_packed_colors(b'[18446744073709551617]')
+
+
+@pytest.mark.parametrize('data', [b'[1,,2]', b'[1, 2,]', b'[1.5]', b'[1e3]', b'[1; 2]', b'[0x10]', b'[+1]', b'["1"]'])
+def test_parse_malformed(backend, data):
+    with pytest.raises(ValueError):
+        parse_packed_colors(data)
+
+
+def test_parse_result_is_writable(backend):
+    colors = parse_packed_colors(b'[1, 2]')
+    colors[0] = 3
+
+    assert list(colors) == [3, 2]
+
+
+def test_split_channels(backend):
+    r, g, b = split_channels(parse_packed_colors(b'[1193046, 16711680, 255]'))
+
+    assert list(r) == [0x12, 0xFF, 0x00]
+    assert list(g) == [0x34, 0x00, 0x00]
+    assert list(b) == [0x56, 0x00, 0xFF]
+
+
+def test_split_channels_from_list():
+    r, g, b = split_channels([0x123456])
+
+    assert (list(r), list(g), list(b)) == ([0x12], [0x34], [0x56])
+
+
+COLORS = [0x123456, 0xFF0000, 0x00FF00, 0x0000FF, 0xFFFFFF, 0, 0x7F3FC8]
+
+
+def test_merge_channels(backend):
+    r, g, b = split_channels(COLORS)
+
+    assert list(merge_channels(r, g, b)) == COLORS
+    assert list(merge_channels([0x12], [0x34], [0x56])) == [0x123456]
+
+
+def test_rgb_bytes(backend):
+    data = to_rgb_bytes(COLORS)
+
+    assert data[:6] == bytes([0x12, 0x34, 0x56, 0xFF, 0, 0])
+    assert list(from_rgb_bytes(data)) == COLORS
+    with pytest.raises(ValueError):
+        from_rgb_bytes(b'\x00\x01')
+
+
+def test_float_channels(backend):
+    r, g, b = to_float_channels(COLORS)
+
+    assert list(r)[:2] == [0x12 / 255, 1.0]
+    assert list(from_float_channels(r, g, b)) == COLORS
+    assert list(from_float_channels([2.0, -1.0], [0.5, 0.0], [0.0, 0.0])) == [0xFF8000, 0]
+
+
+def test_hsv(backend):
+    h, s, v = to_hsv(COLORS)
+
+    assert (h[1], s[1], v[1]) == (0.0, 1.0, 1.0)
+    assert h[2] == pytest.approx(1 / 3)
+    assert s[4] == 0.0
+    assert list(from_hsv(h, s, v)) == COLORS
+    assert list(from_hsv([0.0, 0.5], [1.0, 1.0], [1.0, 1.0])) == [0xFF0000, 0x00FFFF]
+
+
+def test_hex(backend):
+    assert to_hex(parse_packed_colors(b'[1193046, 255]')) == ['#123456', '#0000ff']
+    assert list(from_hex(['#123456', '0000ff'])) == [0x123456, 0xFF]
+
+
+def test_lookup_tables(backend):
+    assert list(scale_brightness([0xFF8040], 0.5)) == [0x804020]
+    assert list(scale_brightness([0x808080], 4.0)) == [0xFFFFFF]
+    assert list(gamma_correct([0xFF8000, 0], 1.0)) == [0xFF8000, 0]
+    assert list(gamma_correct([0x808080])) == [0x383838]
+    assert list(apply_table([0x000100], bytes([1] * 256))) == [0x010101]
+    with pytest.raises(ValueError):
+        apply_table([0], b'')
+    with pytest.raises(ValueError):
+        brightness_table(-1.0)
+    assert gamma_table(2.2) is gamma_table(2.2)
+
+
+def test_to_packed_array(backend):
+    source = array('I', COLORS)
+    packed = to_packed_array(source)
+
+    assert packed == source and packed is not source
+    assert to_packed_array(memoryview(source)) == source
+    assert to_packed_array(COLORS) == source
+
+
+def test_containers_from_buffer(backend):
+    container = ColorContainer.from_buffer(parse_packed_colors(b'[255, 65280]'))
+
+    assert container.colors == array('I', [0xFF, 0xFF00])
+    assert container == ColorContainer([0xFF, 0xFF00])
+    assert container.add_color(0xFF0000).colors[-1] == 0xFF0000
+    assert ALSFastJsonEncoder().encode(container) == b'{"type":"ColorContainer","colors":[255,65280,16711680]}'
+
+    prepared = PreparedColorContainer.from_buffer(merge_channels([1], [2], [3]), [0x010203])
+    assert list(prepared.original_colors) == [0x010203]
+    assert ALSJsonEncoder().encode(prepared) == \
+        '{"type": "PreparedColorContainer", "colors": [66051], "originalColors": [66051]}'
@@ -0,0 +1,155 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import copy
+import json
+import pickle
+import random
+
+import pytest
+
+from animatedledstrip import PixelRanges, Section
+from animatedledstrip.fast_json_encoder import ALSFastJsonEncoder
+from animatedledstrip.json_encoder import ALSJsonEncoder
+
+
+def test_from_pixels():
+    assert PixelRanges.from_pixels(list(range(100))).runs == [(0, 100)]
+    assert PixelRanges.from_pixels([0, 1, 2, 10, 11, 5]).runs == [(0, 3), (10, 12), (5, 6)]
+    assert PixelRanges.from_pixels(iter([3, 4, 5])).runs == [(3, 6)]
+    assert PixelRanges.from_pixels([]).runs == []
+    assert PixelRanges([(0, 2), (2, 4), (6, 6)]).runs == [(0, 4)]
+
+
+def test_sequence():
+    pixels = [5, 6, 7, 0, 1, 20]
+    ranges = PixelRanges.from_pixels(pixels)
+
+    assert len(ranges) == 6
+    assert list(ranges) == pixels
+    assert [ranges[i] for i in range(6)] == pixels
+    assert ranges[-1] == 20
+    assert ranges[1:4] == pixels[1:4]
+    assert ranges[::2] == pixels[::2]
+    assert ranges == pixels
+    assert ranges != pixels[:-1]
+    with pytest.raises(IndexError):
+        ranges[6]
+
+    ranges.append(21)
+    ranges.extend([30, 31])
+    assert ranges.runs == [(5, 8), (0, 2), (20, 22), (30, 32)]
+    assert ranges[8] == 31
+
+
+def test_set_operations():
+    a = PixelRanges.from_pixels(list(range(0, 10)) + list(range(20, 30)))
+    b = PixelRanges.from_range(5, 25)
+
+    assert (a | b).runs == [(0, 30)]
+    assert (a & b).runs == [(5, 10), (20, 25)]
+    assert (a - b).runs == [(0, 5), (25, 30)]
+    assert (b - a).runs == [(10, 20)]
+    assert a.overlaps(b)
+    assert not a.overlaps(range(10, 20))
+    assert PixelRanges.from_range(21, 24).issubset(a)
+    assert not b.issubset(a)
+    assert 25 in a and 15 not in a and 30 not in a
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_set_operations_match_sets(seed):
+    rng = random.Random(seed)
+    a = [rng.randrange(200) for _ in range(120)]
+    b = [rng.randrange(200) for _ in range(80)]
+    ra, rb = PixelRanges.from_pixels(a), PixelRanges.from_pixels(b)
+
+    assert list(ra | rb) == sorted(set(a) | set(b))
+    assert list(ra & rb) == sorted(set(a) & set(b))
+    assert list(ra - rb) == sorted(set(a) - set(b))
+    assert ra.overlaps(rb) == bool(set(a) & set(b))
+    assert all((p in ra) == (p in set(a)) for p in range(-1, 201))
+
+
+def test_section():
+    section = Section('section', list(range(100, 200)), 'fullStrip')
+    assert isinstance(section.pixels, PixelRanges)
+    assert section.pixels.runs == [(100, 200)]
+    assert section.pixels == list(range(100, 200))
+    assert section.json_dict()['pixels'] == list(range(100, 200))
+
+    assert section.overlaps(Section('other', [199, 200]))
+    assert not section.overlaps(Section('other', [200, 201]))
+
+    assert pickle.loads(pickle.dumps(section)).pixels == section.pixels
+    assert copy.deepcopy(section).pixels.runs == [(100, 200)]
+
+
+def test_encode_section():
+    section = Section('section', [0, 1, 2, 7], 'fullStrip')
+    expected = b'{"name":"section","pixels":[0,1,2,7],"parentSectionName":"fullStrip"}'
+    assert ALSFastJsonEncoder().encode(section) == expected
+    assert ALSJsonEncoder(separators=(',', ':')).encode(section).encode() == expected
+
+
+def test_list_mutations_match_list():
+    ranges = PixelRanges.from_range(0, 10)
+    pixels = list(range(10))
+
+    for mutate in (lambda p: p.__setitem__(3, 20),
+                   lambda p: p.__setitem__(slice(5, 7), [40, 41, 42]),
+                   lambda p: p.__delitem__(0),
+                   lambda p: p.__delitem__(slice(-2, None)),
+                   lambda p: p.insert(2, 7),
+                   lambda p: p.remove(7),
+                   lambda p: p.pop(),
+                   lambda p: p.append(99),
+                   lambda p: p.extend([100, 101]),
+                   lambda p: p.reverse(),
+                   lambda p: p.sort(),
+                   lambda p: p.__iadd__([5])):
+        mutate(ranges)
+        mutate(pixels)
+        assert ranges == pixels
+        assert ranges.to_list() == pixels
+        assert len(ranges) == len(pixels)
+
+    ranges.clear()
+    assert ranges == [] and len(ranges) == 0
+
+
+def test_concatenation():
+    ranges = PixelRanges.from_range(0, 3)
+
+    assert ranges + [3, 4] == [0, 1, 2, 3, 4]
+    assert [9] + ranges == [9, 0, 1, 2]
+    assert ranges == [0, 1, 2]
+    assert ranges.copy() == ranges and ranges.copy() is not ranges
+
+
+def test_section_pixels_mutation_and_json():
+    section = Section('s', [0, 1, 2])
+    section.pixels.append(3)
+    section.pixels[0] = 10
+
+    assert section.pixels == [10, 1, 2, 3]
+    assert json.loads(ALSJsonEncoder().encode(section.pixels)) == [10, 1, 2, 3]
+    assert json.loads(ALSFastJsonEncoder().encode(section))['pixels'] == [10, 1, 2, 3]
+    assert json.dumps(list(section.pixels)) == '[10, 1, 2, 3]'
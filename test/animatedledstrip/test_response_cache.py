@@ -0,0 +1,121 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import json
+import threading
+import time
+from unittest import mock
+
+from animatedledstrip import ALSHttpClient, Section
+from animatedledstrip.response_cache import ResponseCache
+
+SECTION = {'name': 'fullStrip', 'pixels': [0, 1, 2], 'parentSectionName': ''}
+
+
+def test_hits_and_misses():
+    cache = ResponseCache(ttl=60.0)
+    loads = []
+
+    assert cache.get_or_load('a', lambda: loads.append('a') or 1) == 1
+    assert cache.get_or_load('a', lambda: loads.append('a') or 2) == 1
+
+    assert loads == ['a']
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+
+def test_expiry():
+    cache = ResponseCache(ttl=0.01)
+
+    cache.get_or_load('a', lambda: 1)
+    time.sleep(0.02)
+    assert cache.get_or_load('a', lambda: 2) == 2
+    assert cache.misses == 2
+
+
+def test_lru_eviction():
+    cache = ResponseCache(ttl=60.0, max_size=2)
+
+    cache.get_or_load('a', lambda: 1)
+    cache.get_or_load('b', lambda: 2)
+    cache.get_or_load('a', lambda: 1)
+    cache.get_or_load('c', lambda: 3)
+
+    assert len(cache) == 2
+    assert cache.get_or_load('a', lambda: 4) == 1
+    assert cache.get_or_load('b', lambda: 5) == 5
+
+
+def test_invalidate_prefix():
+    cache = ResponseCache()
+
+    cache.get_or_load('/sections', lambda: 1)
+    cache.get_or_load('/sections/fullStrip', lambda: 2)
+    cache.get_or_load('/strip/info', lambda: 3)
+    cache.invalidate('/sections')
+
+    assert len(cache) == 1
+
+
+def test_client_cache():
+    client = ALSHttpClient('10.0.0.254', cache_ttl=60.0)
+
+    with mock.patch.object(client, '_get_data', return_value=json.dumps(SECTION)) as get_data:
+        assert client.get_full_strip_section().pixels == [0, 1, 2]
+        assert client.get_section('fullStrip').pixels == [0, 1, 2]
+        assert get_data.call_count == 1
+
+    with mock.patch.object(client, '_post_data', return_value=json.dumps(SECTION)):
+        client.create_new_section(Section('fullStrip', [0, 1, 2]))
+
+    with mock.patch.object(client, '_get_data', return_value=json.dumps(SECTION)) as get_data:
+        client.get_section('fullStrip')
+        assert get_data.call_count == 1
+
+    assert client.cache.stats() == {'hits': 1, 'misses': 2, 'size': 1}
+
+
+def test_client_without_cache():
+    client = ALSHttpClient('10.0.0.254')
+
+    with mock.patch.object(client, '_get_data', return_value=json.dumps(SECTION)) as get_data:
+        client.get_section('fullStrip')
+        client.get_section('fullStrip')
+        assert get_data.call_count == 2
+
+
+def test_invalidate_during_load_discards_result():
+    cache = ResponseCache(ttl=60.0)
+    loading = threading.Event()
+    invalidated = threading.Event()
+
+    def slow_load():
+        loading.set()
+        invalidated.wait(5)
+        return 'stale'
+
+    thread = threading.Thread(target=cache.get_or_load, args=('sections', slow_load))
+    thread.start()
+    assert loading.wait(5)
+    cache.invalidate()
+    invalidated.set()
+    thread.join(5)
+
+    assert len(cache) == 0
+    assert cache.get_or_load('sections', lambda: 'fresh') == 'fresh'
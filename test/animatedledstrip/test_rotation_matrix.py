@@ -0,0 +1,96 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import math
+import pickle
+
+import pytest
+
+from animatedledstrip import DegreesRotation, Location, LocationBuffer, RadiansRotation, RotationMatrix
+
+
+def _close(location: Location, x: float, y: float, z: float) -> bool:
+    return all(abs(a - b) < 1e-9 for a, b in zip((location.x, location.y, location.z), (x, y, z)))
+
+
+def test_single_axes():
+    point = Location(1.0, 0.0, 0.0)
+    assert _close(RadiansRotation(z_rotation=math.pi / 2, rotation_order=['ROTATE_Z']).to_matrix().apply(point),
+                  0.0, 1.0, 0.0)
+    assert _close(DegreesRotation(y_rotation=90.0, rotation_order=['ROTATE_Y']).to_matrix().apply(point),
+                  0.0, 0.0, -1.0)
+    assert _close(DegreesRotation(x_rotation=90.0, rotation_order=['ROTATE_X']).to_matrix().apply(Location(0, 1, 0)),
+                  0.0, 0.0, 1.0)
+
+
+def test_rotation_order():
+    point = Location(1.0, 0.0, 0.0)
+    # Rotating about Z takes the point to +Y, then rotating about X takes it to +Z
+    z_then_x = DegreesRotation(90.0, 0.0, 90.0, ['ROTATE_Z', 'ROTATE_X']).to_matrix()
+    assert _close(z_then_x.apply(point), 0.0, 0.0, 1.0)
+    # Rotating about X first leaves the point where it is
+    x_then_z = DegreesRotation(90.0, 0.0, 90.0, ['ROTATE_X', 'ROTATE_Z']).to_matrix()
+    assert _close(x_then_z.apply(point), 0.0, 1.0, 0.0)
+
+
+def test_units_and_cache():
+    degrees = DegreesRotation(30.0, 45.0, 60.0, ['ROTATE_X', 'ROTATE_Y', 'ROTATE_Z'])
+    radians = RadiansRotation(math.radians(30.0), math.radians(45.0), math.radians(60.0),
+                              ['ROTATE_X', 'ROTATE_Y', 'ROTATE_Z'])
+    assert degrees.to_matrix().is_close(radians.to_matrix())
+    assert degrees.to_matrix() is degrees.to_matrix()
+
+
+def test_compose_and_inverse():
+    a = DegreesRotation(10.0, 20.0, 30.0, ['ROTATE_X', 'ROTATE_Y', 'ROTATE_Z']).to_matrix()
+    b = DegreesRotation(0.0, 0.0, 45.0, ['ROTATE_Z']).to_matrix()
+    point = Location(1.0, 2.0, 3.0)
+
+    rotated = b.apply(a.apply(point))
+    combined = a.then(b).apply(point)
+    assert _close(combined, rotated.x, rotated.y, rotated.z)
+    assert (b @ a) == a.then(b)
+
+    assert (a @ a.inverse()).is_close(RotationMatrix())
+    back = a.inverse().apply(a.apply(point))
+    assert _close(back, 1.0, 2.0, 3.0)
+    assert pickle.loads(pickle.dumps(a)) == a
+
+
+def test_apply_buffer(backend):
+    matrix = DegreesRotation(15.0, 25.0, 35.0, ['ROTATE_Z', 'ROTATE_Y', 'ROTATE_X']).to_matrix()
+    locations = LocationBuffer.from_locations(Location(float(i), float(i % 7), float(i % 3)) for i in range(100))
+    center = Location(1.0, 2.0, 3.0)
+
+    rotated = matrix.apply_buffer(locations)
+    around_center = matrix.apply_buffer(locations, center)
+
+    assert isinstance(rotated, LocationBuffer)
+    assert len(rotated) == 100
+    for i in range(100):
+        expected = matrix.apply(locations[i])
+        assert _close(rotated[i], expected.x, expected.y, expected.z)
+        expected = matrix.apply(locations[i], center)
+        assert _close(around_center[i], expected.x, expected.y, expected.z)
+
+
+def test_unknown_axis():
+    with pytest.raises(ValueError):
+        DegreesRotation(rotation_order=['ROTATE_W']).to_matrix()
@@ -0,0 +1,125 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import random
+
+import pytest
+
+from animatedledstrip import ALSHttpClient, PixelRanges, Section, SectionTree
+from animatedledstrip.fake_server import FakeALSServer
+
+
+def _tree() -> SectionTree:
+    return SectionTree({
+        'fullStrip': Section('fullStrip', list(range(100)), ''),
+        'back': Section('back', list(range(50, 100)), 'fullStrip'),
+        'backReversed': Section('backReversed', list(range(49, -1, -1)), 'back'),
+        'backMiddle': Section('backMiddle', list(range(10, 20)), 'back'),
+        'backMiddleEnds': Section('backMiddleEnds', [0, 1, 8, 9], 'backMiddle'),
+        'front': Section('front', list(range(0, 30)) + [40], 'fullStrip'),
+    })
+
+
+def test_hierarchy():
+    tree = _tree()
+    assert len(tree) == 6
+    assert [s.name for s in tree.roots] == ['fullStrip']
+    assert tree.parent('backMiddle').name == 'back'
+    assert [s.name for s in tree.children('back')] == ['backReversed', 'backMiddle']
+    assert [s.name for s in tree.ancestors('backMiddleEnds')] == ['backMiddle', 'back', 'fullStrip']
+    assert tree.descendants('back') == ['backReversed', 'backMiddle', 'backMiddleEnds']
+
+
+def test_physical_pixels():
+    tree = _tree()
+    assert tree.physical_pixels('back') == list(range(50, 100))
+    assert tree.physical_pixels('backReversed') == list(range(99, 49, -1))
+    assert tree.physical_pixels('backMiddle').runs == [(60, 70)]
+    assert tree.physical_pixels('backMiddleEnds') == [60, 61, 68, 69]
+    assert tree.physical_pixels('front').runs == [(0, 30), (40, 41)]
+
+    # Physical pixels are computed once
+    assert tree.physical_pixels('backMiddleEnds') is tree.physical_pixels('backMiddleEnds')
+
+
+def test_invalid_pixels():
+    tree = SectionTree([Section('fullStrip', list(range(10)), ''), Section('bad', [5, 10], 'fullStrip')])
+    with pytest.raises(ValueError):
+        tree.physical_pixels('bad')
+
+
+def test_sections_at():
+    tree = _tree()
+    assert tree.sections_at(0) == ['fullStrip', 'front']
+    assert tree.sections_at(61) == ['fullStrip', 'back', 'backReversed', 'backMiddle', 'backMiddleEnds']
+    assert tree.sections_at(35) == ['fullStrip']
+    assert tree.sections_at(100) == []
+    assert tree.sections_overlapping(range(28, 52)) == ['fullStrip', 'back', 'backReversed', 'front']
+
+
+def test_add():
+    tree = _tree()
+    tree.sections_at(0)
+
+    tree.add(Section('gap', list(range(30, 40)), 'fullStrip'))
+    assert tree.sections_at(35) == ['fullStrip', 'gap']
+
+    # A section added before its parent is resolved through the parent once that arrives
+    tree.add(Section('orphanChild', [0], 'orphan'))
+    assert tree.physical_pixels('orphanChild') == [0]
+    tree.add(Section('orphan', [90, 91], 'fullStrip'))
+    assert tree.physical_pixels('orphanChild') == [90]
+    assert 'orphanChild' in tree.sections_at(90)
+
+    for i in range(SectionTree.MAX_PENDING + 5):
+        tree.add(Section('extra{}'.format(i), [i], 'fullStrip'))
+    assert tree.sections_at(3) == ['fullStrip', 'front', 'extra3']
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_index_matches_scan(seed):
+    rng = random.Random(seed)
+    sections = [Section('fullStrip', list(range(500)), '')]
+    for i in range(60):
+        parent = rng.choice(sections)
+        size = len(parent.pixels)
+        start = rng.randrange(size)
+        pixels = list(range(start, min(size, start + rng.randrange(1, 100))))
+        if rng.random() < 0.3:
+            pixels = sorted(rng.sample(range(size), min(size, 5)))
+        sections.append(Section('s{}'.format(i), pixels, parent.name))
+    tree = SectionTree(sections)
+
+    for pixel in range(-1, 501, 7):
+        expected = [s.name for s in sections if pixel in tree.physical_pixels(s.name)]
+        assert tree.sections_at(pixel) == expected
+
+
+def test_client_section_tree():
+    with FakeALSServer(num_leds=100, num_sections=2) as server, ALSHttpClient(server.host, server.port) as client:
+        tree = client.get_section_tree()
+        assert sorted(tree) == ['fullStrip', 'section0', 'section1']
+        assert client.get_section_tree() is tree
+
+        client.create_new_section(Section('nested', [0, 1], 'section1'))
+        assert tree.physical_pixels('nested') == PixelRanges.from_range(50, 52)
+        assert tree.sections_at(51) == ['fullStrip', 'section1', 'nested']
+
+        assert client.get_section_tree(refresh=True) is not tree
@@ -0,0 +1,147 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from animatedledstrip import ALSHttpClient
+from animatedledstrip.fake_server import FakeALSServer
+from animatedledstrip.single_flight import SingleFlight
+
+
+def test_single_flight():
+    flight = SingleFlight()
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: flight.do('key', load), range(8)))
+
+    assert len(calls) == 1
+    assert all(value is results[0][0] for value, _ in results)
+    assert all(shared for _, shared in results)
+
+    # The key is free again once the call finished
+    assert flight.do('key', lambda: 1) == (1, False)
+
+
+def test_single_flight_error():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def load():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError('failed')
+
+    def follow():
+        started.wait()
+        return flight.do('key', lambda: 'not called')
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, 'key', load)
+        follower = executor.submit(follow)
+        with pytest.raises(ValueError):
+            leader.result()
+        with pytest.raises(ValueError):
+            follower.result()
+
+
+def _concurrent_calls(client: ALSHttpClient, func, count: int = 8):
+    with ThreadPoolExecutor(count) as executor:
+        return list(executor.map(lambda _: func(client), range(count)))
+
+
+@pytest.mark.parametrize('coalesce', ['copy', 'shared'])
+def test_coalesced_requests(coalesce):
+    with FakeALSServer(num_running=3, latency=0.1) as server, \
+            ALSHttpClient(server.host, server.port, pool_size=8, coalesce=coalesce) as client:
+        results = _concurrent_calls(client, ALSHttpClient.get_running_animations)
+        assert server.request_count == 1
+
+        assert all(sorted(r) == ['0', '1', '2'] for r in results)
+        if coalesce == 'copy':
+            assert len({id(r) for r in results}) == len(results)
+            results[0]['0'].colors[0].colors.append(0)
+            assert results[1]['0'].colors[0].colors != results[0]['0'].colors[0].colors
+        else:
+            assert all(r is results[0] for r in results)
+
+        # Different requests aren't coalesced with each other
+        _concurrent_calls(client, ALSHttpClient.get_strip_info, 4)
+        assert server.request_count == 2
+
+
+def test_not_coalesced_by_default():
+    with FakeALSServer(latency=0.05) as server, ALSHttpClient(server.host, server.port, pool_size=4) as client:
+        _concurrent_calls(client, ALSHttpClient.get_strip_info, 4)
+        assert server.request_count == 4
+
+    with pytest.raises(ValueError):
+        ALSHttpClient('127.0.0.1', coalesce='frozen')
+
+
+def test_follower_deadline():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def slow_load():
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', slow_load)))
+    leader.start()
+    assert started.wait(5)
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        flight.do('key', slow_load, deadline=time.monotonic() + 0.1)
+    assert time.monotonic() - start < 1.0
+
+    release.set()
+    leader.join(5)
+    # The follower gave up, so nobody else got the value
+    assert results == [('value', False)]
+
+
+def test_coalesced_request_follows_own_deadline():
+    with FakeALSServer(latency=0.8) as server, \
+            ALSHttpClient(server.host, server.port, pool_size=4, coalesce='shared') as client:
+        leader = threading.Thread(target=client.get_running_animations_ids)
+        leader.start()
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutError), client.deadline(0.2):
+            client.get_running_animations_ids()
+        assert time.monotonic() - start < 0.5
+        leader.join(5)
+
+    assert server.request_count == 1
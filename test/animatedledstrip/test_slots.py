@@ -0,0 +1,105 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import json
+import pickle
+import sys
+import tracemalloc
+
+import pytest
+
+from animatedledstrip import AbsoluteDistance, ColorContainer, DegreesRotation, Equation, Location, \
+    PercentDistance, PixelRanges, PreparedColorContainer, RadiansRotation, Section
+from animatedledstrip.animation_info import AnimationParameter
+from animatedledstrip.json_decoder import ALSJsonDecoder
+
+MODELS = [
+    (Location, (1.0, 2.0, 3.0)),
+    (AbsoluteDistance, (1.0, 2.0, 3.0)),
+    (PercentDistance, (1.0, 2.0, 3.0)),
+    (DegreesRotation, (1.0, 2.0, 3.0, ['ROTATE_Z'])),
+    (RadiansRotation, (1.0, 2.0, 3.0, ['ROTATE_Z'])),
+    (ColorContainer, ([0xFF0000],)),
+    (PreparedColorContainer, ([0xFF0000], [0xFF0000])),
+    (Section, ('section', PixelRanges.from_range(0, 2), 'fullStrip')),
+    (Equation, ([0.0, 1.0],)),
+    (AnimationParameter, ('delay', 'Delay', 10, 'int')),
+]
+
+COUNT = 10000
+
+
+def _bytes_per_object(func, count: int) -> float:
+    """Memory allocated (and still held) by func, per object it returns"""
+    tracemalloc.start()
+    objects = func()
+    size = tracemalloc.get_traced_memory()[0] - sys.getsizeof(objects)
+    tracemalloc.stop()
+    assert len(objects) == count
+    return size / count
+
+
+@pytest.mark.parametrize('model, args', MODELS)
+def test_no_instance_dict(model, args):
+    assert not hasattr(model(*args), '__dict__')
+
+
+@pytest.mark.parametrize('model, args', MODELS)
+def test_bytes_per_object(model, args):
+    # An object header plus one pointer per slot, with a little headroom
+    budget = 40 + 8 * len(model.__slots__)
+
+    assert _bytes_per_object(lambda: [model(*args) for _ in range(COUNT)], COUNT) <= budget
+
+
+@pytest.mark.parametrize('model, args', MODELS)
+def test_pickle(model, args):
+    obj = model(*args)
+    copy = pickle.loads(pickle.dumps(obj))
+
+    assert type(copy) is model
+    assert all(getattr(copy, slot) == getattr(obj, slot) for slot in model.__slots__)
+
+
+def test_decode_sections_memory():
+    decoder = ALSJsonDecoder()
+    decode = decoder.decoders['Section']
+
+    # The name is reused from the parsed JSON, and the pixels take the same space however many there are
+    for num_pixels in (2, 1000):
+        parsed = json.loads(json.dumps([{'name': 'section{}'.format(i), 'pixels': list(range(i, i + num_pixels)),
+                                         'parentSectionName': 'fullStrip'} for i in range(COUNT // 10)]))
+        assert _bytes_per_object(lambda: [decode(s) for s in parsed], COUNT // 10) <= 256
+
+
+def test_decode_animation_params_memory():
+    decoder = ALSJsonDecoder()
+    parsed = json.loads(json.dumps([{
+        'animation': 'Wipe', 'colors': [{'type': 'ColorContainer', 'colors': [0xFF0000]}], 'id': str(i),
+        'section': 'fullStrip', 'runCount': 1, 'intParams': {}, 'doubleParams': {}, 'stringParams': {},
+        'locationParams': {'center': {'x': 1.0, 'y': 2.0, 'z': 3.0}},
+        'distanceParams': {'distance': {'type': 'AbsoluteDistance', 'x': 1.0, 'y': 2.0, 'z': 3.0}},
+        'rotationParams': {'rotation': {'type': 'RadiansRotation', 'xRotation': 0.0, 'yRotation': 0.0,
+                                        'zRotation': 1.0, 'rotationOrder': ['ROTATE_Z']}},
+        'equationParams': {'equation': {'coefficients': [0.0, 1.0]}},
+    } for i in range(COUNT)]))
+    decode = decoder.decoders['AnimationToRunParams']
+
+    assert _bytes_per_object(lambda: [decode(p) for p in parsed], COUNT) <= 1300
@@ -0,0 +1,90 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+import random
+
+import pytest
+
+from animatedledstrip import ALSHttpClient, Location, Section, SpatialIndex
+from animatedledstrip.fake_server import FakeALSServer
+
+
+def _locations(seed: int, count: int = 2000):
+    rng = random.Random(seed)
+    # Whole-number coordinates so some LEDs share a coordinate with the splits
+    return [Location(float(rng.randrange(40)), float(rng.randrange(40)), float(rng.randrange(4)))
+            for _ in range(count)]
+
+
+def _distance2(location: Location, point) -> float:
+    return (location.x - point[0]) ** 2 + (location.y - point[1]) ** 2 + (location.z - point[2]) ** 2
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_nearest(seed):
+    locations = _locations(seed)
+    index = SpatialIndex(locations)
+    rng = random.Random(seed + 100)
+
+    for _ in range(50):
+        point = (rng.uniform(-5, 45), rng.uniform(-5, 45), rng.uniform(-1, 5))
+        found = index.nearest(point, k=5)
+        expected = sorted(range(len(locations)), key=lambda i: _distance2(locations[i], point))[:5]
+        assert [_distance2(locations[i], point) for i in found] == [_distance2(locations[i], point) for i in expected]
+
+    assert index.nearest(Location(1.0, 2.0, 3.0), k=0) == []
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_within_radius_and_box(seed):
+    locations = _locations(seed)
+    index = SpatialIndex(locations)
+    rng = random.Random(seed + 200)
+
+    for _ in range(50):
+        center = Location(float(rng.randrange(40)), float(rng.randrange(40)), float(rng.randrange(4)))
+        radius = rng.choice([0.0, 1.0, 3.5, 10.0])
+        assert index.within_radius(center, radius) == \
+            [i for i, loc in enumerate(locations) if _distance2(loc, (center.x, center.y, center.z)) <= radius ** 2]
+
+        low = (rng.randrange(40), rng.randrange(40), 0)
+        high = (low[0] + rng.randrange(10), low[1] + rng.randrange(10), rng.randrange(4))
+        assert index.within_box(low, high) == \
+            [i for i, loc in enumerate(locations) if low[0] <= loc.x <= high[0] and low[1] <= loc.y <= high[1] and
+             low[2] <= loc.z <= high[2]]
+
+
+def test_empty_index():
+    index = SpatialIndex([])
+    assert len(index) == 0
+    assert index.nearest((0, 0, 0)) == []
+    assert index.within_radius((0, 0, 0), 10) == []
+
+
+def test_client_spatial_index():
+    with FakeALSServer(num_leds=200) as server, ALSHttpClient(server.host, server.port) as client:
+        index = client.get_spatial_index()
+        assert len(index) == 200
+        assert client.get_spatial_index() is index
+
+        # The fake strip is a 40 wide grid
+        assert index.nearest(Location(3.0, 1.0, 0.0)) == [43]
+        section = Section('corner', index.within_box((0, 0, 0), (1, 1, 0)), 'fullStrip')
+        assert section.pixels == [0, 1, 40, 41]
@@ -0,0 +1,104 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from array import array
+
+import pytest
+
+from animatedledstrip.strip_color_stream import changed_ranges, stream_strip_color
+
+
+class _FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def packed(backend):
+    if backend is not None:
+        return lambda colors: backend.array(colors, dtype=backend.uint32)
+    return lambda colors: array('I', colors)
+
+
+def test_changed_ranges(packed):
+    assert changed_ranges(None, packed([1, 2, 3])) == [(0, 3)]
+    assert changed_ranges(packed([1, 2]), packed([1, 2, 3])) == [(0, 3)]
+    assert changed_ranges(packed([1, 2, 3]), packed([1, 2, 3])) == []
+    assert changed_ranges(packed([1, 2, 3, 4, 5, 6]), packed([0, 2, 0, 0, 5, 0])) == [(0, 1), (2, 4), (5, 6)]
+
+
+def test_only_changed_frames_yielded(packed):
+    clock = _FakeClock()
+    snapshots = iter([packed([1, 2, 3]), packed([1, 2, 3]), packed([1, 9, 3]), packed([1, 9, 3]), packed([0, 0, 0])])
+
+    frames = list(stream_strip_color(lambda: next(snapshots), fps=10.0, max_frames=3,
+                                     clock=clock, sleep=clock.sleep))
+
+    assert [list(f.colors) for f in frames] == [[1, 2, 3], [1, 9, 3], [0, 0, 0]]
+    assert [f.changed_ranges for f in frames] == [[(0, 3)], [(1, 2)], [(0, 3)]]
+
+
+def test_drift_correction():
+    clock = _FakeClock()
+
+    def fetch():
+        # Each poll takes a quarter of the frame period
+        clock.now += 0.025
+        return array('I', [int(clock.now * 1000)])
+
+    frames = list(stream_strip_color(fetch, fps=10.0, max_frames=5, clock=clock, sleep=clock.sleep))
+
+    assert [round(f.timestamp, 3) for f in frames] == [0.025, 0.125, 0.225, 0.325, 0.425]
+    assert all(f.dropped == 0 for f in frames)
+
+
+def test_slow_server_skips_polls():
+    clock = _FakeClock()
+
+    def fetch():
+        # Each poll takes two and a half frame periods
+        clock.now += 0.25
+        return array('I', [int(clock.now * 1000)])
+
+    frames = list(stream_strip_color(fetch, fps=10.0, max_frames=3, clock=clock, sleep=clock.sleep))
+
+    assert [round(f.timestamp, 3) for f in frames] == [0.25, 0.55, 0.85]
+    assert [f.dropped for f in frames] == [0, 2, 2]
+
+
+def test_empty_strip(packed):
+    clock = _FakeClock()
+    fetches = []
+
+    def fetch():
+        fetches.append(clock.now)
+        return packed([])
+
+    assert list(stream_strip_color(fetch, fps=10.0, clock=clock, sleep=clock.sleep)) == []
+    assert len(fetches) == 1
@@ -0,0 +1,45 @@
+#  Copyright (c) 2018-2021 AnimatedLEDStrip
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+#  THE SOFTWARE.
+
+from unittest import mock
+
+import pytest
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def backend(request):
+    """
+    Run a test once with NumPy and once with the pure Python array fallback.
+
+    Yields the numpy module, or None for the array run. Test modules can list
+    functions memoized with lru_cache in a module-level ``backend_caches``;
+    those caches are cleared around each run so results computed under one
+    backend never leak into the other.
+    """
+    caches = getattr(request.module, 'backend_caches', ())
+    for cache in caches:
+        cache.cache_clear()
+    if request.param == 'numpy':
+        yield pytest.importorskip('numpy')
+    else:
+        with mock.patch('animatedledstrip.numpy_support.numpy', None):
+            yield None
+    for cache in caches:
+        cache.cache_clear()